@@ -0,0 +1,96 @@
+import argparse
+import os
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from util.configurations import (
+    AbstractConfigurationUtils,
+    BlockRecord,
+    iter_block_records,
+)
+
+BLOCK_XML = """    <block>
+        <name>BLOCK_{index}</name>
+        <read_pv>IN:DETMON:DETECTOR_{index}:COUNTS.VAL</read_pv>
+        <local>True</local>
+        <visible>True</visible>
+        <rc_enabled>False</rc_enabled>
+        <rc_lowlimit>0.0</rc_lowlimit>
+        <rc_highlimit>0.0</rc_highlimit>
+        <log_periodic>True</log_periodic>
+        <log_rate>30</log_rate>
+        <log_deadband>0.0</log_deadband>
+    </block>
+"""
+
+
+def write_blocks_xml(path, number_of_blocks):
+    """
+    Writes a blocks.xml file containing a number of typical blocks.
+    """
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0" ?>\n')
+        f.write('<blocks xmlns="http://epics.isis.rl.ac.uk/schema/blocks/1.0">\n')
+        f.writelines(BLOCK_XML.format(index=index) for index in range(number_of_blocks))
+        f.write("</blocks>\n")
+
+
+def read_blocks_from_tree(path):
+    with open(path, "rb") as f:
+        root = ET.fromstring(f.read())
+    return [
+        BlockRecord.from_element(block)
+        for block in root.iter(f"{AbstractConfigurationUtils.BLOCK_XML_SCHEMA}block")
+    ]
+
+
+def read_blocks_streaming(path):
+    with open(path, "rb") as f:
+        return list(iter_block_records(f))
+
+
+def get_peak_memory(read_blocks, path):
+    """
+    :return: The number of blocks read and the peak memory allocated while reading them, in bytes
+    """
+    tracemalloc.start()
+    try:
+        number_of_blocks = len(read_blocks(path))
+        return number_of_blocks, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Compares the peak memory used reading a large blocks.xml by building its whole tree and by "
+        "streaming it.",
+    )
+    parser.add_argument(
+        "--blocks",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="The numbers of blocks to benchmark with",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "blocks.xml")
+        for number_of_blocks in args.blocks:
+            write_blocks_xml(path, number_of_blocks)
+            for name, read_blocks in [
+                ("tree", read_blocks_from_tree),
+                ("streaming", read_blocks_streaming),
+            ]:
+                blocks_read, peak = get_peak_memory(read_blocks, path)
+                assert blocks_read == number_of_blocks
+                print(
+                    f"{number_of_blocks:>8} blocks ({os.path.getsize(path) / 2**20:>7.1f} MiB file), {name:<9}: peak {peak / 2**20:>7.1f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
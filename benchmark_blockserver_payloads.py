@@ -0,0 +1,124 @@
+import argparse
+import binascii
+import json
+import time
+import tracemalloc
+import zlib
+
+from util.blockserver_payload import (
+    iter_decompressed_text,
+    iter_json_array_items,
+    iter_json_object_keys,
+)
+
+
+def make_payload(document):
+    """
+    Encodes a document in the same way as the blockserver: JSON, zlib compressed, then hex encoded.
+    """
+    return binascii.hexlify(zlib.compress(json.dumps(document).encode("utf-8"))).decode(
+        "ascii"
+    )
+
+
+def make_interesting_pvs_payload(number_of_pvs):
+    return make_payload(
+        [
+            [
+                f"IN:DETMON:DETECTOR_{index}:COUNTS",
+                "ai",
+                f"Counts on detector {index}",
+                "DETMON_01",
+            ]
+            for index in range(number_of_pvs)
+        ]
+    )
+
+
+def make_iocs_payload(number_of_iocs):
+    return make_payload(
+        {
+            f"IOC_{index}": {
+                "running": False,
+                "description": "An IOC",
+                "type": "",
+                "host": "",
+            }
+            for index in range(number_of_iocs)
+        }
+    )
+
+
+def read_pv_names_whole(data):
+    return [pv[0] for pv in json.loads(zlib.decompress(binascii.unhexlify(data)))]
+
+
+def read_pv_names_streaming(data):
+    return [pv[0] for pv in iter_json_array_items(iter_decompressed_text(data))]
+
+
+def read_ioc_names_whole(data):
+    return list(json.loads(zlib.decompress(binascii.unhexlify(data))).keys())
+
+
+def read_ioc_names_streaming(data):
+    return list(iter_json_object_keys(iter_decompressed_text(data)))
+
+
+def measure(decode, data):
+    """
+    :return: The result of decoding the payload, the time taken in seconds and the peak memory allocated while
+        decoding it, in bytes. The time is measured without tracing memory, which slows decoding down.
+    """
+    start = time.perf_counter()
+    result = decode(data)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        decode(data)
+        return result, elapsed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Compares the time and peak memory taken to read the PV names out of a blockserver interesting "
+        "PVs payload and the IOC names out of an IOCs payload, decoding the whole payload at once and streaming it.",
+    )
+    parser.add_argument(
+        "--pvs",
+        type=int,
+        default=200000,
+        help="The number of PVs in the interesting PVs payload",
+    )
+    parser.add_argument(
+        "--iocs", type=int, default=5000, help="The number of IOCs in the IOCs payload"
+    )
+    args = parser.parse_args()
+
+    for payload_name, data, decoders in [
+        (
+            f"{args.pvs} interesting PVs",
+            make_interesting_pvs_payload(args.pvs),
+            [("whole", read_pv_names_whole), ("streaming", read_pv_names_streaming)],
+        ),
+        (
+            f"{args.iocs} IOCs",
+            make_iocs_payload(args.iocs),
+            [("whole", read_ioc_names_whole), ("streaming", read_ioc_names_streaming)],
+        ),
+    ]:
+        results = []
+        for name, decode in decoders:
+            result, elapsed, peak = measure(decode, data)
+            results.append(result)
+            print(
+                f"{payload_name} ({len(data) / 2**10:.0f} KiB PV value), {name:<9}: {elapsed:>7.3f} s, peak {peak / 2**20:>7.1f} MiB"
+            )
+        assert all(result == results[0] for result in results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+from tests.component_tests import ComponentsTests
+from tests.configuration_tests import ConfigurationsTests
+from tests.context import InstrumentContext
+from util.config_source import FileSystemConfigSource
+from util.configurations import AbstractConfigurationUtils
+from util.validation_cache import ValidationCache
+from util.xml_backend import lxml_etree
+
+IOCS_XML = """<?xml version="1.0" ?>
+<iocs xmlns="http://epics.isis.rl.ac.uk/schema/iocs/1.0" xmlns:ioc="http://epics.isis.rl.ac.uk/schema/iocs/1.0">
+{}
+</iocs>"""
+
+IOC_XML = """<ioc autostart="true" name="{name}" restart="true" simlevel="none">
+    <macros><macro name="MTRCTRL" value="{index}"/><macro name="AXIS1" value="yes"/></macros>
+    <pvs/><pvsets/>
+</ioc>"""
+
+BLOCKS_XML = """<?xml version="1.0" ?>
+<blocks xmlns="http://epics.isis.rl.ac.uk/schema/blocks/1.0" xmlns:blk="http://epics.isis.rl.ac.uk/schema/blocks/1.0">
+{}
+</blocks>"""
+
+BLOCK_XML = (
+    "<block><name>{name}</name><read_pv>{pv}</read_pv><local>True</local></block>"
+)
+
+COMPONENTS_XML = """<?xml version="1.0" ?>
+<components xmlns="http://epics.isis.rl.ac.uk/schema/components/1.0">
+{}
+</components>"""
+
+
+class CountingConfigSource(FileSystemConfigSource):
+    """
+    Reads a working tree on disk, counting each operation on the file system by name.
+    """
+
+    OPERATIONS = (
+        "read",
+        "read_bytes",
+        "open_binary",
+        "get_file_id",
+        "is_dir",
+        "is_file",
+        "list_dir",
+    )
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.counts = Counter()
+
+    def __getattribute__(self, name):
+        if name in CountingConfigSource.OPERATIONS:
+            object.__getattribute__(self, "counts")[name] += 1
+        return object.__getattribute__(self, name)
+
+
+def write_repository(path, number_of_configs, number_of_components, blocks_per_config):
+    """
+    Writes a configurations repository in which every configuration includes three components, and an IOC of
+    each configuration has its macros set in globals.txt.
+    """
+
+    def write(relative_path, contents):
+        full_path = os.path.join(path, "configurations", relative_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(contents)
+
+    def write_directory(directory, name, components):
+        iocs = [
+            IOC_XML.format(name=f"MCLEN_{i % 3 + 1:02d}", index=i) for i in range(3)
+        ] + [IOC_XML.format(name=f"{name}_IOC_{i:02d}", index=i) for i in range(7)]
+        blocks = [
+            BLOCK_XML.format(name=f"{name}_BLOCK_{i}", pv=f"{name}:PV_{i}")
+            for i in range(blocks_per_config)
+        ]
+        write(
+            os.path.join(directory, name, "iocs.xml"), IOCS_XML.format("\n".join(iocs))
+        )
+        write(
+            os.path.join(directory, name, "blocks.xml"),
+            BLOCKS_XML.format("\n".join(blocks)),
+        )
+        write(
+            os.path.join(directory, name, "components.xml"),
+            COMPONENTS_XML.format(
+                "\n".join(
+                    f'<component name="{component}"/>' for component in components
+                )
+            ),
+        )
+        for filename in ["groups.xml", "meta.xml"]:
+            write(os.path.join(directory, name, filename), f"<{filename[:-4]}/>")
+
+    components = [f"COMP_{i}" for i in range(number_of_components)]
+    for component in components:
+        write_directory("components", component, [])
+    for index in range(number_of_configs):
+        write_directory(
+            "configurations",
+            f"CONFIG_{index}",
+            [
+                components[(index + offset) % number_of_components]
+                for offset in range(3)
+            ],
+        )
+    write(
+        "globals.txt",
+        "\n".join(f"CONFIG_{i}_IOC_00__MTRCTRL={i}" for i in range(number_of_configs)),
+    )
+
+
+def count_parses():
+    """
+    Counts the XML documents parsed, by wrapping the parsing functions of ElementTree and, if it is installed, lxml.
+    :return: The counter, and a function that restores the parsing functions
+    """
+    counts = Counter()
+    functions = [(ET, "fromstring"), (ET, "iterparse")]
+    if lxml_etree is not None:
+        functions.append((lxml_etree, "fromstring"))
+    originals = [(module, name, getattr(module, name)) for module, name in functions]
+
+    def wrap(module, name, original):
+        def counted(*args, **kwargs):
+            counts[f"{module.__name__}.{name}"] += 1
+            return original(*args, **kwargs)
+
+        return counted
+
+    for module, name, original in originals:
+        setattr(module, name, wrap(module, name, original))
+
+    def restore():
+        for module, name, original in originals:
+            setattr(module, name, original)
+
+    return counts, restore
+
+
+def run_checks(repo_path, shared):
+    """
+    Runs the per-configuration and per-component checks of one instrument.
+    :param shared: Whether the checks of each configuration share one fixture, or each check has its own as if it
+        built its own utilities
+    :return: The counts of file system operations and of XML parses, and the time taken in seconds
+    """
+    AbstractConfigurationUtils.PARSED_XML_CACHE.clear()
+    AbstractConfigurationUtils.MODEL_CACHE.clear()
+    source = CountingConfigSource(repo_path)
+    validation_cache = ValidationCache()
+
+    def make_context():
+        return InstrumentContext(
+            "BENCH",
+            "NDXBENCH",
+            "IN:BENCH:",
+            repo_path,
+            "",
+            source,
+            online=False,
+            validation_cache=validation_cache,
+        )
+
+    context = make_context()
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+    for case, directory in [
+        (ConfigurationsTests, context.fixtures.config_utils),
+        (ComponentsTests, context.fixtures.component_utils),
+    ]:
+        for name in directory.get_configurations_as_list():
+            suite.addTests(
+                [
+                    case(test, name, context if shared else make_context())
+                    for test in loader.getTestCaseNames(case)
+                ]
+            )
+    source.counts.clear()
+
+    parses, restore = count_parses()
+    start = time.perf_counter()
+    try:
+        unittest.TextTestRunner(stream=io.StringIO(), verbosity=0).run(suite)
+    finally:
+        restore()
+    return source.counts, parses, time.perf_counter() - start, suite.countTestCases()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Compares the file system operations and XML parses needed to run the per-configuration and "
+        "per-component checks of one instrument, with each check reading its configuration itself and with the "
+        "checks of each configuration sharing one fixture.",
+    )
+    parser.add_argument(
+        "--configs", type=int, default=50, help="The number of configurations"
+    )
+    parser.add_argument(
+        "--components", type=int, default=20, help="The number of components"
+    )
+    parser.add_argument(
+        "--blocks",
+        type=int,
+        default=100,
+        help="The number of blocks in each configuration",
+    )
+    args = parser.parse_args()
+
+    repo_path = tempfile.mkdtemp()
+    try:
+        write_repository(repo_path, args.configs, args.components, args.blocks)
+        for name, shared in [("per check", False), ("shared", True)]:
+            operations, parses, elapsed, tests = run_checks(repo_path, shared)
+            print(
+                "{:<9}: {} checks, {:>6} file system operations ({}), {:>5} XML parses, {:>6.2f} s".format(
+                    name,
+                    tests,
+                    sum(operations.values()),
+                    ", ".join(
+                        f"{operation} {count}"
+                        for operation, count in sorted(operations.items())
+                    ),
+                    sum(parses.values()),
+                    elapsed,
+                )
+            )
+    finally:
+        shutil.rmtree(repo_path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
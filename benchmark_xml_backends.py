@@ -0,0 +1,106 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmark_blocks_xml import write_blocks_xml
+from util.xml_backend import ElementTreeBackend, LxmlBackend, lxml_etree
+
+# A minimal schema for the blocks written by write_blocks_xml, used when no schema folder is given.
+BLOCKS_XSD = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           targetNamespace="http://epics.isis.rl.ac.uk/schema/blocks/1.0"
+           xmlns="http://epics.isis.rl.ac.uk/schema/blocks/1.0"
+           elementFormDefault="qualified">
+    <xs:element name="blocks">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="block" minOccurs="0" maxOccurs="unbounded">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:any processContents="skip" minOccurs="0" maxOccurs="unbounded"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+
+def get_throughput(check, contents, repeats):
+    """
+    :return: The number of times per second the check ran on the contents
+    """
+    start = time.perf_counter()
+    for _ in range(repeats):
+        check(contents)
+    return repeats / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        description="Compares the throughput of parsing a blocks.xml with ElementTree and lxml, and of validating "
+        "it against its schema with lxml.",
+    )
+    parser.add_argument(
+        "--blocks",
+        type=int,
+        default=1000,
+        help="The number of blocks in the benchmarked file",
+    )
+    parser.add_argument(
+        "--repeats",
+        type=int,
+        default=20,
+        help="The number of times to parse or validate the file",
+    )
+    parser.add_argument(
+        "--schema_path",
+        type=str,
+        default=None,
+        help="The folder containing blocks.xsd. If not defined, a minimal schema is generated.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        blocks_file = os.path.join(directory, "blocks.xml")
+        write_blocks_xml(blocks_file, args.blocks)
+        with open(blocks_file, "rb") as f:
+            contents = f.read()
+
+        schema_path = args.schema_path
+        if schema_path is None:
+            schema_path = directory
+            with open(os.path.join(directory, "blocks.xsd"), "w") as f:
+                f.write(BLOCKS_XSD)
+
+        checks = [("elementtree parse", ElementTreeBackend().get_parse_errors)]
+        if lxml_etree is not None:
+            lxml_backend = LxmlBackend(schema_path)
+            checks += [
+                ("lxml parse", lxml_backend.get_parse_errors),
+                (
+                    "lxml validate",
+                    lambda contents: lxml_backend.get_schema_errors(
+                        "blocks.xml", contents
+                    ),
+                ),
+            ]
+        else:
+            print("lxml is not installed, only benchmarking ElementTree")
+
+        print(
+            f"{args.blocks} blocks ({len(contents) / 2**20:.1f} MiB file), {args.repeats} repeats"
+        )
+        for name, check in checks:
+            throughput = get_throughput(check, contents, args.repeats)
+            print(
+                f"{name:<18}: {throughput:>8.1f} files/s, {throughput * len(contents) / 2**20:>8.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-from __future__ import absolute_import, print_function
 
 import argparse
 import glob
@@ -7,6 +6,7 @@ import os
 from run_tests import setup_instrument_tests
 from tests.settings import Settings
 from util.channel_access import ChannelAccessUtils
+from util.repository_session import RepositorySession
 
 
 def get_usage_on_instruments(instruments, functions_to_check):
@@ -18,17 +18,18 @@ def get_usage_on_instruments(instruments, functions_to_check):
     """
 
     found_items = {}
+    session = RepositorySession(Settings.config_repo_path, Settings.gui_repo_path)
 
     for instrument in instruments:
         instrument_name = instrument["name"]
 
         found_items[instrument_name] = set()
-        setup_instrument_tests(instrument)
+        setup_instrument_tests(instrument, session)
 
         for filename in glob.glob(
             os.path.join(Settings.config_repo_path, "**/*.py"), recursive=True
         ):
-            print("Found python file: {}".format(filename))
+            print(f"Found python file: {filename}")
             with open(filename, "r") as f:
                 for line_no, line in enumerate(f):
                     for function in functions_to_check:
@@ -59,7 +60,7 @@ def main():
 
     instruments = ChannelAccessUtils().get_inst_list()
     if len(instruments) == 0:
-        raise IOError(
+        raise OSError(
             "No instruments found. This is probably because the instrument list PV is unavailable."
         )
 
@@ -86,7 +87,7 @@ def main():
 
     for instrument, found_item in found_usages.items():
         if found_item:
-            print("For instrument {}".format(instrument))
+            print(f"For instrument {instrument}")
             [print(line) for line in found_item]
             print()
 
@@ -1,5 +1,3 @@
-from __future__ import absolute_import, print_function
-
 import argparse
 import os
 
@@ -7,6 +5,7 @@ from run_tests import setup_instrument_tests
 from tests.settings import Settings
 from util.channel_access import ChannelAccessUtils
 from util.configurations import ComponentUtils, ConfigurationUtils, DeviceUtils
+from util.repository_session import RepositorySession
 
 
 def calc_iocs_on_intruments(instruments):
@@ -16,27 +15,34 @@ def calc_iocs_on_intruments(instruments):
 
     instrument_configs = {}
     instrument_device_screens = {}
+    session = RepositorySession(Settings.config_repo_path, Settings.gui_repo_path)
 
     for instrument in instruments:
         instrument_name = instrument["name"]
 
         instrument_configs[instrument_name] = set()
-        setup_instrument_tests(instrument)
+        setup_instrument_tests(instrument, session)
         config_utils = ConfigurationUtils(Settings.config_repo_path)
-        for config in ConfigurationUtils(Settings.config_repo_path).get_configurations_as_list():
-            iocs_in_config = set(config_utils.get_iocs(config_utils.get_iocs_xml(config)))
-            instrument_configs[instrument_name] = instrument_configs[instrument_name].union(
-                iocs_in_config
+        for config in ConfigurationUtils(
+            Settings.config_repo_path
+        ).get_configurations_as_list():
+            iocs_in_config = set(
+                config_utils.get_iocs(config_utils.get_iocs_root(config))
             )
+            instrument_configs[instrument_name] = instrument_configs[
+                instrument_name
+            ].union(iocs_in_config)
 
         component_utils = ComponentUtils(Settings.config_repo_path)
-        for component in ComponentUtils(Settings.config_repo_path).get_configurations_as_list():
+        for component in ComponentUtils(
+            Settings.config_repo_path
+        ).get_configurations_as_list():
             iocs_in_component = set(
-                component_utils.get_iocs(component_utils.get_iocs_xml(component))
-            )
-            instrument_configs[instrument_name] = instrument_configs[instrument_name].union(
-                iocs_in_component
+                component_utils.get_iocs(component_utils.get_iocs_root(component))
             )
+            instrument_configs[instrument_name] = instrument_configs[
+                instrument_name
+            ].union(iocs_in_component)
 
         device_utils = DeviceUtils(Settings.config_repo_path)
         try:
@@ -69,11 +75,11 @@ def print_instruments_with_ioc(instrument_configs, ioc_name):
     :param instrument_configs: instrument ioc config dictionary
     :param ioc_name: name of the ioc
     """
-    print("Instruments containing IOCs starting with {}".format(ioc_name))
+    print(f"Instruments containing IOCs starting with {ioc_name}")
     for instrument, iocs in instrument_configs.items():
         for ioc in iocs:
             if ioc.lower().startswith(ioc_name.lower()):
-                print("{} has {}".format(instrument, ioc))
+                print(f"{instrument} has {ioc}")
 
 
 def print_device_screens_on_instrument(instrument_device_screens):
@@ -103,7 +109,10 @@ def main():
         help="The path to the configurations repository.",
     )
     parser.add_argument(
-        "--gui_repo_path", required=True, type=str, help="The path to the GUI repository."
+        "--gui_repo_path",
+        required=True,
+        type=str,
+        help="The path to the GUI repository.",
     )
     parser.add_argument(
         "--instruments",
@@ -121,14 +130,16 @@ def main():
         "this string, otherwise show all iocs on the instruments",
     )
     parser.add_argument(
-        "--device_screens", help="Print device screens present on instrument/s", action="store_true"
+        "--device_screens",
+        help="Print device screens present on instrument/s",
+        action="store_true",
     )
 
     args = parser.parse_args()
 
     instruments = ChannelAccessUtils().get_inst_list()
     if len(instruments) == 0:
-        raise IOError(
+        raise OSError(
             "No instruments found. This is probably because the instrument list PV is unavailable."
         )
 
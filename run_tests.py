@@ -1,18 +1,20 @@
-from __future__ import absolute_import, print_function
-
 import argparse
+import concurrent.futures
+import multiprocessing
 import os
 import sys
 import traceback
-import typing
 import unittest
 from builtins import str
 from json import JSONDecodeError, loads
 
+import git
 from xmlrunner import XMLTestRunner
 
+from tests.abstract_test_utils import AbstractSingleTests
 from tests.component_tests import ComponentsSingleTests, ComponentsTests
 from tests.configuration_tests import ConfigurationsSingleTests, ConfigurationsTests
+from tests.context import InstrumentContext
 from tests.dae_tests import DaeTests
 from tests.globals_tests import GlobalsTests
 from tests.motor_tests import MotorTests
@@ -20,20 +22,41 @@ from tests.scripting_directory_tests import ScriptingDirectoryTests
 from tests.settings import Settings
 from tests.synoptic_tests import SynopticTests
 from tests.version_tests import VersionTests
-from util.channel_access import ChannelAccessUtils
+from util.affected_set import AffectedSet
+from util.blockserver_cache import BlockserverCache
+from util.blockserver_payload import PAYLOAD_DECODE_ERRORS
+from util.ca_breaker import (
+    CHANNEL_ACCESS_BUDGET,
+    MAX_CONSECUTIVE_TIMEOUTS,
+    ChannelAccessBreaker,
+)
+from util.channel_access import LIVENESS_PROBE_TIMEOUT, ChannelAccessUtils
+from util.concurrent_suite import ConcurrentTestSuite
+from util.config_source import FileSystemConfigSource
 from util.configurations import ComponentUtils, ConfigurationUtils
 from util.git_wrapper import GitUtils
-from util.gui import GuiUtils
+from util.incremental import IncrementalState
+from util.item_reports import ItemXMLTestResult, get_item_suite_name
+from util.repository_session import RepositorySession
 from util.synoptic import SynopticUtils
+from util.validation_cache import ValidationCache
 from util.version import VersionUtils
+from util.xml_backend import get_xml_backend
 
 
-def run_instrument_tests(inst_name, reports_path):
+def run_instrument_tests(context, reports_path, affected_set=None):
     """
     Runs the test suite
-    :param inst_name: The name of the instrument to run tests on,
-                    used to sort the test reports folder into instrument-specific reports
+
+    Instrument-wide tests run one after another. The tests of each configuration, component and synoptic only read
+    the instrument's files, so they run on Settings.test_threads threads, and are reported in the same order as if
+    they had run one after another.
+
+    :param context: The context of the instrument to run tests on. Its name is used to sort the test reports
+        folder into instrument-specific reports
     :param reports_path: The path to store test reports
+    :param affected_set: If given, only the configurations, components and synoptics in this set are tested
+        individually. Instrument-wide tests always run.
     :return: True if the tests passed, false otherwise
     """
     suite = unittest.TestSuite()
@@ -48,71 +71,240 @@ def run_instrument_tests(inst_name, reports_path):
         MotorTests,
         DaeTests,
     ]:
-        suite.addTests(loader.loadTestsFromTestCase(case))
+        suite.addTests(
+            [case(test, context=context) for test in loader.getTestCaseNames(case)]
+        )
 
     # Add configs test suite a dynamic number of times with an argument of the config name.
     # unittest's test loader is unable to take arguments to test classes by default so have
-    # to use the getTestCaseNames() syntax and explicitly add the argument ourselves.
+    # to use the getTestCaseNames() syntax and explicitly add the arguments ourselves.
 
     try:
-        configs = ConfigurationUtils(Settings.config_repo_path).get_configurations_as_list()
-        components = ComponentUtils(Settings.config_repo_path).get_configurations_as_list()
-        synoptics = SynopticUtils(Settings.config_repo_path).get_synoptics_filenames()
-    except IOError as e:
+        configs = ConfigurationUtils(
+            context.config_repo_path, context.config_source
+        ).get_configurations_as_list()
+        components = ComponentUtils(
+            context.config_repo_path, context.config_source
+        ).get_configurations_as_list()
+        synoptics = SynopticUtils(
+            context.config_repo_path, context.config_source
+        ).get_synoptics_filenames()
+    except OSError as e:
         print(
-            "Failed to build tests for instrument {}: exception occured while generating tests.".format(
-                inst_name
-            )
+            f"Failed to build tests for instrument {context.name}: exception occured while generating tests."
         )
         traceback.print_exc(e)
         return False
 
+    if affected_set is not None:
+        configs = [
+            config for config in configs if config in affected_set.configurations
+        ]
+        components = [
+            component
+            for component in components
+            if component in affected_set.components
+        ]
+        synoptics = [
+            synoptic for synoptic in synoptics if synoptic in affected_set.synoptics
+        ]
+        print(
+            f"Testing {len(configs)} configurations, {len(components)} components and {len(synoptics)} synoptics affected by changes"
+        )
+
+    item_suite = ConcurrentTestSuite(threads=Settings.test_threads)
+
     for config in configs:
-        suite.addTests(
+        item_suite.addTests(
             [
-                ConfigurationsTests(test, config)
+                ConfigurationsTests(test, config, context)
                 for test in loader.getTestCaseNames(ConfigurationsTests)
             ]
         )
 
     for component in components:
-        suite.addTests(
-            [ComponentsTests(test, component) for test in loader.getTestCaseNames(ComponentsTests)]
+        item_suite.addTests(
+            [
+                ComponentsTests(test, component, context)
+                for test in loader.getTestCaseNames(ComponentsTests)
+            ]
         )
 
     for synoptic in synoptics:
-        suite.addTests(
-            [SynopticTests(test, synoptic) for test in loader.getTestCaseNames(SynopticTests)]
+        item_suite.addTests(
+            [
+                SynopticTests(test, synoptic, context)
+                for test in loader.getTestCaseNames(SynopticTests)
+            ]
         )
 
-    runner = XMLTestRunner(output=str(os.path.join(reports_path, inst_name)), stream=sys.stdout)
+    suite.addTest(item_suite)
+
+    runner = XMLTestRunner(
+        output=str(os.path.join(reports_path, context.name)),
+        stream=sys.stdout,
+        resultclass=ItemXMLTestResult,
+    )
     return runner.run(suite).wasSuccessful()
 
 
-def setup_instrument_tests(instrument):
+class PreparedInstrument:
+    """
+    The outcome of the git and channel access work needed before an instrument can be tested, gathered without
+    touching the instrument being tested so that it can be done in the background while another one is tested.
+    """
+
+    def __init__(self, instrument, session, online):
+        """
+        :param instrument: A dictionary representing the properties of an instrument as per the CS:INSTLIST PV.
+        :param session: The repository session the instrument was prepared with
+        :param online: Whether the instrument answered the liveness probe
+        """
+        self.instrument = instrument
+        self.session = session
+        self.online = online
+        self.inputs = None
+        self.unchanged = False
+        self.success = False
+        self.ca_breaker = None
+        self.blockserver_cache = None
+        self.config_source = None
+        self.valid_synoptic_targets_and_types = (None, None)
+
+
+def prepare_instrument(
+    instrument,
+    session,
+    checkout_free=False,
+    online=True,
+    incremental_state=None,
+    checker_version=None,
+):
     """
-    Sets up the settings class and configurations repository to point at the given instrument.
+    Reads an instrument's blockserver PVs and checks out or reads its configurations branch.
 
     :param instrument: A dictionary representing the properties of an instrument as per the CS:INSTLIST PV.
-    :return: True if successful, False otherwise.
+    :param session: The repository session to check out or read the instrument's configurations with
+    :param checkout_free: Whether to read the instrument's configurations straight from git objects instead of
+        checking out its branch.
+    :param online: Whether the instrument answered the liveness probe. The PVs of an instrument that is not online
+        are not read.
+    :param incremental_state: The incremental state to compare against, or None to always prepare the instrument
+    :param checker_version: The commit of this checker, used in incremental mode
+    :return: The prepared instrument. If its inputs have not changed since it last passed, nothing else is prepared.
     """
-    name, hostname, pv_prefix = instrument["name"], instrument["hostName"], instrument["pvPrefix"]
-    try:
-        Settings.set_instrument(name, hostname, pv_prefix)
-    except Exception:
-        print("Unable to set instrument to {} because {}".format(name, traceback.format_exc()))
-        return False
+    name, hostname, pv_prefix = (
+        instrument["name"],
+        instrument["hostName"],
+        instrument["pvPrefix"],
+    )
+    prepared = PreparedInstrument(instrument, session, online)
+    prepared.ca_breaker = ChannelAccessBreaker(
+        name, Settings.max_consecutive_ca_timeouts, Settings.ca_budget
+    )
+    prepared.blockserver_cache = BlockserverCache()
+    channel_access = ChannelAccessUtils(
+        pv_prefix, prepared.ca_breaker, prepared.blockserver_cache
+    )
+    if online:
+        try:
+            prepared.blockserver_cache.preload(
+                channel_access.read_blockserver_payloads()
+            )
+        except PAYLOAD_DECODE_ERRORS:
+            print(
+                f"Unable to set instrument to {name} because {traceback.format_exc()}"
+            )
+            return prepared
 
-    print("\n\nChecking out git repository for {} ({})...".format(name, hostname))
-    config_repo_update_successful = GitUtils(Settings.config_repo_path).update_branch(hostname)
+    if incremental_state is not None:
+        prepared.inputs = get_instrument_inputs(
+            instrument, session, checker_version, channel_access if online else None
+        )
+        if prepared.inputs is not None and incremental_state.is_unchanged(
+            name, prepared.inputs
+        ):
+            prepared.unchanged = True
+            return prepared
 
-    version_utils = VersionUtils(Settings.config_repo_path)
+    if checkout_free:
+        print(f"\n\nReading git objects for {name} ({hostname})...")
+        prepared.config_source = session.get_config_branch_source(hostname)
+        if prepared.config_source is None:
+            return prepared
+        config_repo_update_successful = True
+    else:
+        print(f"\n\nChecking out git repository for {name} ({hostname})...")
+        prepared.config_source = FileSystemConfigSource(session.config_repo_path)
+        config_repo_update_successful = session.checkout_config_branch(hostname)
 
+    version_utils = VersionUtils(session.config_repo_path, prepared.config_source)
     if version_utils.version_file_exists():
-        GuiUtils(Settings.gui_repo_path).get_gui_repo_at_release(version_utils.get_version())
+        try:
+            prepared.valid_synoptic_targets_and_types = (
+                session.get_valid_synoptic_targets_and_types(
+                    version_utils.get_version()
+                )
+            )
+        except (OSError, ValueError) as e:
+            print(f"Unable to read opi_info.xml for instrument {name} because {e}")
+            return prepared
     else:
-        print("Warning: could not determine GUI version for instrument {}".format(instrument))
-    return config_repo_update_successful
+        print(f"Warning: could not determine GUI version for instrument {instrument}")
+    prepared.success = config_repo_update_successful
+    return prepared
+
+
+def create_instrument_context(prepared):
+    """
+    Creates the context the tests of a prepared instrument are run with.
+
+    :param prepared: The prepared instrument
+    :return: The context, or None if the instrument was not prepared successfully and cannot be tested.
+    """
+    if not prepared.success:
+        return None
+    instrument = prepared.instrument
+    try:
+        return InstrumentContext.for_instrument(
+            instrument["name"],
+            instrument["hostName"],
+            instrument["pvPrefix"],
+            prepared.session.config_repo_path,
+            prepared.session.gui_repo_path,
+            prepared.config_source,
+            prepared.online,
+            prepared.valid_synoptic_targets_and_types,
+            prepared.ca_breaker,
+            prepared.blockserver_cache,
+        )
+    except PAYLOAD_DECODE_ERRORS:
+        print(
+            "Unable to set instrument to {} because {}".format(
+                instrument["name"], traceback.format_exc()
+            )
+        )
+        return None
+
+
+def setup_instrument_tests(instrument, session=None, checkout_free=False, online=True):
+    """
+    Sets up the configurations repository for the given instrument and creates the context its tests run with.
+
+    :param instrument: A dictionary representing the properties of an instrument as per the CS:INSTLIST PV.
+    :param session: The repository session for the run, which makes sure each repository is only fetched once.
+        If not given, a new session is created and the repositories are fetched for this instrument alone.
+    :param checkout_free: Whether to read the instrument's configurations straight from git objects instead of
+        checking out its branch.
+    :param online: Whether the instrument answered the liveness probe. The checks that read PVs from an
+        instrument that is not online are skipped.
+    :return: The context of the instrument if successful, None otherwise.
+    """
+    if session is None:
+        session = RepositorySession(Settings.config_repo_path, Settings.gui_repo_path)
+    return create_instrument_context(
+        prepare_instrument(instrument, session, checkout_free, online)
+    )
 
 
 def run_self_tests(reports_path):
@@ -122,10 +314,14 @@ def run_self_tests(reports_path):
     """
     print("Running self-tests...")
     suite = unittest.TestLoader().discover(os.path.join("util", "test_utils"))
-    return XMLTestRunner(output=str(reports_path), stream=sys.stdout).run(suite).wasSuccessful()
+    return (
+        XMLTestRunner(output=str(reports_path), stream=sys.stdout)
+        .run(suite)
+        .wasSuccessful()
+    )
 
 
-def get_excluded_list_of_instruments() -> typing.List[str]:
+def get_excluded_list_of_instruments() -> list[str]:
     """
     Gets the excluded list of instruments by getting the value of the environment variable `DISABLE_CHECK_INST`.
     This needs to be in the format of a JSON list, for example:
@@ -139,9 +335,512 @@ def get_excluded_list_of_instruments() -> typing.List[str]:
         return []
 
 
-def run_all_tests(reports_path, instruments):
+def get_instrument_inputs(instrument, session, checker_version, channel_access=None):
+    """
+    Gets the inputs that determine the outcome of checking an instrument, without checking anything out.
+
+    :param instrument: A dictionary representing the properties of an instrument as per the CS:INSTLIST PV.
+    :param session: The repository session for the run
+    :param checker_version: The commit of this checker, so that results are not reused after the checks change
+    :param channel_access: The channel access utilities of the instrument, with its breaker and the blockserver
+        cache its checks will use, or None if it did not answer the liveness probe. The server PVs of an instrument
+        that is not online are taken to be unavailable rather than read.
+    :return: A dictionary of inputs, or None if they could not all be determined
+    """
+    configs_commit = session.get_config_branch_commit(instrument["hostName"])
+    if configs_commit is None or checker_version is None:
+        return None
+    if channel_access is not None:
+        server_pvs_digest = channel_access.get_checked_server_pvs_digest()
+    else:
+        server_pvs_digest = ChannelAccessUtils.get_server_pvs_digest(
+            dict.fromkeys(ChannelAccessUtils.CHECKED_SERVER_PVS)
+        )
+    return {
+        "checker_version": checker_version,
+        "configs_commit": configs_commit,
+        "gui_release_tag": session.get_gui_release_tag(instrument["hostName"]),
+        "server_pvs_digest": server_pvs_digest,
+    }
+
+
+# Totals that only describe how a run went, rather than the instrument, so are not replayed in incremental mode.
+CACHE_TOTALS = [
+    "validation_cache_hits",
+    "validation_cache_misses",
+    "blockserver_cache_hits",
+    "blockserver_cache_misses",
+]
+
+
+def _add_to_non_interesting_block_pv_totals(totals):
+    """
+    Adds an instrument's non interesting block PV totals to the totals of the run.
+    :param totals: A dictionary of results containing the component and configuration totals
+    """
+    with AbstractSingleTests.TOTALS_LOCK:
+        ComponentsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS += totals.get(
+            "component_total", 0
+        )
+        ConfigurationsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS += totals.get(
+            "configuration_total", 0
+        )
+
+
+def _get_run_totals():
+    return {
+        "component_total": ComponentsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS,
+        "configuration_total": ConfigurationsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS,
+        "validation_cache_hits": Settings.validation_cache.hits,
+        "validation_cache_misses": Settings.validation_cache.misses,
+    }
+
+
+def _list_report_files(reports_path):
+    if not os.path.isdir(reports_path):
+        return set()
+    return {os.path.join(reports_path, f) for f in os.listdir(reports_path)}
+
+
+def get_affected_set(previous_configs_commit, configs_commit, session, context):
+    """
+    Gets the configurations, components and synoptics affected by the changes to an instrument's configurations
+    branch between two commits.
+
+    :param previous_configs_commit: The commit the instrument was last checked successfully with
+    :param configs_commit: The commit being checked now
+    :param session: The repository session for the run
+    :param context: The context of the instrument, whose configurations are at the newer commit
+    :return: The affected set, or None if everything must be checked
+    """
+    try:
+        changed_paths = session.config_object_reader.get_changed_paths(
+            previous_configs_commit, configs_commit
+        )
+    except (git.GitCommandError, git.BadName, ValueError) as e:
+        print(f"Unable to diff {previous_configs_commit} against {configs_commit}: {e}")
+        return None
+    return AffectedSet.from_changed_paths(
+        changed_paths,
+        ConfigurationUtils(context.config_repo_path, context.config_source),
+    )
+
+
+def get_affected_suite_names(affected_set):
+    """
+    Gets the test suites that the reports of the configurations, components and synoptics in an affected set are
+    written to.
+
+    :param affected_set: The affected set
+    :return: The names of the suites
+    """
+    return (
+        {
+            get_item_suite_name(ConfigurationsTests, config)
+            for config in affected_set.configurations
+        }
+        | {
+            get_item_suite_name(ComponentsTests, component)
+            for component in affected_set.components
+        }
+        | {
+            get_item_suite_name(SynopticTests, synoptic)
+            for synoptic in affected_set.synoptics
+        }
+    )
+
+
+def check_instrument(
+    instrument,
+    reports_path,
+    session,
+    checkout_free=False,
+    incremental_state=None,
+    checker_version=None,
+    online=True,
+    prepared=None,
+):
+    """
+    Sets up and runs the tests for a single instrument.
+
+    In incremental mode, an instrument whose inputs are the same as when it was last checked successfully is not
+    checked out or tested again. Its reports and results from that run are replayed instead. If only its
+    configurations commit has moved, only the configurations, components and synoptics affected by the changes are
+    tested individually.
+
+    :param instrument: A dictionary representing the properties of an instrument as per the CS:INSTLIST PV.
+    :param reports_path: The path to store test reports
+    :param session: The repository session for the run
+    :param checkout_free: Whether to read configurations straight from git objects
+    :param incremental_state: The incremental state to compare against, or None to always run the tests
+    :param checker_version: The commit of this checker, used in incremental mode
+    :param online: Whether the instrument answered the liveness probe. If not, only the checks that do not read
+        PVs from the instrument are run.
+    :param prepared: The instrument, if it has already been prepared in the background with the same arguments.
+        Otherwise it is prepared now with the given session.
+    :return: A tuple of (success, inputs, results). The inputs are None unless running in incremental mode and
+        results is a dictionary of the non interesting block pv totals and cache hits and misses for
+        this instrument.
+    """
+    name = instrument["name"]
+    if prepared is None:
+        prepared = prepare_instrument(
+            instrument,
+            session,
+            checkout_free,
+            online,
+            incremental_state,
+            checker_version,
+        )
+    inputs = prepared.inputs
+    if prepared.unchanged:
+        print(
+            f"\n\nSkipping {name} as its inputs have not changed since it last passed"
+        )
+        incremental_state.replay_reports(name, os.path.join(reports_path, name))
+        results = incremental_state.get_results(name)
+        _add_to_non_interesting_block_pv_totals(results)
+        return True, inputs, results
+
+    totals_before = _get_run_totals()
+    existing_reports = _list_report_files(os.path.join(reports_path, name))
+
+    context = create_instrument_context(prepared)
+    affected_set = None
+    if context is not None:
+        if incremental_state is not None and inputs is not None:
+            previous_configs_commit = incremental_state.get_previous_configs_commit(
+                name, inputs
+            )
+            if previous_configs_commit is not None:
+                affected_set = get_affected_set(
+                    previous_configs_commit,
+                    inputs["configs_commit"],
+                    prepared.session,
+                    context,
+                )
+        success = run_instrument_tests(context, reports_path, affected_set)
+    else:
+        success = False
+
+    results = {
+        key: value - totals_before[key] for key, value in _get_run_totals().items()
+    }
+    if context is not None:
+        results["blockserver_cache_hits"] = context.blockserver_cache.hits
+        results["blockserver_cache_misses"] = context.blockserver_cache.misses
+    if incremental_state is not None and success and inputs is not None:
+        incremental_state.store_reports(
+            name,
+            sorted(
+                _list_report_files(os.path.join(reports_path, name)) - existing_reports
+            ),
+            None if affected_set is None else get_affected_suite_names(affected_set),
+        )
+    return success, inputs, results
+
+
+def _get_worktree_path(worktrees_path, worker_number):
+    """
+    Gets the path of the configurations worktree used by a parallel worker.
+    :param worktrees_path: The folder in which worktrees are created
+    :param worker_number: The index of the worker
+    :return: The configurations worktree path
+    """
+    return os.path.join(worktrees_path, f"configs_{worker_number}")
+
+
+# The repository session and incremental state of a parallel worker process, set up by _init_parallel_worker.
+_worker_session = None
+_worker_incremental_state = None
+
+
+def _init_parallel_worker(
+    worktree_slots,
+    gui_repo_path,
+    cache_path,
+    checker_version,
+    incremental,
+    schema_path,
+    ca_breaker_limits,
+    test_threads,
+):
+    """
+    Initialises a parallel worker process by pointing its settings at a configurations worktree that no other
+    worker uses.
+
+    The main process has already fetched both repositories, and worktrees share their object databases, so the
+    worker's session never needs to fetch. The GUI repository is only read from git objects, so workers share it.
+
+    :param worktree_slots: A queue of configurations worktree paths
+    :param gui_repo_path: The path of the GUI repository
+    :param cache_path: The folder in which persistent caches are kept, or None
+    :param checker_version: The commit of this checker, or None if it is not known
+    :param incremental: Whether to skip instruments whose inputs have not changed since they last passed
+    :param schema_path: The folder containing the schemas to validate configuration files against, or None
+    :param ca_breaker_limits: A tuple of the maximum consecutive channel access timeouts and the channel access
+        budget of each instrument
+    :param test_threads: The number of threads to run the tests of each configuration, component and synoptic on
+    """
+    global _worker_session, _worker_incremental_state
+    config_worktree = worktree_slots.get()
+    Settings.set_repo_paths(config_worktree, gui_repo_path)
+    _worker_session = RepositorySession(
+        config_worktree, gui_repo_path, fetched=True, cache_path=cache_path
+    )
+    _worker_incremental_state = IncrementalState(cache_path) if incremental else None
+    Settings.set_validation_cache(ValidationCache(cache_path, checker_version))
+    Settings.set_xml_backend(get_xml_backend(schema_path))
+    Settings.set_ca_breaker_limits(*ca_breaker_limits)
+    Settings.set_test_threads(test_threads)
+
+
+def _run_instrument_in_worker(
+    instrument, reports_path, checkout_free, checker_version, online
+):
+    """
+    Sets up and runs the tests for a single instrument in a parallel worker process.
+
+    Class-level totals and the incremental state do not propagate back from worker processes, so the inputs and
+    totals for this instrument are returned alongside the result and handled by the main process.
+
+    :param instrument: A dictionary representing the properties of an instrument as per the CS:INSTLIST PV.
+    :param reports_path: The path to store test reports
+    :param checkout_free: Whether to read configurations straight from git objects
+    :param checker_version: The commit of this checker, or None if it is not known
+    :param online: Whether the instrument answered the liveness probe
+    :return: A tuple of (success, inputs, results) as returned by check_instrument
+    """
+    return check_instrument(
+        instrument,
+        reports_path,
+        _worker_session,
+        checkout_free,
+        _worker_incremental_state,
+        checker_version,
+        online,
+    )
+
+
+def _run_instruments_in_parallel(
+    reports_path,
+    instruments,
+    jobs,
+    worktrees_path,
+    checkout_free,
+    cache_path,
+    checker_version,
+    incremental,
+    schema_path,
+    live_instruments,
+):
+    """
+    Runs the instrument tests concurrently in a pool of worker processes.
+
+    Each worker gets its own worktree of the configurations repository so that workers never check out over each
+    other. The worktrees share the object database of the main repository, which has already been fetched by the
+    caller.
+
+    :param reports_path: The path to store test reports
+    :param instruments: The instruments to run tests on
+    :param jobs: The number of worker processes to use
+    :param worktrees_path: The folder in which to create the worktrees
+    :param checkout_free: Whether to read configurations straight from git objects
+    :param cache_path: The folder in which persistent caches are kept, or None
+    :param checker_version: The commit of this checker, or None if it is not known
+    :param incremental: Whether to skip instruments whose inputs have not changed since they last passed
+    :param schema_path: The folder containing the schemas to validate configuration files against, or None
+    :param live_instruments: The names of the instruments that answered the liveness probe
+    :return: A list of (success, inputs, results) tuples, one for each instrument, as returned by check_instrument
+    """
+    config_git = GitUtils(Settings.config_repo_path)
+    worktree_slots = multiprocessing.Queue()
+    worktrees = [_get_worktree_path(worktrees_path, i) for i in range(jobs)]
+    for config_worktree in worktrees:
+        config_git.add_worktree(config_worktree)
+        worktree_slots.put(config_worktree)
+
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_parallel_worker,
+            initargs=(
+                worktree_slots,
+                Settings.gui_repo_path,
+                cache_path,
+                checker_version,
+                incremental,
+                schema_path,
+                (Settings.max_consecutive_ca_timeouts, Settings.ca_budget),
+                Settings.test_threads,
+            ),
+        ) as executor:
+            return list(
+                executor.map(
+                    _run_instrument_in_worker,
+                    instruments,
+                    [reports_path] * len(instruments),
+                    [checkout_free] * len(instruments),
+                    [checker_version] * len(instruments),
+                    [
+                        instrument["name"] in live_instruments
+                        for instrument in instruments
+                    ],
+                )
+            )
+    finally:
+        for config_worktree in worktrees:
+            config_git.remove_worktree(config_worktree)
+
+
+def _run_instruments_with_prefetch(
+    reports_path,
+    instruments,
+    worktrees_path,
+    checkout_free,
+    cache_path,
+    incremental_state,
+    checker_version,
+    live_instruments,
+):
+    """
+    Runs the instrument tests one instrument at a time, preparing the next instrument on a background thread while
+    the current one is tested, so that waiting on git and channel access overlaps with running tests.
+
+    Instruments take turns between two repository sessions, so the instrument being prepared never changes the
+    configurations the current instrument is tested against. When checking out, each session has its own worktree
+    of the configurations repository, which has already been fetched by the caller.
+
+    :param reports_path: The path to store test reports
+    :param instruments: The instruments to run tests on
+    :param worktrees_path: The folder in which to create the worktrees
+    :param checkout_free: Whether to read configurations straight from git objects
+    :param cache_path: The folder in which persistent caches are kept, or None
+    :param incremental_state: The incremental state to compare against, or None to always run the tests
+    :param checker_version: The commit of this checker, or None if it is not known
+    :param live_instruments: The names of the instruments that answered the liveness probe
+    :return: A list of (success, inputs, results) tuples, one for each instrument, as returned by check_instrument
+    """
+    config_git = GitUtils(Settings.config_repo_path)
+    worktrees = (
+        []
+        if checkout_free
+        else [_get_worktree_path(worktrees_path, i) for i in range(2)]
+    )
+    for config_worktree in worktrees:
+        config_git.add_worktree(config_worktree)
+    sessions = [
+        RepositorySession(
+            worktrees[i] if worktrees else Settings.config_repo_path,
+            Settings.gui_repo_path,
+            fetched=True,
+            cache_path=cache_path,
+        )
+        for i in range(2)
+    ]
+
+    def prepare(index):
+        return prepare_instrument(
+            instruments[index],
+            sessions[index % 2],
+            checkout_free,
+            instruments[index]["name"] in live_instruments,
+            incremental_state,
+            checker_version,
+        )
+
+    try:
+        results = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            next_prepared = executor.submit(prepare, 0) if instruments else None
+            for index, instrument in enumerate(instruments):
+                prepared = next_prepared.result()
+                if index + 1 < len(instruments):
+                    next_prepared = executor.submit(prepare, index + 1)
+                results.append(
+                    check_instrument(
+                        instrument,
+                        reports_path,
+                        prepared.session,
+                        checkout_free,
+                        incremental_state,
+                        checker_version,
+                        prepared.online,
+                        prepared,
+                    )
+                )
+        return results
+    finally:
+        for config_worktree in worktrees:
+            config_git.remove_worktree(config_worktree)
+
+
+def _order_instruments_by_gui_release(instruments, session):
+    """
+    Orders instruments so that instruments running the same GUI release are tested one after another.
+
+    Consecutive instruments on the same release then reuse the opi_info.xml targets and types that the session
+    has just read for that release. Instruments whose release cannot be determined are kept at the end, in their
+    original order.
+
+    :param instruments: The instruments to run tests on
+    :param session: The repository session, used to read each instrument's version from git objects
+    :return: The reordered list of instruments
+    """
+    release_tags = {
+        instrument["name"]: session.get_gui_release_tag(instrument["hostName"])
+        for instrument in instruments
+    }
+    distinct_tags = {tag for tag in release_tags.values() if tag is not None}
+    print(
+        "{} instruments use {} distinct GUI releases: {}".format(
+            len(instruments), len(distinct_tags), ", ".join(sorted(distinct_tags))
+        )
+    )
+    return sorted(
+        instruments,
+        key=lambda instrument: (
+            release_tags[instrument["name"]] is None,
+            release_tags[instrument["name"]] or "",
+        ),
+    )
+
+
+def run_all_tests(
+    reports_path,
+    instruments,
+    jobs=1,
+    worktrees_path=None,
+    checkout_free=False,
+    cache_path=None,
+    incremental=False,
+    schema_path=None,
+    liveness_timeout=LIVENESS_PROBE_TIMEOUT,
+    ca_max_consecutive_timeouts=MAX_CONSECUTIVE_TIMEOUTS,
+    ca_budget=CHANNEL_ACCESS_BUDGET,
+    prefetch=False,
+    test_threads=1,
+):
     """
     Runs all of the tests (including our own unit tests)
+    :param reports_path: The path to store test reports
+    :param instruments: The instruments to run tests on
+    :param jobs: The number of instruments to test concurrently
+    :param worktrees_path: The folder in which to create worktrees when running more than one job
+    :param checkout_free: Whether to read configurations straight from git objects instead of checking them out
+    :param cache_path: The folder in which to keep caches that persist between runs, or None to not persist them
+    :param incremental: Whether to skip instruments whose inputs have not changed since they last passed. Needs
+        a cache path to keep the state in.
+    :param schema_path: The folder containing the XSD schemas to validate configuration files against, or None to
+        only check that they are well-formed
+    :param liveness_timeout: The time to wait for each instrument to answer the liveness probe, in seconds
+    :param ca_max_consecutive_timeouts: The number of channel access reads in a row that may time out before
+        checking whether an instrument is still up, and no longer reading its PVs if it is not
+    :param ca_budget: The total time in seconds the checks of each instrument may spend waiting on channel
+        access, or None for no limit
+    :param prefetch: Whether to prepare the next instrument in the background while the current one is tested.
+        Only used when testing one instrument at a time.
+    :param test_threads: The number of threads to run the tests of each configuration, component and synoptic on
     :return: True if all tests succeeded, False otherwise.
     """
 
@@ -150,32 +849,129 @@ def run_all_tests(reports_path, instruments):
         print("Unit tests failed!")
         return False
 
-    return_values = []
+    # Fetch each repository once for the whole run, rather than once per instrument.
+    session = RepositorySession(
+        Settings.config_repo_path, Settings.gui_repo_path, cache_path=cache_path
+    )
+    if not session.fetch_all():
+        print(
+            "Warning: unable to fetch repositories, fetching will be retried for each instrument"
+        )
+    instruments = _order_instruments_by_gui_release(instruments, session)
+
+    # Probe every instrument at once, so that instruments which are off do not wait out a timeout for each PV read.
+    live_instruments = ChannelAccessUtils.get_live_instruments(
+        instruments, liveness_timeout
+    )
+    offline_instruments = [
+        instrument["name"]
+        for instrument in instruments
+        if instrument["name"] not in live_instruments
+    ]
+    if offline_instruments:
+        print(
+            "Instruments not answering on channel access, only checking their files: {}".format(
+                ", ".join(offline_instruments)
+            )
+        )
+
+    checker_version = GitUtils(
+        os.path.dirname(os.path.abspath(__file__))
+    ).get_head_commit()
+    if checker_version is None and cache_path is not None:
+        print(
+            "Warning: unable to determine the checker version, check results will not be cached"
+        )
+    Settings.set_validation_cache(ValidationCache(cache_path, checker_version))
+    Settings.set_xml_backend(get_xml_backend(schema_path))
+    Settings.set_ca_breaker_limits(ca_max_consecutive_timeouts, ca_budget)
+    Settings.set_test_threads(test_threads)
+    incremental_state = IncrementalState(cache_path) if incremental else None
+
     # Now run the configuration tests
-    for instrument in instruments:
-        if setup_instrument_tests(instrument):
-            return_values.append(run_instrument_tests(instrument["name"], reports_path))
-        else:
-            return_values.append(False)
+    if jobs > 1:
+        results = _run_instruments_in_parallel(
+            reports_path,
+            instruments,
+            jobs,
+            worktrees_path,
+            checkout_free,
+            cache_path,
+            checker_version,
+            incremental,
+            schema_path,
+            live_instruments,
+        )
+        for _, _, totals in results:
+            _add_to_non_interesting_block_pv_totals(totals)
+            Settings.validation_cache.hits += totals.get("validation_cache_hits", 0)
+            Settings.validation_cache.misses += totals.get("validation_cache_misses", 0)
+    elif prefetch:
+        results = _run_instruments_with_prefetch(
+            reports_path,
+            instruments,
+            worktrees_path,
+            checkout_free,
+            cache_path,
+            incremental_state,
+            checker_version,
+            live_instruments,
+        )
+    else:
+        results = []
+        for instrument in instruments:
+            results.append(
+                check_instrument(
+                    instrument,
+                    reports_path,
+                    session,
+                    checkout_free,
+                    incremental_state,
+                    checker_version,
+                    instrument["name"] in live_instruments,
+                )
+            )
+
+    if incremental_state is not None:
+        for instrument, (success, inputs, totals) in zip(instruments, results):
+            incremental_state.record(
+                instrument["name"],
+                inputs if success else None,
+                {
+                    key: value
+                    for key, value in totals.items()
+                    if key not in CACHE_TOTALS
+                },
+            )
+        incremental_state.save()
 
-    _print_test_run_end_messages()
+    _print_test_run_end_messages(results)
 
-    return all(value for value in return_values)
+    return all(success for success, _, _ in results)
 
 
-def _print_test_run_end_messages():
+def _print_test_run_end_messages(results):
     """
     Method used to print any messages that should be printed at the end of the all instruments test run.
+    :param results: The (success, inputs, results) tuple of each instrument, as returned by check_instrument
     """
+    blockserver_cache_hits = sum(
+        totals.get("blockserver_cache_hits", 0) for _, _, totals in results
+    )
+    blockserver_cache_misses = sum(
+        totals.get("blockserver_cache_misses", 0) for _, _, totals in results
+    )
     print(
-        "{} non interesting component block pvs in total across all instruments".format(
-            ComponentsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS
-        )
+        f"{ComponentsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS} non interesting component block pvs in total across all instruments"
     )
     print(
-        "{} non interesting configuration block pvs in total across all instruments".format(
-            ConfigurationsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS
-        )
+        f"{ConfigurationsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS} non interesting configuration block pvs in total across all instruments"
+    )
+    print(
+        f"Validation cache: {Settings.validation_cache.hits} hits, {Settings.validation_cache.misses} misses ({Settings.validation_cache.get_hit_rate():.1%} hit rate)"
+    )
+    print(
+        f"Blockserver cache: {blockserver_cache_hits} hits, {blockserver_cache_misses} misses ({blockserver_cache_hits / max(blockserver_cache_hits + blockserver_cache_misses, 1):.1%} hit rate)"
     )
 
 
@@ -201,7 +997,10 @@ def main():
         help="The path to the configurations repository.",
     )
     parser.add_argument(
-        "--gui_repo_path", required=True, type=str, help="The path to the GUI repository."
+        "--gui_repo_path",
+        required=True,
+        type=str,
+        help="The path to the GUI repository.",
     )
     parser.add_argument(
         "--reports_path",
@@ -217,12 +1016,89 @@ def main():
         help="Instruments to run tests on. If defined, configuration tests will only be run on the "
         "given instruments. If not defined, tests will be run on all instruments.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="The number of instruments to test concurrently. When greater than one, each worker process uses "
+        "its own git worktree of the configurations repository.",
+    )
+    parser.add_argument(
+        "--worktrees_path",
+        type=str,
+        default=None,
+        help="The folder in which worktrees are created when running with more than one job or with --prefetch. "
+        "Defaults to a 'worktrees' folder next to the configurations repository.",
+    )
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="When testing one instrument at a time, check out the next instrument into a worktree of the "
+        "configurations repository and read its blockserver PVs while the current instrument is tested.",
+    )
+    parser.add_argument(
+        "--checkout_free",
+        action="store_true",
+        help="Read each instrument's configurations branch straight from the git object database instead of "
+        "resetting and checking out the configurations repository.",
+    )
+    parser.add_argument(
+        "--cache_path",
+        type=str,
+        default=None,
+        help="The folder in which to keep caches that persist between runs, such as the synoptic targets and "
+        "types of each GUI release. If not defined, nothing is cached between runs.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip instruments whose configurations commit, GUI release and blockserver PVs have not changed "
+        "since they last passed, replaying their previous test reports instead. Requires --cache_path.",
+    )
+
+    parser.add_argument(
+        "--schema_path",
+        type=str,
+        default=None,
+        help="The folder containing the blockserver XSD schemas, e.g. blocks.xsd and iocs.xsd. If defined and "
+        "lxml is installed, every configuration and component file is validated against its schema.",
+    )
+    parser.add_argument(
+        "--liveness_timeout",
+        type=float,
+        default=LIVENESS_PROBE_TIMEOUT,
+        help="The time in seconds to wait for each instrument's blockserver before the tests start. Instruments "
+        "that do not answer in time only have the checks that do not read their PVs run.",
+    )
+    parser.add_argument(
+        "--ca_max_consecutive_timeouts",
+        type=int,
+        default=MAX_CONSECUTIVE_TIMEOUTS,
+        help="The number of PV reads in a row that may time out on an instrument before checking whether its "
+        "blockserver still answers. If it does not, the instrument's remaining PV reads fail immediately.",
+    )
+    parser.add_argument(
+        "--ca_budget",
+        type=float,
+        default=CHANNEL_ACCESS_BUDGET,
+        help="The total time in seconds the checks of each instrument may spend waiting on channel access, after "
+        "which the instrument's remaining PV reads fail immediately. 0 for no limit.",
+    )
+    parser.add_argument(
+        "--test_threads",
+        type=int,
+        default=1,
+        help="The number of threads to run the tests of each configuration, component and synoptic of an "
+        "instrument on. Test reports are the same as when running them one after another.",
+    )
 
     args = parser.parse_args()
+    if args.incremental and args.cache_path is None:
+        parser.error("--incremental requires --cache_path")
 
     instruments = ChannelAccessUtils().get_inst_list()
     if len(instruments) == 0:
-        raise IOError(
+        raise OSError(
             "No instruments found. This is probably because the instrument list PV is unavailable."
         )
 
@@ -233,16 +1109,6 @@ def main():
                 "Some instruments specified could not be found in the instrument list."
             )
 
-    ## the following will exclude down instruments for testing
-    ## change instruments -> instruments_up in run_all_tests below
-    #    inst_names = [x["name"] for x in instruments]
-    #    inst_up = []
-    #    for inst in inst_names:
-    #        if ChannelAccessUtils("IN:{}:".format(inst)).get_value("CS:BLOCKSERVER:GET_CURR_CONFIG_DETAILS") is not None:
-    #            inst_up.append(inst)
-    #        else:
-    #            print("Skipping {} as instrument down (no blockserver)".format(inst))
-    #    instruments_up = [x for x in instruments if x["name"] in inst_up]
     excluded_instruments = get_excluded_list_of_instruments()
     instruments = [x for x in instruments if x["name"] not in excluded_instruments]
     print(f"excluded instruments: {excluded_instruments}")
@@ -252,7 +1118,32 @@ def main():
         os.path.abspath(args.configs_repo_path), os.path.abspath(args.gui_repo_path)
     )
 
-    success = run_all_tests(reports_path, instruments)
+    if args.worktrees_path is not None:
+        worktrees_path = os.path.abspath(args.worktrees_path)
+    else:
+        worktrees_path = os.path.join(
+            os.path.dirname(Settings.config_repo_path), "worktrees"
+        )
+
+    cache_path = (
+        os.path.abspath(args.cache_path) if args.cache_path is not None else None
+    )
+
+    success = run_all_tests(
+        reports_path,
+        instruments,
+        args.jobs,
+        worktrees_path,
+        args.checkout_free,
+        cache_path,
+        args.incremental,
+        os.path.abspath(args.schema_path) if args.schema_path is not None else None,
+        args.liveness_timeout,
+        args.ca_max_consecutive_timeouts,
+        args.ca_budget or None,
+        args.prefetch,
+        args.test_threads,
+    )
 
     sys.exit(0 if success else 1)
 
@@ -1,20 +1,21 @@
-from __future__ import absolute_import, print_function
-
-import unittest
+import threading
 from abc import ABCMeta, abstractmethod
 
 from util.channel_access import ChannelAccessUtils
-from util.common import skip_on_instruments
+from util.common import skip_if_instrument_offline, skip_on_instruments
 
-from .settings import Settings
+from .context import InstrumentTestCase
 
 
-class AbstractSingleTests(unittest.TestCase, metaclass=ABCMeta):
+class AbstractSingleTests(InstrumentTestCase, metaclass=ABCMeta):
     """
     Abstract class for tests to be run exactly one regardless of how many components/configurations exist. It is meant
     to be extended by classes for configurations and for components.
     """
 
+    # Guards the class-level totals of the subclasses, which checks on any thread may add to.
+    TOTALS_LOCK = threading.Lock()
+
     @property
     @abstractmethod
     def utils(self):
@@ -24,7 +25,6 @@ class AbstractSingleTests(unittest.TestCase, metaclass=ABCMeta):
         be instantiated as either ComponentUtils or ConfigurationUtils (or any new subclass of
         AbstractConfigurationUtils) in the subclass.
         """
-        pass
 
     @property
     @abstractmethod
@@ -35,33 +35,38 @@ class AbstractSingleTests(unittest.TestCase, metaclass=ABCMeta):
         AbstractConfigurationUtils object used by the subclass, which should be 'components' for ComponentUtils
         or 'configurations ' for ConfigurationUtils.
         """
-        pass
 
     @skip_on_instruments(
-        ["DETMON"], "Blockserver PVs currently not available on DETMON, ticket 6454 to investigate"
+        ["DETMON"],
+        "Blockserver PVs currently not available on DETMON, ticket 6454 to investigate",
     )
+    @skip_if_instrument_offline
     def test_GIVEN_an_instrument_THEN_all_block_pvs_are_interesting(self):
-        interesting_pvs = ChannelAccessUtils(Settings.pv_prefix).get_interesting_pvs()
+        interesting_pvs = ChannelAccessUtils(
+            self.context.pv_prefix,
+            self.context.ca_breaker,
+            self.context.blockserver_cache,
+        ).get_interesting_pvs()
 
         if len(interesting_pvs) == 0:
             self.skipTest(
-                "Set of interesting PVs is empty, this is probably because the instrument {} is off. Since "
-                "we do not know interesting pvs, {} are not checked for non interesting block pvs test is "
-                "terminated early.".format(Settings.name, self.type)
+                f"Set of interesting PVs is empty, this is probably because the instrument {self.context.name} is off. Since "
+                f"we do not know interesting pvs, {self.type} are not checked for non interesting block pvs test is "
+                "terminated early."
             )
 
         non_interesting_block_pvs = [
             block_pv
-            for block_pv in self.utils.get_set_of_block_pvs_for_all_configs()
+            for block_pv in self.utils.get_set_of_block_pvs_for_all_configs(
+                self.context.pv_prefix
+            )
             if block_pv not in interesting_pvs
         ]
         num_non_interesting_block_pvs = len(non_interesting_block_pvs)
 
         if num_non_interesting_block_pvs != 0:
             print(
-                "\nWARNING! The instrument {} has {} non-interesting pvs that have a block on them in {}".format(
-                    Settings.pv_prefix, len(non_interesting_block_pvs), self.type
-                )
+                f"\nWARNING! The instrument {self.context.pv_prefix} has {len(non_interesting_block_pvs)} non-interesting pvs that have a block on them in {self.type}"
             )
             self.update_total_non_interesting_block_pvs(num_non_interesting_block_pvs)
             print(non_interesting_block_pvs)
@@ -73,4 +78,3 @@ class AbstractSingleTests(unittest.TestCase, metaclass=ABCMeta):
         components/configurations and print it to the screen.
         :param num_non_interesting_block_pvs: the number of non interesting block pvs for all instruments so far.
         """
-        pass
@@ -1,17 +1,10 @@
-from __future__ import absolute_import
-
-import os
-import unittest
-import xml.etree.ElementTree as ET
-
 from parameterized import parameterized
 
-from util.common import CommonUtils, skip_on_instruments
+from util.common import skip_on_instruments
 from util.configurations import ComponentUtils
-from util.globals import GlobalsUtils
 
 from .abstract_test_utils import AbstractSingleTests
-from .settings import Settings
+from .context import InstrumentTestCase
 
 
 class ComponentsSingleTests(AbstractSingleTests):
@@ -22,8 +15,8 @@ class ComponentsSingleTests(AbstractSingleTests):
     TOTAL_NON_INTERESTING_PVS_IN_BLOCKS = 0
 
     def __init__(self, *args, **kwargs):
-        super(ComponentsSingleTests, self).__init__(*args, **kwargs)
-        self._component_utils = ComponentUtils(Settings.config_repo_path)
+        super().__init__(*args, **kwargs)
+        self._component_utils = self.context.fixtures.component_utils
 
     @property
     def utils(self):
@@ -37,16 +30,17 @@ class ComponentsSingleTests(AbstractSingleTests):
         self.assertIn(
             ComponentUtils.BASE_COMPONENT,
             self.utils.get_configurations_as_list(),
-            "Base component was missing (should be called {})".format(
-                ComponentUtils.BASE_COMPONENT
-            ),
+            f"Base component was missing (should be called {ComponentUtils.BASE_COMPONENT})",
         )
 
     def update_total_non_interesting_block_pvs(self, num_non_interesting_block_pvs):
-        ComponentsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS += num_non_interesting_block_pvs
+        with AbstractSingleTests.TOTALS_LOCK:
+            ComponentsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS += (
+                num_non_interesting_block_pvs
+            )
 
 
-class ComponentsTests(unittest.TestCase):
+class ComponentsTests(InstrumentTestCase):
     """
     Tests in this class will run once per component.
 
@@ -55,42 +49,60 @@ class ComponentsTests(unittest.TestCase):
     The component name can be accessed as self.config
     """
 
-    def __init__(self, methodName, component=None):
+    def __init__(self, methodName, component=None, context=None):
         # Boilerplate so that unittest knows how to run these tests.
-        super(ComponentsTests, self).__init__(methodName)
+        super().__init__(methodName, context)
 
-        self.component_utils = ComponentUtils(Settings.config_repo_path)
-        self.global_utils = GlobalsUtils(Settings.config_repo_path)
         self.component = component
 
+    def get_item(self) -> str | None:
+        return self.component
+
     def setUp(self):
         # Class has to have an __init__ that accepts one argument for unittest's test loader to work properly.
         # However it should never be the default (None) when actually running the tests.
         self.assertIsNotNone(self.component, "Component should not be None")
 
-        self.component_dir_path = os.path.join(
-            self.component_utils.get_configurations_directory(), self.component
-        )
+        # Every test of the component shares what is read from its directory.
+        self.fixture = self.context.fixtures.get_component(self.component)
+        self.component_utils = self.fixture.utils
+        self.component_dir_path = self.fixture.directory
 
         self.assertTrue(
-            os.path.isdir(self.component_dir_path),
-            "Config directory should exist ({})".format(self.component_dir_path),
+            self.fixture.directory_exists(),
+            f"Config directory should exist ({self.component_dir_path})",
         )
 
     def _skip_if_valid_iocs_pv_is_not_available(self):
-        if Settings.valid_iocs is None or Settings.protected_iocs is None:
+        if self.context.valid_iocs is None or self.context.protected_iocs is None:
             self.skipTest("Couldn't retrieve valid/protected IOCS from server.")
 
+    def _get_iocs_problems(self, check_name, inputs, check):
+        """
+        Gets the problems a check finds in the component's iocs.xml, sharing the outcome with identical files.
+        :param check: Called with the model of the component, returns the problems found
+        """
+        return self.context.validation_cache.get_problems(
+            check_name,
+            self.fixture.get_file_blob_sha("iocs.xml"),
+            inputs,
+            lambda: check(self.fixture.get_model()),
+        )
+
     def test_GIVEN_a_component_THEN_it_only_contains_valid_iocs(self):
         self._skip_if_valid_iocs_pv_is_not_available()
 
-        for ioc in self.component_utils.get_iocs(self.component_utils.get_iocs_xml(self.component)):
-            self.assertIn(
-                ioc,
-                Settings.valid_iocs,
-                "Component {} contained an IOC that the server didn't know about ({})".format(
-                    self.component, ioc
-                ),
+        unknown_iocs = self._get_iocs_problems(
+            "unknown_iocs",
+            sorted(self.context.valid_iocs),
+            lambda model: [
+                ioc for ioc in model.ioc_names if ioc not in self.context.valid_iocs
+            ],
+        )
+
+        for ioc in unknown_iocs:
+            self.fail(
+                f"Component {self.component} contained an IOC that the server didn't know about ({ioc})"
             )
 
     def test_GIVEN_a_component_THEN_it_does_not_contain_protected_iocs_unless_it_is_the_base_component(
@@ -98,104 +110,154 @@ class ComponentsTests(unittest.TestCase):
     ):
         self._skip_if_valid_iocs_pv_is_not_available()
 
-        for ioc in self.component_utils.get_iocs(self.component_utils.get_iocs_xml(self.component)):
-            if self.component != ComponentUtils.BASE_COMPONENT:
-                self.assertNotIn(
-                    ioc,
-                    Settings.protected_iocs,
-                    "Component {} contained a protected IOC ({})".format(self.component, ioc),
-                )
+        if self.component == ComponentUtils.BASE_COMPONENT:
+            return
+
+        protected_iocs = self._get_iocs_problems(
+            "protected_iocs",
+            sorted(self.context.protected_iocs),
+            lambda model: [
+                ioc for ioc in model.ioc_names if ioc in self.context.protected_iocs
+            ],
+        )
+
+        for ioc in protected_iocs:
+            self.fail(f"Component {self.component} contained a protected IOC ({ioc})")
 
     def test_GIVEN_a_components_directory_THEN_it_only_contains_the_allowed_files(self):
-        for filename in os.listdir(self.component_dir_path):
+        for filename in self.fixture.get_files():
             self.assertIn(
                 filename,
                 ComponentUtils.ALLOWED_CONFIG_FILES,
-                "Component {} contained unexpected files in it's directory ({})".format(
-                    self.component, filename
-                ),
+                f"Component {self.component} contained unexpected files in it's directory ({filename})",
             )
 
     def test_GIVEN_a_components_directory_THEN_it_contains_the_required_files(self):
         for filename in ComponentUtils.REQUIRED_CONFIG_FILES:
             self.assertIn(
                 filename,
-                os.listdir(self.component_dir_path),
-                "Component {} did not contain the required config file {}".format(
-                    self.component, filename
-                ),
+                self.fixture.get_files(),
+                f"Component {self.component} did not contain the required config file {filename}",
             )
 
+    def test_GIVEN_a_component_THEN_its_blocks_and_iocs_define_everything_they_must(
+        self,
+    ):
+        for entry in self.fixture.get_model().malformed_entries:
+            self.fail(f"Component {self.component} is malformed: {entry}")
+
     def test_GIVEN_a_components_directory_WHEN_parsing_its_contents_as_xml_THEN_no_errors_generated(
         self,
     ):
-        for filename in CommonUtils.get_directory_contents_as_list(self.component_dir_path):
+        for filename in self.fixture.get_files():
             try:
-                ET.parse(os.path.join(self.component_dir_path, filename))
-            except Exception as e:
+                errors = self.context.validation_cache.get_problems(
+                    "xml_parse_errors",
+                    self.fixture.get_file_blob_sha(filename),
+                    self.context.xml_backend.NAME,
+                    lambda filename=filename: self.context.xml_backend.get_parse_errors(
+                        self.fixture.get_file_bytes(filename)
+                    ),
+                )
+            except OSError as e:
+                errors = [str(e)]
+            for e in errors:
                 self.fail(
-                    "Exception occurred while parsing file {} in component {} as XML. Error was: {}".format(
-                        filename, self.component, e
-                    )
+                    f"Exception occurred while parsing file {filename} in component {self.component} as XML. Error was: {e}"
                 )
 
+    def test_GIVEN_a_components_directory_WHEN_validating_its_contents_against_the_schemas_THEN_no_errors_generated(
+        self,
+    ):
+        validated = False
+        for filename in self.fixture.get_files():
+            schema_digest = self.context.xml_backend.get_schema_digest(filename)
+            if schema_digest is None:
+                # There is no schema for this file, or the backend can not validate against schemas at all.
+                continue
+            validated = True
+            errors = self.context.validation_cache.get_problems(
+                "xml_schema_errors",
+                self.fixture.get_file_blob_sha(filename),
+                [self.context.xml_backend.NAME, schema_digest],
+                lambda filename=filename: self.context.xml_backend.get_schema_errors(
+                    filename, self.fixture.get_file_bytes(filename)
+                ),
+            )
+            for e in errors:
+                self.fail(
+                    f"File {filename} in component {self.component} does not match its schema: {e}"
+                )
+
+        if not validated:
+            self.skipTest("No schemas available to validate component files against.")
+
     @skip_on_instruments(
-        ["DEMO"], "This does not matter on DEMO, and we often demo software in slightly odd configs"
+        ["DEMO"],
+        "This does not matter on DEMO, and we often demo software in slightly odd configs",
     )
     @skip_on_instruments(["SANS2D"], "Motors not fully configured on SANS2D yet")
     def test_GIVEN_a_configuration_WHEN_motors_are_used_THEN_both_or_neither_of_com_setting_and_motor_control_number_are_defined(
         self,
     ):
-        iocs_xml = self.component_utils.get_iocs_xml(self.component)
-        for motor_ioc in CommonUtils.MOTOR_IOCS:
-            defined_macros = self.component_utils.get_ioc_macros(iocs_xml, motor_ioc)
-
-            controller_number_defined = "MTRCTRL" in defined_macros
-            comms_macro_defined = any(m in defined_macros for m in ["PORT", "GALILADDR"])
+        motor_iocs = self._get_iocs_problems(
+            "motor_iocs_with_partial_settings",
+            None,
+            lambda model: self.component_utils.get_motor_iocs_with_partial_settings(
+                model
+            ),
+        )
 
-            self.assertTrue(
-                controller_number_defined == comms_macro_defined,  # Both or neither
-                "Only one of com setting and motor control was defined in {} in component {}".format(
-                    motor_ioc, self.component
-                ),
+        for motor_ioc in motor_iocs:
+            self.fail(
+                f"Only one of com setting and motor control was defined in {motor_ioc} in component {self.component}"
             )
 
     @skip_on_instruments(
-        ["DEMO"], "Demo is allowed to have IOCs in simulation mode, it is a fake instrument"
+        ["DEMO"],
+        "Demo is allowed to have IOCs in simulation mode, it is a fake instrument",
     )
-    def test_GIVEN_ioc_xml_WHEN_simlevel_is_not_none_THEN_get_ioc_in_sim_mode_returns_false(self):
-        iocs_xml = self.component_utils.get_iocs_xml(self.component)
-
-        for ioc in self.component_utils.get_iocs(iocs_xml):
-            if Settings.name == "EMU" and ioc == "KEPCO_04" and self.component == "EMU_base":
+    def test_GIVEN_ioc_xml_WHEN_simlevel_is_not_none_THEN_get_ioc_in_sim_mode_returns_false(
+        self,
+    ):
+        model = self.fixture.get_model()
+
+        for ioc in model.ioc_names:
+            if (
+                self.context.name == "EMU"
+                and ioc == "KEPCO_04"
+                and self.component == "EMU_base"
+            ):
                 # On EMU KEPCO_04 (VSM) is intentionally in RECSIM for testing.
                 print("Ignoring sim mode check for KEPCO_04 in EMU_base (on EMU)")
                 continue
 
             self.assertFalse(
-                self.component_utils.get_ioc_in_sim_mode(iocs_xml, ioc),
-                "Simulation Mode is Active on {} in component {}".format(ioc, self.component),
+                model.get_ioc(ioc).in_sim_mode,
+                f"Simulation Mode is Active on {ioc} in component {self.component}",
             )
 
     def _test_for_ioc_present_at_least_one_macro_set(
         self, ioc, macro_name, macro_regex, value_regex
     ):
-        iocs_xml = self.component_utils.get_iocs_xml(self.component)
-        iocs = self.component_utils.get_iocs(iocs_xml)
+        model = self.fixture.get_model()
+        iocs = model.ioc_names
 
         if ioc in iocs:
             component_macros = self.component_utils.check_if_macros_match_pattern(
-                self.component_utils.get_ioc_macros(iocs_xml, ioc),
+                model.get_ioc_macros(ioc),
                 macro_regex,
                 search_for_value=False,
             )
             globals_macros = self.component_utils.check_if_macros_match_pattern(
-                self.global_utils.get_macros(ioc), macro_regex, search_for_value=False
+                self.fixture.globals_index.get_macros(ioc),
+                macro_regex,
+                search_for_value=False,
             )
 
             self.assertTrue(
                 len(component_macros) != 0 or len(globals_macros) != 0,
-                "No {} macros found in {} in component {}".format(macro_name, ioc, self.component),
+                f"No {macro_name} macros found in {ioc} in component {self.component}",
             )
 
             component_macros = self.component_utils.check_if_macros_match_pattern(
@@ -207,33 +269,34 @@ class ComponentsTests(unittest.TestCase):
 
             self.assertTrue(
                 len(component_macros) != 0 or len(globals_macros) != 0,
-                "At least one {} macro in {} not set in component {}".format(
-                    macro_name, ioc, self.component
-                ),
+                f"At least one {macro_name} macro in {ioc} not set in component {self.component}",
             )
 
     @parameterized.expand(
-        [("MCLEN_{:02d}".format(i), "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
+        [(f"MCLEN_{i:02d}", "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
         + [
-            ("EUROTHRM_{:02d}".format(i), "ADDRESS", "^ADDR_([1-9]|10)$", "^[0-9]+$")
+            (f"EUROTHRM_{i:02d}", "ADDRESS", "^ADDR_([1-9]|10)$", "^[0-9]+$")
             for i in range(1, 7)
         ]
-        + [("LINMOT_{:02d}".format(i), "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
+        + [(f"LINMOT_{i:02d}", "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
         + [("KHLY2001_01", "CHANNEL ACTIVATED", "^ACTIVATE_CHAN_0[1-9]$", "^1$")]
         + [("NWPRTXPS_01", "AXIS", "^AXIS[1-4]_ID$", "^.*[.].*$")]
     )
     @skip_on_instruments(
-        ComponentUtils.DUMMY_INSTRUMENTS, "Allowed invalid iocs, these are dummy instruments"
+        ComponentUtils.DUMMY_INSTRUMENTS,
+        "Allowed invalid iocs, these are dummy instruments",
     )
     def test_GIVEN_a_component_THEN_for_each_ioc_present_at_least_one_macro_set(
         self, ioc, macro_name, macro_regex, value_regex
     ):
-        self._test_for_ioc_present_at_least_one_macro_set(ioc, macro_name, macro_regex, value_regex)
+        self._test_for_ioc_present_at_least_one_macro_set(
+            ioc, macro_name, macro_regex, value_regex
+        )
 
     @parameterized.expand(
         [
             (
-                "MERCURY_{:02d}".format(i),
+                f"MERCURY_{i:02d}",
                 "TEMPERATURE/LEVEL/PRESSURE",
                 "^(TEMP_[1-4]|LEVEL_[1-2]|PRESSURE_[1-2])$",
                 "^.*[.].*$",
@@ -242,7 +305,8 @@ class ComponentsTests(unittest.TestCase):
         ]
     )
     @skip_on_instruments(
-        ComponentUtils.DUMMY_INSTRUMENTS, "Allowed invalid iocs, these are dummy instruments"
+        ComponentUtils.DUMMY_INSTRUMENTS,
+        "Allowed invalid iocs, these are dummy instruments",
     )
     @skip_on_instruments(
         ["LARMOR", "ZOOM", "IRIS", "SANDALS", "GEM", "MAPS", "OSIRIS", "LET"],
@@ -251,4 +315,6 @@ class ComponentsTests(unittest.TestCase):
     def test_GIVEN_a_component_THEN_for_each_mercury_present_at_least_one_macro_set(
         self, ioc, macro_name, macro_regex, value_regex
     ):
-        self._test_for_ioc_present_at_least_one_macro_set(ioc, macro_name, macro_regex, value_regex)
+        self._test_for_ioc_present_at_least_one_macro_set(
+            ioc, macro_name, macro_regex, value_regex
+        )
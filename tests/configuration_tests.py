@@ -1,17 +1,11 @@
-from __future__ import absolute_import
-
-import os
-import unittest
-import xml.etree.ElementTree as ET
-
 from parameterized import parameterized
 
-from util.common import CommonUtils, skip_on_instruments
-from util.configurations import ComponentUtils, ConfigurationUtils
-from util.globals import GlobalsUtils
+from util.common import skip_on_instruments
+from util.configurations import ConfigurationUtils
+from util.duplicates import DuplicateDetector
 
 from .abstract_test_utils import AbstractSingleTests
-from .settings import Settings
+from .context import InstrumentTestCase
 
 
 class ConfigurationsSingleTests(AbstractSingleTests):
@@ -22,8 +16,8 @@ class ConfigurationsSingleTests(AbstractSingleTests):
     TOTAL_NON_INTERESTING_PVS_IN_BLOCKS = 0
 
     def __init__(self, *args, **kwargs):
-        super(ConfigurationsSingleTests, self).__init__(*args, **kwargs)
-        self._configuration_utils = ConfigurationUtils(Settings.config_repo_path)
+        super().__init__(*args, **kwargs)
+        self._configuration_utils = self.context.fixtures.config_utils
 
     @property
     def utils(self):
@@ -42,12 +36,13 @@ class ConfigurationsSingleTests(AbstractSingleTests):
             print("\nWARNING: Configurations directory was empty or did not exist")
 
     def update_total_non_interesting_block_pvs(self, num_non_interesting_block_pvs):
-        ConfigurationsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS += (
-            num_non_interesting_block_pvs
-        )
+        with AbstractSingleTests.TOTALS_LOCK:
+            ConfigurationsSingleTests.TOTAL_NON_INTERESTING_PVS_IN_BLOCKS += (
+                num_non_interesting_block_pvs
+            )
 
 
-class ConfigurationsTests(unittest.TestCase):
+class ConfigurationsTests(InstrumentTestCase):
     """
     Tests in this class will run once per config. If there are no configs, these tests will not run.
 
@@ -56,200 +51,268 @@ class ConfigurationsTests(unittest.TestCase):
     The configuration name can be accessed as self.config
     """
 
-    def __init__(self, method_name, config=None):
+    def __init__(self, method_name, config=None, context=None):
         # Boilerplate so that unittest knows how to run these tests.
-        super(ConfigurationsTests, self).__init__(method_name)
+        super().__init__(method_name, context)
 
-        self.config_utils = ConfigurationUtils(Settings.config_repo_path)
-        self.comp_utils = ComponentUtils(Settings.config_repo_path)
-        self.global_utils = GlobalsUtils(Settings.config_repo_path)
         self.config = config
 
+    def get_item(self) -> str | None:
+        return self.config
+
     def setUp(self):
         # Class has to have an __init__ that accepts one argument for unittest's test loader to work properly.
         # However it should never be the default (None) when actually running the tests.
         self.assertIsNotNone(self.config, "Config should not be None")
 
-        self.config_dir_path = os.path.join(
-            self.config_utils.get_configurations_directory(), self.config
-        )
+        # Every test of the configuration shares what is read from its directory.
+        self.fixture = self.context.fixtures.get_configuration(self.config)
+        self.config_utils = self.fixture.utils
+        self.config_dir_path = self.fixture.directory
 
         self.assertTrue(
-            os.path.isdir(self.config_dir_path),
-            "Config directory should exist ({})".format(self.config_dir_path),
+            self.fixture.directory_exists(),
+            f"Config directory should exist ({self.config_dir_path})",
         )
 
     def _skip_if_valid_iocs_pv_is_not_available(self):
-        if Settings.valid_iocs is None or Settings.protected_iocs is None:
+        if self.context.valid_iocs is None or self.context.protected_iocs is None:
             self.skipTest("Couldn't retrieve valid/protected IOCS from server.")
 
+    def _get_iocs_problems(self, check_name, inputs, check):
+        """
+        Gets the problems a check finds in the configuration's iocs.xml, sharing the outcome with identical files.
+        :param check: Called with the model of the configuration, returns the problems found
+        """
+        return self.context.validation_cache.get_problems(
+            check_name,
+            self.fixture.get_file_blob_sha("iocs.xml"),
+            inputs,
+            lambda: check(self.fixture.get_model()),
+        )
+
     def test_GIVEN_a_configuration_THEN_it_only_contains_valid_iocs(self):
         self._skip_if_valid_iocs_pv_is_not_available()
 
-        for ioc in self.config_utils.get_iocs(self.config_utils.get_iocs_xml(self.config)):
-            self.assertIn(
-                ioc,
-                Settings.valid_iocs,
-                "Configuration {} contained an IOC that the server didn't know about ({})".format(
-                    self.config, ioc
-                ),
+        unknown_iocs = self._get_iocs_problems(
+            "unknown_iocs",
+            sorted(self.context.valid_iocs),
+            lambda model: [
+                ioc for ioc in model.ioc_names if ioc not in self.context.valid_iocs
+            ],
+        )
+
+        for ioc in unknown_iocs:
+            self.fail(
+                f"Configuration {self.config} contained an IOC that the server didn't know about ({ioc})"
             )
 
     def test_GIVEN_a_configuration_THEN_it_does_not_contain_any_invalid_iocs(self):
         self._skip_if_valid_iocs_pv_is_not_available()
 
-        for ioc in self.config_utils.get_iocs(self.config_utils.get_iocs_xml(self.config)):
-            self.assertNotIn(
-                ioc,
-                Settings.protected_iocs,
-                "Configuration {} contained a protected IOC ({})".format(self.config, ioc),
-            )
+        protected_iocs = self._get_iocs_problems(
+            "protected_iocs",
+            sorted(self.context.protected_iocs),
+            lambda model: [
+                ioc for ioc in model.ioc_names if ioc in self.context.protected_iocs
+            ],
+        )
+
+        for ioc in protected_iocs:
+            self.fail(f"Configuration {self.config} contained a protected IOC ({ioc})")
+
+    def _get_duplicates(self, get_counts):
+        """
+        Gets the names defined more than once across the configuration and its active components.
+        :param get_counts: Called with the model of the configuration and each component, returns its name counts
+        :return: The duplicated names, mapped to where each of their definitions came from
+        """
+        detector = DuplicateDetector()
+        models = self.fixture.get_models_with_components()
+        detector.add(get_counts(models[0]), f"configuration {self.config}")
+        for model in models[1:]:
+            detector.add(get_counts(model), f"component {model.name}")
+        return detector.get_duplicates()
 
     def test_GIVEN_a_configuration_and_active_components_THEN_does_not_contain_multiple_instances_of_same_ioc(
         self,
     ):
-        components = self.config_utils.get_active_components_as_list(self.config)
-
-        iocs = self.config_utils.get_iocs(self.config_utils.get_iocs_xml(self.config))
-
-        for comp in components:
-            iocs.extend(self.comp_utils.get_iocs(self.comp_utils.get_iocs_xml(comp)))
+        duplicates = self._get_duplicates(lambda model: model.ioc_counts)
 
-        for ioc in iocs:
-            self.assertEqual(
-                len([i for i in iocs if i == ioc]),
-                1,
-                "Configuration {} contained multiple instances of ioc ({})".format(
-                    self.config, ioc
-                ),
+        for ioc, origins in sorted(duplicates.items()):
+            self.fail(
+                "Configuration {} contained multiple instances of ioc ({}) from {}".format(
+                    self.config, ioc, ", ".join(origins)
+                )
             )
 
-    def test_GIVEN_a_configuration_THEN_the_directory_does_not_contain_unexpected_files(self):
-        for filename in os.listdir(self.config_dir_path):
+    def test_GIVEN_a_configuration_THEN_the_directory_does_not_contain_unexpected_files(
+        self,
+    ):
+        for filename in self.fixture.get_files():
             self.assertIn(
                 filename,
                 ConfigurationUtils.ALLOWED_CONFIG_FILES,
-                "Component {} contained unexpected files in it's directory ({})".format(
-                    self.config, filename
-                ),
+                f"Component {self.config} contained unexpected files in it's directory ({filename})",
             )
 
-    def test_GIVEN_a_configuration_THEN_the_directory_contains_the_required_config_files(self):
+    def test_GIVEN_a_configuration_THEN_the_directory_contains_the_required_config_files(
+        self,
+    ):
         for filename in ConfigurationUtils.REQUIRED_CONFIG_FILES:
             self.assertIn(
                 filename,
-                os.listdir(self.config_dir_path),
-                "Configuration {} did not contain the required config file {}".format(
-                    self.config, filename
-                ),
+                self.fixture.get_files(),
+                f"Configuration {self.config} did not contain the required config file {filename}",
             )
 
+    def test_GIVEN_a_configuration_THEN_its_blocks_and_iocs_define_everything_they_must(
+        self,
+    ):
+        for entry in self.fixture.get_model().malformed_entries:
+            self.fail(f"Configuration {self.config} is malformed: {entry}")
+
     def test_GIVEN_a_configurations_directory_WHEN_parsing_its_contents_as_xml_THEN_no_errors_generated(
         self,
     ):
-        for filename in CommonUtils.get_directory_contents_as_list(self.config_dir_path):
+        for filename in self.fixture.get_files():
             # pvlist is not xml
             if filename != ConfigurationUtils.BLOCK_GW_PVLIST:
                 try:
-                    ET.parse(os.path.join(self.config_dir_path, filename))
-                except Exception as e:
+                    errors = self.context.validation_cache.get_problems(
+                        "xml_parse_errors",
+                        self.fixture.get_file_blob_sha(filename),
+                        self.context.xml_backend.NAME,
+                        lambda filename=filename: (
+                            self.context.xml_backend.get_parse_errors(
+                                self.fixture.get_file_bytes(filename)
+                            )
+                        ),
+                    )
+                except OSError as e:
+                    errors = [str(e)]
+                for e in errors:
                     self.fail(
-                        "Exception occurred while parsing file {} in configuration {} as XML. Error was: {}".format(
-                            filename, self.config, e
-                        )
+                        f"Exception occurred while parsing file {filename} in configuration {self.config} as XML. Error was: {e}"
                     )
 
+    def test_GIVEN_a_configurations_directory_WHEN_validating_its_contents_against_the_schemas_THEN_no_errors_generated(
+        self,
+    ):
+        validated = False
+        for filename in self.fixture.get_files():
+            schema_digest = self.context.xml_backend.get_schema_digest(filename)
+            if schema_digest is None:
+                # There is no schema for this file, or the backend can not validate against schemas at all.
+                continue
+            validated = True
+            errors = self.context.validation_cache.get_problems(
+                "xml_schema_errors",
+                self.fixture.get_file_blob_sha(filename),
+                [self.context.xml_backend.NAME, schema_digest],
+                lambda filename=filename: self.context.xml_backend.get_schema_errors(
+                    filename, self.fixture.get_file_bytes(filename)
+                ),
+            )
+            for e in errors:
+                self.fail(
+                    f"File {filename} in configuration {self.config} does not match its schema: {e}"
+                )
+
+        if not validated:
+            self.skipTest(
+                "No schemas available to validate configuration files against."
+            )
+
     @skip_on_instruments(
-        ["DEMO"], "This does not matter on DEMO, and we often demo software in slightly odd configs"
+        ["DEMO"],
+        "This does not matter on DEMO, and we often demo software in slightly odd configs",
     )
     def test_GIVEN_a_configuration_WHEN_motors_are_used_THEN_both_or_neither_of_com_setting_and_motor_control_number_are_defined(
         self,
     ):
-        iocs_xml = self.config_utils.get_iocs_xml(self.config)
-        for motor_ioc in CommonUtils.MOTOR_IOCS:
-            defined_macros = self.config_utils.get_ioc_macros(iocs_xml, motor_ioc)
-
-            controller_number_defined = "MTRCTRL" in defined_macros
-            comms_macro_defined = any(m in defined_macros for m in ["PORT", "GALILADDR"])
+        motor_iocs = self._get_iocs_problems(
+            "motor_iocs_with_partial_settings",
+            None,
+            lambda model: self.config_utils.get_motor_iocs_with_partial_settings(model),
+        )
 
-            self.assertTrue(
-                controller_number_defined == comms_macro_defined,  # Both or neither
-                "Only one of com setting and motor control was defined in {} in component {}".format(
-                    motor_ioc, self.config
-                ),
+        for motor_ioc in motor_iocs:
+            self.fail(
+                f"Only one of com setting and motor control was defined in {motor_ioc} in component {self.config}"
             )
 
     @skip_on_instruments(
-        ["DEMO"], "Demo is allowed to have IOCs in simulation mode, it is a fake instrument"
+        ["DEMO"],
+        "Demo is allowed to have IOCs in simulation mode, it is a fake instrument",
     )
-    def test_GIVEN_ioc_xml_WHEN_simlevel_is_not_none_THEN_get_ioc_in_sim_mode_returns_false(self):
-        iocs_xml = self.config_utils.get_iocs_xml(self.config)
+    def test_GIVEN_ioc_xml_WHEN_simlevel_is_not_none_THEN_get_ioc_in_sim_mode_returns_false(
+        self,
+    ):
+        model = self.fixture.get_model()
 
-        for ioc in self.config_utils.get_iocs(iocs_xml):
+        for ioc in model.ioc_names:
             self.assertFalse(
-                self.config_utils.get_ioc_in_sim_mode(iocs_xml, ioc),
-                "Simulation Mode is Active on {} in configuration {}".format(ioc, self.config),
+                model.get_ioc(ioc).in_sim_mode,
+                f"Simulation Mode is Active on {ioc} in configuration {self.config}",
             )
 
     def test_GIVEN_a_configuration_and_active_components_THEN_it_does_not_contain_blocks_that_are_the_same_ignoring_case(
         self,
     ):
-        components = self.config_utils.get_active_components_as_list(self.config)
-
-        blocks = self.config_utils.get_blocks(self.config)
-
-        for comp in components:
-            blocks.extend(self.comp_utils.get_blocks(comp))
-
-        duplicates = set([x for x in blocks if blocks.count(x) > 1])
+        duplicates = self._get_duplicates(lambda model: model.block_counts)
 
         self.assertTrue(
-            len(duplicates) == 0, "Duplicate blocks found in {}: {}".format(self.config, duplicates)
+            len(duplicates) == 0,
+            f"Duplicate blocks found in {self.config}: {DuplicateDetector.format_duplicates(duplicates)}",
         )
 
-        upper_blocks = [b.upper() for b in blocks]
-        duplicates = set([x for x in upper_blocks if upper_blocks.count(x) > 1])
+        duplicates = self._get_duplicates(lambda model: model.upper_block_counts)
 
         self.assertTrue(
             len(duplicates) == 0,
-            "Case insensitive duplicate blocks found in {}: {}".format(self.config, duplicates),
+            f"Case insensitive duplicate blocks found in {self.config}: {DuplicateDetector.format_duplicates(duplicates)}",
         )
 
-    def test_GIVEN_a_configuration_THEN_it_does_not_contain_a_block_with_invalid_name_length(self):
-        components = self.config_utils.get_active_components_as_list(self.config)
-
-        blocks = self.config_utils.get_blocks(self.config)
-
-        for comp in components:
-            blocks.extend(self.comp_utils.get_blocks(comp))
+    def test_GIVEN_a_configuration_THEN_it_does_not_contain_a_block_with_invalid_name_length(
+        self,
+    ):
+        blocks = ConfigurationUtils.merge_counts(
+            self.fixture.get_models_with_components(),
+            lambda model: model.block_counts,
+        )
 
         invalid_names = set(
-            [str(block) + " | len " + str(len(block)) for block in blocks if len(block) > 25]
+            [
+                str(block) + " | len " + str(len(block))
+                for block in blocks
+                if len(block) > 25
+            ]
         )
         self.assertTrue(
             len(invalid_names) == 0,
-            "Invalid block name length (> 25): {} , in configuration {}".format(
-                invalid_names, self.config
-            ),
+            f"Invalid block name length (> 25): {invalid_names} , in configuration {self.config}",
         )
 
     def _test_for_ioc_present_at_least_one_macro_set(
         self, ioc, macro_name, macro_regex, value_regex
     ):
-        iocs_xml = self.config_utils.get_iocs_xml(self.config)
-        iocs = self.config_utils.get_iocs(iocs_xml)
+        model = self.fixture.get_model()
+        iocs = model.ioc_names
 
         if ioc in iocs:
             config_macros = self.config_utils.check_if_macros_match_pattern(
-                self.config_utils.get_ioc_macros(iocs_xml, ioc), macro_regex, search_for_value=False
+                model.get_ioc_macros(ioc), macro_regex, search_for_value=False
             )
             globals_macros = self.config_utils.check_if_macros_match_pattern(
-                self.global_utils.get_macros(ioc), macro_regex, search_for_value=False
+                self.fixture.globals_index.get_macros(ioc),
+                macro_regex,
+                search_for_value=False,
             )
 
             self.assertTrue(
                 len(config_macros) != 0 or len(globals_macros) != 0,
-                "No {} macros found in {} in configuration {}".format(macro_name, ioc, self.config),
+                f"No {macro_name} macros found in {ioc} in configuration {self.config}",
             )
 
             config_macros = self.config_utils.check_if_macros_match_pattern(
@@ -261,33 +324,34 @@ class ConfigurationsTests(unittest.TestCase):
 
             self.assertTrue(
                 len(config_macros) != 0 or len(globals_macros) != 0,
-                "At least one {} macro in {} not set in configuration {}".format(
-                    macro_name, ioc, self.config
-                ),
+                f"At least one {macro_name} macro in {ioc} not set in configuration {self.config}",
             )
 
     @parameterized.expand(
-        [("MCLEN_{:02d}".format(i), "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
+        [(f"MCLEN_{i:02d}", "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
         + [
-            ("EUROTHRM_{:02d}".format(i), "ADDRESS", "^ADDR_([1-9]|10)$", "^[0-9]+$")
+            (f"EUROTHRM_{i:02d}", "ADDRESS", "^ADDR_([1-9]|10)$", "^[0-9]+$")
             for i in range(1, 7)
         ]
-        + [("LINMOT_{:02d}".format(i), "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
+        + [(f"LINMOT_{i:02d}", "AXIS", "^AXIS[1-8]$", "^yes$") for i in range(1, 4)]
         + [("KHLY2001_01", "CHANNEL ACTIVATED", "^ACTIVATE_CHAN_0[1-9]$", "^1$")]
         + [("NWPRTXPS_01", "AXIS", "^AXIS[1-4]_ID$", "^.*[.].*$")]
     )
     @skip_on_instruments(
-        ConfigurationUtils.DUMMY_INSTRUMENTS, "Allowed invalid iocs, these are dummy instruments"
+        ConfigurationUtils.DUMMY_INSTRUMENTS,
+        "Allowed invalid iocs, these are dummy instruments",
     )
     def test_GIVEN_a_config_THEN_for_each_ioc_present_at_least_one_macro_set(
         self, ioc, macro_name, macro_regex, value_regex
     ):
-        self._test_for_ioc_present_at_least_one_macro_set(ioc, macro_name, macro_regex, value_regex)
+        self._test_for_ioc_present_at_least_one_macro_set(
+            ioc, macro_name, macro_regex, value_regex
+        )
 
     @parameterized.expand(
         [
             (
-                "MERCURY_{:02d}".format(i),
+                f"MERCURY_{i:02d}",
                 "TEMPERATURE/LEVEL/PRESSURE",
                 "^(TEMP_[1-4]|LEVEL_[1-2]|PRESSURE_[1-2])$",
                 "^.*[.].*$",
@@ -296,7 +360,8 @@ class ConfigurationsTests(unittest.TestCase):
         ]
     )
     @skip_on_instruments(
-        ConfigurationUtils.DUMMY_INSTRUMENTS, "Allowed invalid iocs, these are dummy instruments"
+        ConfigurationUtils.DUMMY_INSTRUMENTS,
+        "Allowed invalid iocs, these are dummy instruments",
     )
     @skip_on_instruments(
         ["LARMOR", "ZOOM", "IRIS", "SANDALS", "GEM", "MAPS", "OSIRIS", "LET"],
@@ -305,4 +370,6 @@ class ConfigurationsTests(unittest.TestCase):
     def test_GIVEN_a_config_THEN_for_each_mercury_present_at_least_one_macro_set(
         self, ioc, macro_name, macro_regex, value_regex
     ):
-        self._test_for_ioc_present_at_least_one_macro_set(ioc, macro_name, macro_regex, value_regex)
+        self._test_for_ioc_present_at_least_one_macro_set(
+            ioc, macro_name, macro_regex, value_regex
+        )
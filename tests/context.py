@@ -0,0 +1,198 @@
+import unittest
+
+from util.blockserver_cache import BlockserverCache
+from util.ca_breaker import ChannelAccessBreaker
+from util.channel_access import ChannelAccessUtils
+from util.config_source import FileSystemConfigSource
+from util.configuration_fixture import InstrumentFixtures
+
+from .settings import Settings
+
+
+class InstrumentContext:
+    """
+    Everything the checks of one instrument need to know about it: its name and PV prefix, where its configurations
+    are read from, the IOCs and synoptic targets known to it, and the caches, fixtures and channel access circuit
+    breaker its checks share.
+
+    A context cannot be changed once created, and is passed explicitly to each test case, so the checks of several
+    instruments can run at the same time in one process without seeing each other's state.
+    """
+
+    __slots__ = (
+        "__weakref__",
+        "blockserver_cache",
+        "ca_breaker",
+        "config_repo_path",
+        "config_source",
+        "fixtures",
+        "gui_repo_path",
+        "hostname",
+        "name",
+        "online",
+        "protected_iocs",
+        "pv_prefix",
+        "valid_iocs",
+        "valid_synoptic_targets",
+        "valid_synoptic_types",
+        "validation_cache",
+        "xml_backend",
+    )
+
+    def __init__(
+        self,
+        name,
+        hostname,
+        pv_prefix,
+        config_repo_path,
+        gui_repo_path,
+        config_source=None,
+        online=True,
+        valid_iocs=None,
+        protected_iocs=None,
+        valid_synoptic_targets=None,
+        valid_synoptic_types=None,
+        ca_breaker=None,
+        blockserver_cache=None,
+        validation_cache=None,
+        xml_backend=None,
+        fixtures=None,
+    ):
+        """
+        :param config_source: Where the configurations are read from, the working tree at config_repo_path if not
+            given
+        :param online: Whether the instrument answered the liveness probe
+        :param valid_iocs: The IOCs the instrument knows about, or None if they could not be read
+        :param protected_iocs: The IOCs that must not be stopped, or None if they could not be read
+        :param valid_synoptic_targets: The synoptic targets known to the instrument's GUI release, or None if the
+            release could not be determined
+        :param valid_synoptic_types: The synoptic types known to the instrument's GUI release, or None
+        :param ca_breaker: The channel access circuit breaker of the instrument, a new one if not given
+        :param blockserver_cache: The cache of the instrument's blockserver payloads, a new empty one if not given
+        :param validation_cache: The cache that checks of single files share their outcomes through, the run's one
+            if not given
+        :param xml_backend: The backend configuration files are parsed and validated with, the run's one if not
+            given
+        :param fixtures: What the checks read from each configuration and component, new empty fixtures reading
+            from the config source if not given
+        """
+        if config_source is None:
+            config_source = FileSystemConfigSource(config_repo_path)
+        values = {
+            "name": name,
+            "hostname": hostname,
+            "pv_prefix": pv_prefix,
+            "config_repo_path": config_repo_path,
+            "gui_repo_path": gui_repo_path,
+            "config_source": config_source,
+            "online": online,
+            "valid_iocs": valid_iocs,
+            "protected_iocs": protected_iocs,
+            "valid_synoptic_targets": valid_synoptic_targets,
+            "valid_synoptic_types": valid_synoptic_types,
+            "ca_breaker": ca_breaker
+            if ca_breaker is not None
+            else ChannelAccessBreaker(name),
+            "blockserver_cache": blockserver_cache
+            if blockserver_cache is not None
+            else BlockserverCache(),
+            "validation_cache": validation_cache
+            if validation_cache is not None
+            else Settings.validation_cache,
+            "xml_backend": xml_backend
+            if xml_backend is not None
+            else Settings.xml_backend,
+            "fixtures": fixtures
+            if fixtures is not None
+            else InstrumentFixtures(config_repo_path, config_source),
+        }
+        for attribute, value in values.items():
+            object.__setattr__(self, attribute, value)
+
+    def __setattr__(self, attribute, value):
+        raise AttributeError("An instrument context cannot be changed once created")
+
+    def __delattr__(self, attribute):
+        raise AttributeError("An instrument context cannot be changed once created")
+
+    def __repr__(self):
+        return f"InstrumentContext({self.name!r}, {self.pv_prefix!r})"
+
+    @staticmethod
+    def for_instrument(
+        name,
+        hostname,
+        pv_prefix,
+        config_repo_path,
+        gui_repo_path,
+        config_source=None,
+        online=True,
+        valid_synoptic_targets_and_types=(None, None),
+        ca_breaker=None,
+        blockserver_cache=None,
+    ):
+        """
+        Creates the context of an instrument, reading the IOCs it knows about from its blockserver. The IOCs of an
+        instrument that is not online are not read, so the checks that need them are skipped without waiting for
+        the PVs to time out.
+
+        The circuit breaker starts tripped if the instrument is not online. The run-wide settings give its limits
+        and the caches and XML backend shared by every instrument.
+
+        :param ca_breaker: The circuit breaker to use for the instrument, if one was already created to read its PVs
+            in advance. Otherwise a new one is created.
+        :param blockserver_cache: The cache of the instrument's blockserver payloads, if they were already read in
+            advance. Otherwise a new empty one is created.
+        :return: The context
+        """
+        if ca_breaker is None:
+            ca_breaker = ChannelAccessBreaker(
+                name, Settings.max_consecutive_ca_timeouts, Settings.ca_budget
+            )
+        if blockserver_cache is None:
+            blockserver_cache = BlockserverCache()
+
+        if online:
+            valid_iocs, protected_iocs = ChannelAccessUtils(
+                pv_prefix, ca_breaker, blockserver_cache
+            ).get_valid_and_protected_iocs()
+        else:
+            ca_breaker.trip("it did not answer the liveness probe")
+            valid_iocs, protected_iocs = None, None
+
+        valid_synoptic_targets, valid_synoptic_types = valid_synoptic_targets_and_types
+        return InstrumentContext(
+            name,
+            hostname,
+            pv_prefix,
+            config_repo_path,
+            gui_repo_path,
+            config_source,
+            online,
+            valid_iocs,
+            protected_iocs,
+            valid_synoptic_targets,
+            valid_synoptic_types,
+            ca_breaker,
+            blockserver_cache,
+        )
+
+
+class InstrumentTestCase(unittest.TestCase):
+    """
+    A test case that checks one instrument, given by the context it is created with.
+    """
+
+    def __init__(self, method_name="runTest", context=None):
+        """
+        :param method_name: The name of the test method to run
+        :param context: The context of the instrument to check
+        """
+        super().__init__(method_name)
+        self.context = context
+
+    def get_item(self) -> str | None:
+        """
+        :return: The configuration, component or synoptic this test checks, or None if it checks the whole instrument
+        """
+        return None
@@ -1,26 +1,30 @@
-import unittest
+import asyncio
 
-from tests.settings import Settings
-from util.channel_access import ChannelAccessUtils
+from tests.context import InstrumentTestCase
+from util.channel_access import AsyncChannelAccess
+from util.common import skip_if_instrument_offline
 
 
-class DaeTests(unittest.TestCase):
+class DaeTests(InstrumentTestCase):
     def setUp(self) -> None:
-        self.ca = ChannelAccessUtils(Settings.pv_prefix)
+        self.ca = AsyncChannelAccess(
+            self.context.pv_prefix, breaker=self.context.ca_breaker
+        )
 
+    @skip_if_instrument_offline
     def test_dae_run_number_digits_sufficient(self) -> None:
-        """
+        r"""
         Check if the current run number is close to exceeding the available number of digits.
 
         We define the number of digits in the run number in C:\Instrument\Settings\labview modules\dae\icp_config.xml
         It is easier to simply access the current run number and check the nuber of digits in against the current number
         than to check this xml.
         """
-        if Settings.name == "GEM":
+        if self.context.name == "GEM":
             failure_threshold_percent = 99.5
         else:
             failure_threshold_percent = 90
-        current_run_number = self.ca.get_value("DAE:RUNNUMBER")
+        current_run_number = asyncio.run(self.ca.get_value("DAE:RUNNUMBER"))
         # current_run_number will be none if instrument off
         if current_run_number is None:
             self.skipTest("No run number, likely instrument is off")
@@ -1,20 +1,18 @@
-from __future__ import absolute_import
-
-import unittest
-
 from util.common import CommonUtils, skip_on_instruments
 from util.globals import GlobalsUtils
 
-from .settings import Settings
+from .context import InstrumentTestCase
 
 
-class GlobalsTests(unittest.TestCase):
+class GlobalsTests(InstrumentTestCase):
     """
     Tests in this class relate to the contents or existence of the globals.txt configuration file.
     """
 
     def setUp(self):
-        self.globals_utils = GlobalsUtils(Settings.config_repo_path)
+        self.globals_utils = GlobalsUtils(
+            self.context.config_repo_path, self.context.config_source
+        )
 
     def test_GIVEN_a_globals_file_exists_THEN_it_passes_a_syntax_check(self):
         if not self.globals_utils.file_exists():
@@ -24,16 +22,16 @@ class GlobalsTests(unittest.TestCase):
             self.assertIsInstance(line, str)
             self.assertTrue(
                 self.globals_utils.check_syntax(line),
-                "Invalid syntax on line {linenumber}. Line contents was: {contents}".format(
-                    linenumber=linenumber, contents=line
-                ),
+                f"Invalid syntax on line {linenumber}. Line contents was: {line}",
             )
 
-    def test_WHEN_checking_the_configs_directory_THEN_there_are_no_extra_files_called_globals(self):
+    def test_WHEN_checking_the_configs_directory_THEN_there_are_no_extra_files_called_globals(
+        self,
+    ):
         self.assertEqual(
             self.globals_utils.get_number_of_globals_files(),
             1 if self.globals_utils.file_exists() else 0,
-            "Extra globals files ({}) files in repository.".format(self.globals_utils.GLOBALS_FILE),
+            f"Extra globals files ({self.globals_utils.GLOBALS_FILE}) files in repository.",
         )
 
     @skip_on_instruments(
@@ -47,13 +45,22 @@ class GlobalsTests(unittest.TestCase):
             defined_macros = self.globals_utils.get_macros(motor_ioc)
 
             controller_number_defined = "MTRCTRL" in defined_macros
-            comms_macro_defined = any(m in defined_macros for m in ["PORT", "GALILADDR"])
+            comms_macro_defined = any(
+                m in defined_macros for m in ["PORT", "GALILADDR"]
+            )
 
-            self.assertTrue(controller_number_defined == comms_macro_defined)  # Both or neither
+            self.assertTrue(
+                controller_number_defined == comms_macro_defined
+            )  # Both or neither
 
     @skip_on_instruments(
-        ["DEMO"], "Demo is allowed to have IOCs in simulation mode, it is a fake instrument"
+        ["DEMO"],
+        "Demo is allowed to have IOCs in simulation mode, it is a fake instrument",
     )
     @skip_on_instruments(["SANS2D"], "Motors not fully configured on SANS2D yet")
-    def test_GIVEN_macros_in_globals_file_WHEN_checking_sim_mode_THEN_it_is_not_enabled(self):
-        self.assertFalse(self.globals_utils.is_any_ioc_in_sim_mode(), "Simulation Mode is Enabled")
+    def test_GIVEN_macros_in_globals_file_WHEN_checking_sim_mode_THEN_it_is_not_enabled(
+        self,
+    ):
+        self.assertFalse(
+            self.globals_utils.is_any_ioc_in_sim_mode(), "Simulation Mode is Enabled"
+        )
@@ -1,16 +1,58 @@
+import asyncio
 import concurrent.futures
-import unittest
+import threading
+import weakref
 
-from tests.settings import Settings
-from util.channel_access import ChannelAccessUtils
+from tests.context import InstrumentTestCase
+from util.channel_access import AsyncChannelAccess
+from util.common import skip_if_instrument_offline
+from util.motor_inventory import MotorAxis, MotorInventory
 
-MAX_CONTROLLER = 16
-MAX_MOTOR = 8
 
+class MotorTests(InstrumentTestCase):
+    # The scan of each instrument's axes, shared by every motor check of that instrument.
+    _scans: "weakref.WeakKeyDictionary[object, concurrent.futures.Future]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _scans_lock = threading.Lock()
 
-class MotorTests(unittest.TestCase):
+    @skip_if_instrument_offline
     def setUp(self) -> None:
-        self.ca = ChannelAccessUtils(Settings.pv_prefix)
+        with MotorTests._scans_lock:
+            scan = MotorTests._scans.get(self.context)
+            first_check = scan is None
+            if first_check:
+                scan = MotorTests._scans[self.context] = concurrent.futures.Future()
+        if first_check:
+            try:
+                scan.set_result(
+                    asyncio.run(
+                        MotorInventory.scan(
+                            AsyncChannelAccess(
+                                self.context.pv_prefix, breaker=self.context.ca_breaker
+                            )
+                        )
+                    )
+                )
+            except Exception as e:
+                # Later checks of the instrument fail with the same error rather than waiting forever
+                scan.set_exception(e)
+                raise
+        self.inventory = scan.result()
+
+    def _assert_settings_read(self, axis: MotorAxis, *settings: str) -> None:
+        """
+        Fails if any of the settings of an axis that a check uses timed out, so the axis could not be checked.
+        """
+        read_errors = axis.get_read_errors("controller_type", *settings)
+        if read_errors:
+            self.fail(
+                "Could not check axis {}{}: {}".format(
+                    self.context.pv_prefix,
+                    axis.name,
+                    "; ".join(str(e) for e in read_errors),
+                )
+            )
 
     def test_beckhoffs_have_nonzero_delay(self) -> None:
         """
@@ -21,30 +63,14 @@ class MotorTests(unittest.TestCase):
 
         This test ensures that .DLY is not set to zero (the motor record default) for any beckhoff axes.
         """
-
-        def check_nonzero_delay(controller, motor) -> str | None:
-            prefix = f"MOT:MTR{controller:02d}{motor:02d}"
-            controller_type = self.ca.get_value(f"{prefix}_IOCNAME", timeout=30)
-
-            if controller_type is not None and controller_type.startswith("TC_"):
-                delay = self.ca.get_value(f"{prefix}.DLY", timeout=30)
-                if delay == 0:
-                    return f"Delay is zero on Beckhoff axis {self.ca.pv_prefix}{prefix}"
-
-            return None
-
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=MAX_MOTOR * MAX_CONTROLLER
-        ) as executor:
-            futures = []
-            for controller in range(1, MAX_CONTROLLER + 1):
-                for motor in range(1, MAX_MOTOR + 1):
-                    futures.append(executor.submit(check_nonzero_delay, controller, motor))
-
-            for fut in concurrent.futures.as_completed(futures):
-                result = fut.result()
-                with self.subTest():
-                    self.assertIsNone(result)
+        for axis in self.inventory.get_axes_with_controller_type("TC_"):
+            with self.subTest(axis=axis.name):
+                self._assert_settings_read(axis, "delay")
+                self.assertNotEqual(
+                    axis.delay,
+                    0,
+                    f"Delay is zero on Beckhoff axis {self.context.pv_prefix}{axis.name}",
+                )
 
     def test_galils_have_nonzero_encoder_sync_tolerance(self) -> None:
         """
@@ -58,30 +84,10 @@ class MotorTests(unittest.TestCase):
         This test ensures that ._MOT_ENC_SYNC_TOL_SP is not set to zero
         for any closed-loop galil axes.
         """
-
-        def check_nonzero_mot_enc_sync_tol(controller, motor) -> str | None:
-            prefix = f"MOT:MTR{controller:02d}{motor:02d}"
-            controller_type = self.ca.get_value(f"{prefix}_IOCNAME", timeout=30)
-
-            if isinstance(controller_type, str) and controller_type.startswith("GALIL_"):
-                mot_enc_sync_tol = self.ca.get_value(f"{prefix}_MOT_ENC_SYNC_TOL_SP", timeout=30)
-                ueip = self.ca.get_value(f"{prefix}.UEIP", timeout=30)
-                if ueip == "Yes" and mot_enc_sync_tol == 0:
-                    return f"Motor-encoder sync tolerance is zero on closed-loop axis {self.ca.pv_prefix}{prefix}"
-
-            return None
-
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=MAX_MOTOR * MAX_CONTROLLER
-        ) as executor:
-            futures = []
-            for controller in range(1, MAX_CONTROLLER + 1):
-                for motor in range(1, MAX_MOTOR + 1):
-                    futures.append(
-                        executor.submit(check_nonzero_mot_enc_sync_tol, controller, motor)
-                    )
-
-            for fut in concurrent.futures.as_completed(futures):
-                result = fut.result()
-                with self.subTest():
-                    self.assertIsNone(result)
+        for axis in self.inventory.get_axes_with_controller_type("GALIL_"):
+            with self.subTest(axis=axis.name):
+                self._assert_settings_read(axis, "ueip", "mot_enc_sync_tol")
+                self.assertFalse(
+                    axis.ueip == "Yes" and axis.mot_enc_sync_tol == 0,
+                    f"Motor-encoder sync tolerance is zero on closed-loop axis {self.context.pv_prefix}{axis.name}",
+                )
@@ -1,31 +1,33 @@
-from __future__ import absolute_import
-
 import os
-import unittest
 from unittest import skip
 
 from util.scripting import ScriptingUtils
 
-from .settings import Settings
+from .context import InstrumentTestCase
 
 
-class ScriptingDirectoryTests(unittest.TestCase):
+class ScriptingDirectoryTests(InstrumentTestCase):
     def setUp(self):
-        self.script_utils = ScriptingUtils(Settings.config_repo_path)
+        self.script_utils = ScriptingUtils(
+            self.context.config_repo_path, self.context.config_source
+        )
+        self.source = self.script_utils.source
         self.python_dir = self.script_utils.get_scripting_directory()
         self.inst_directory = self.script_utils.get_instrument_scripts_directory()
         self.inst_file = self.script_utils.get_instrument_script_file()
-        self.name = Settings.name
+        self.name = self.context.name
 
         # Skip all tests in this class if scripting directory doesn't exist
         # Can't do this using skipIf because it's runtime behaviour
-        if not os.path.isdir(self.python_dir):
+        if not self.source.is_dir(self.python_dir):
             self.skipTest("Python directory not present")
 
-    def test_GIVEN_a_python_directory_exists_THEN_it_contains_a_correctly_named_init_file(self):
+    def test_GIVEN_a_python_directory_exists_THEN_it_contains_a_correctly_named_init_file(
+        self,
+    ):
         init_files = [
             file
-            for file in os.listdir(self.python_dir)
+            for file in self.source.list_dir(self.python_dir)
             if file.endswith(".py") and file.startswith("init_")
         ]
 
@@ -34,27 +36,37 @@ class ScriptingDirectoryTests(unittest.TestCase):
         self.assertIn(expected_init_file, init_files, "Instrument init file not found")
         self.assertEqual(len(init_files), 1, "Expected exactly one init file")
 
-    @staticmethod
-    def _directory_contains_compiled_files(dir):
-        return len([file for file in os.listdir(dir) if file.endswith(".pyc")]) != 0
+    def _directory_contains_compiled_files(self, dir):
+        return (
+            len([file for file in self.source.list_dir(dir) if file.endswith(".pyc")])
+            != 0
+        )
 
-    @skip("This currently doesn't pass on any instruments but we should consider enforcing this.")
-    def test_GIVEN_python_directory_exists_THEN_compiled_python_files_are_not_in_git(self):
+    @skip(
+        "This currently doesn't pass on any instruments but we should consider enforcing this."
+    )
+    def test_GIVEN_python_directory_exists_THEN_compiled_python_files_are_not_in_git(
+        self,
+    ):
         self.assertFalse(
             self._directory_contains_compiled_files(self.python_dir),
             "Python directory contained compiled files",
         )
 
     def test_GIVEN_that_python_directory_exists_THEN_inst_directory_exists(self):
-        inst_is_dir = os.path.isdir(self.inst_directory)
-        inst_is_file = os.path.isfile(self.inst_file)
-        self.assertTrue(inst_is_dir or inst_is_file, "Instrument scripts directory/file is missing")
+        inst_is_dir = self.source.is_dir(self.inst_directory)
+        inst_is_file = self.source.is_file(self.inst_file)
+        self.assertTrue(
+            inst_is_dir or inst_is_file, "Instrument scripts directory/file is missing"
+        )
 
-    @skip("This currently doesn't pass on any instruments but we should consider enforcing this.")
+    @skip(
+        "This currently doesn't pass on any instruments but we should consider enforcing this."
+    )
     def test_GIVEN_that_instrument_scripts_directory_exists_THEN_it_does_not_contain_compiled_python_files(
         self,
     ):
-        if not os.path.isdir(self.inst_directory):
+        if not self.source.is_dir(self.inst_directory):
             self.skipTest("Instrument scripts directory missing")
 
         self.assertFalse(
@@ -62,13 +74,14 @@ class ScriptingDirectoryTests(unittest.TestCase):
             "Instrument scripts directory contained compiled files",
         )
 
-    def test_GIVEN_inst_scripts_dir_exists_THEN_it_doesnt_contain_old_style_importer(self):
+    def test_GIVEN_inst_scripts_dir_exists_THEN_it_doesnt_contain_old_style_importer(
+        self,
+    ):
         init = os.path.join(self.inst_directory, "__init__.py")
-        if not os.path.exists(init):
+        if not self.source.is_file(init):
             self.skipTest("No inst\\__init__.py found")
 
-        with open(init) as f:
-            text = f.read()
+        text = self.source.read(init)
 
         if "import pkgutil" in text:
             self.fail(
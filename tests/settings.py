@@ -1,39 +1,65 @@
-from builtins import object
+from util.ca_breaker import CHANNEL_ACCESS_BUDGET, MAX_CONSECUTIVE_TIMEOUTS
+from util.validation_cache import ValidationCache
+from util.xml_backend import get_xml_backend
 
-from util.channel_access import ChannelAccessUtils
 
-
-class Settings(object):
+class Settings:
     """
-    Class that holds settings for each test suite to use, for example which instrument is currently being tested
+    Class that holds the settings shared by every instrument tested in a run, for example the repositories to check
+    out and the caches the checks share. What the checks of each instrument need to know about that instrument is
+    passed to them in an InstrumentContext instead.
 
     Should be used in a static way only.
 
-    These variables are set from the main test runner and read from the test classes when the tests run.
+    These variables are set from the main test runner before any instrument is tested.
     """
 
-    name = ""
-    hostname = ""
     config_repo_path = ""
     gui_repo_path = ""
-    pv_prefix = ""
-    valid_iocs = None
-    protected_iocs = None
+    max_consecutive_ca_timeouts = MAX_CONSECUTIVE_TIMEOUTS
+    ca_budget = CHANNEL_ACCESS_BUDGET
+    validation_cache = ValidationCache()
+    xml_backend = get_xml_backend()
+    test_threads = 1
 
     def __init__(self):
         raise RuntimeError("Do not create an instance of this class.")
 
-    @staticmethod
-    def set_instrument(name, hostname, pv_prefix):
-        Settings.name = name
-        Settings.hostname = hostname
-        Settings.pv_prefix = pv_prefix
-
-        ca = ChannelAccessUtils(pv_prefix)
-        Settings.valid_iocs = ca.get_valid_iocs()
-        Settings.protected_iocs = ca.get_protected_iocs()
-
     @staticmethod
     def set_repo_paths(config_repo_path, gui_repo_path):
         Settings.config_repo_path = config_repo_path
         Settings.gui_repo_path = gui_repo_path
+
+    @staticmethod
+    def set_validation_cache(validation_cache):
+        """
+        Sets the cache that checks of single files share their outcomes through, for example one that persists
+        outcomes between runs.
+        """
+        Settings.validation_cache = validation_cache
+
+    @staticmethod
+    def set_xml_backend(xml_backend):
+        """
+        Sets the backend that configuration files are parsed and validated with, for example one that validates
+        them against the blockserver schemas.
+        """
+        Settings.xml_backend = xml_backend
+
+    @staticmethod
+    def set_ca_breaker_limits(max_consecutive_timeouts, budget):
+        """
+        Sets the limits of the channel access circuit breaker each instrument gets: the number of reads in a row that
+        may time out before checking whether the instrument is still up, and the total time in seconds its checks
+        may spend waiting on channel access, or None for no limit.
+        """
+        Settings.max_consecutive_ca_timeouts = max_consecutive_timeouts
+        Settings.ca_budget = budget
+
+    @staticmethod
+    def set_test_threads(test_threads):
+        """
+        Sets the number of threads the per-configuration, per-component and per-synoptic tests of each instrument
+        are run on.
+        """
+        Settings.test_threads = test_threads
@@ -1,31 +1,54 @@
-import unittest
-
-from tests.settings import Settings
+from tests.context import InstrumentTestCase
 from util.common import skip_on_instruments
-from util.gui import GuiUtils
 from util.synoptic import SynopticUtils
 from util.version import VersionUtils
 
 
-class SynopticTests(unittest.TestCase):
-    def __init__(self, methodName, synoptic=None):  # noqa: N803
+class SynopticTests(InstrumentTestCase):
+    def __init__(self, methodName, synoptic=None, context=None):
         # Boilerplate so that unittest knows how to run these tests.
-        super(SynopticTests, self).__init__(methodName)
+        super().__init__(methodName, context)
 
         self.synoptic = synoptic
 
+    def get_item(self) -> str | None:
+        return self.synoptic
+
     def setUp(self):
         # Has to have an __init__ that accepts one argument for unittest's test loader to work properly.
         # However the config should never be the default (None) when actually running the tests.
         self.assertIsNotNone(self.synoptic)
 
-        self.gui_utils = GuiUtils(Settings.gui_repo_path)
-        self.synoptic_utils = SynopticUtils(Settings.config_repo_path)
-        self.version_utils = VersionUtils(Settings.config_repo_path)
+        self.synoptic_utils = SynopticUtils(
+            self.context.config_repo_path, self.context.config_source
+        )
+        self.version_utils = VersionUtils(
+            self.context.config_repo_path, self.context.config_source
+        )
 
         if not self.version_utils.version_file_exists():
             self.skipTest("Can't determine which version of the GUI is being used.")
 
+        if (
+            self.context.valid_synoptic_targets is None
+            or self.context.valid_synoptic_types is None
+        ):
+            self.skipTest(
+                "Can't read opi_info.xml for the version of the GUI being used."
+            )
+
+    def _get_problems(self, check_name, inputs, check):
+        """
+        Gets the problems a check finds in the synoptic, sharing the outcome with identical synoptics.
+        :param check: Called with the parsed synoptic, returns the problems found
+        """
+        return self.context.validation_cache.get_problems(
+            check_name,
+            self.synoptic_utils.get_blob_sha(self.synoptic),  # type: ignore
+            inputs,
+            lambda: check(self.synoptic_utils.get_root(self.synoptic)),  # type: ignore
+        )
+
     @skip_on_instruments(
         ["DEMO"],
         "Demo often has a development version installed; this test is not useful",
@@ -35,65 +58,75 @@ class SynopticTests(unittest.TestCase):
         "Filter set OPI patched on after migration. Remove this skip if CHIPIR on > V15.0.0",
     )
     def test_GIVEN_synoptic_THEN_targets_that_it_defines_appear_in_opi_info(self):
-        allowed_targets = self.gui_utils.get_valid_targets(self.gui_utils.get_opi_info_xml())
+        allowed_targets = self.context.valid_synoptic_targets
 
         try:
-            type_target_pairs = self.synoptic_utils.get_type_target_pairs(
-                self.synoptic_utils.get_xml(self.synoptic)  # type: ignore
+            unknown_targets = self._get_problems(
+                "unknown_synoptic_targets",
+                sorted(allowed_targets),
+                lambda xml: [
+                    target
+                    for type, target in self.synoptic_utils.get_type_target_pairs(xml)
+                    if not self.synoptic_utils.target_should_be_ignored(target)
+                    and target not in allowed_targets
+                ],
             )
         except Exception as e:
             self.fail(
-                "In synoptic {}, XML failed to parse properly. Error text was: {}".format(
-                    self.synoptic, e
-                )
+                f"In synoptic {self.synoptic}, XML failed to parse properly. Error text was: {e}"
             )
 
-        for type, target in type_target_pairs:
-            if not self.synoptic_utils.target_should_be_ignored(target):
-                self.assertIn(
-                    target,
-                    allowed_targets,
-                    "In synoptic {}, component target '{}' was unknown.".format(
-                        self.synoptic, target
-                    ),
-                )
+        for target in unknown_targets:
+            self.fail(
+                f"In synoptic {self.synoptic}, component target '{target}' was unknown."
+            )
 
     @skip_on_instruments(
-        ["DEMO"], "Demo often has a development version installed; this test is not useful"
+        ["DEMO"],
+        "Demo often has a development version installed; this test is not useful",
     )
     def test_GIVEN_synoptic_THEN_types_that_it_defines_appear_in_opi_info(self):
-        allowed_types = self.gui_utils.get_valid_types(self.gui_utils.get_opi_info_xml())
+        allowed_types = self.context.valid_synoptic_types
 
         try:
-            type_target_pairs = self.synoptic_utils.get_type_target_pairs(
-                self.synoptic_utils.get_xml(self.synoptic)  # type: ignore
+            unknown_types = self._get_problems(
+                "unknown_synoptic_types",
+                sorted(allowed_types),
+                lambda xml: [
+                    type
+                    for type, target in self.synoptic_utils.get_type_target_pairs(xml)
+                    if not self.synoptic_utils.type_should_be_ignored(type)
+                    and type not in allowed_types
+                ],
             )
         except Exception as e:
             self.fail(
-                "In synoptic {}, XML failed to parse properly. Error text was: {}".format(
-                    self.synoptic, e
-                )
+                f"In synoptic {self.synoptic}, XML failed to parse properly. Error text was: {e}"
             )
 
-        for type, target in type_target_pairs:
-            if not self.synoptic_utils.type_should_be_ignored(type):
-                self.assertIn(
-                    type,
-                    allowed_types,
-                    "In synoptic {}, component type '{}' was unknown.".format(self.synoptic, type),
-                )
+        for type in unknown_types:
+            self.fail(
+                f"In synoptic {self.synoptic}, component type '{type}' was unknown."
+            )
 
     def test_GIVEN_synoptic_THEN_pv_addresses_are_not_empty(self):
         try:
-            pvs = self.synoptic_utils.get_pv_addresses(self.synoptic_utils.get_xml(self.synoptic))  # type: ignore
+            invalid_names = self._get_problems(
+                "synoptic_pvs_without_address",
+                None,
+                lambda xml: [
+                    name
+                    for name, address in self.synoptic_utils.get_pv_addresses(
+                        xml
+                    ).items()
+                    if address is None
+                ],
+            )
         except Exception as e:
             self.fail(
-                "In synoptic {}, XML failed to parse properly. Error text was: {}".format(
-                    self.synoptic, e
-                )
+                f"In synoptic {self.synoptic}, XML failed to parse properly. Error text was: {e}"
             )
         else:
-            invalid_names = [name for name in pvs.keys() if pvs[name] is None]
             error_msg = "Synoptic {} contains the following PV names with no associated address:\n    {}".format(
                 self.synoptic, "\n    ".join(invalid_names)
             )
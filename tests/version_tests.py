@@ -1,32 +1,38 @@
-import unittest
-
-from tests.settings import Settings
+from tests.context import InstrumentTestCase
 from util.channel_access import ChannelAccessUtils
-from util.common import skip_on_instruments
+from util.common import skip_if_instrument_offline, skip_on_instruments
 from util.version import VersionUtils
 
 
-class VersionTests(unittest.TestCase):
+class VersionTests(InstrumentTestCase):
     def setUp(self):
-        self.version_utils = VersionUtils(Settings.config_repo_path)
-        self.ca = ChannelAccessUtils(Settings.pv_prefix)
+        self.version_utils = VersionUtils(
+            self.context.config_repo_path, self.context.config_source
+        )
+        self.ca = ChannelAccessUtils(self.context.pv_prefix, self.context.ca_breaker)
 
     def test_WHEN_looking_for_config_version_file_THEN_it_exists(self):
         self.assertTrue(
-            self.version_utils.version_file_exists(), "Config version file did not exist"
+            self.version_utils.version_file_exists(),
+            "Config version file did not exist",
         )
 
-    def test_WHEN_counting_config_version_files_in_repository_THEN_there_is_exactly_one_file(self):
+    def test_WHEN_counting_config_version_files_in_repository_THEN_there_is_exactly_one_file(
+        self,
+    ):
         self.assertLessEqual(
             self.version_utils.count_config_version_files(),
             1,
-            "There should not be more than one '{}' file in the repository.".format(
-                VersionUtils.VERSION_FILE
-            ),
+            f"There should not be more than one '{VersionUtils.VERSION_FILE}' file in the repository.",
         )
 
-    @skip_on_instruments(["DEMO"], "DEMO does not typically have a full release installed")
-    def test_GIVEN_version_file_exists_THEN_it_is_the_same_as_version_pv_on_server(self):
+    @skip_on_instruments(
+        ["DEMO"], "DEMO does not typically have a full release installed"
+    )
+    @skip_if_instrument_offline
+    def test_GIVEN_version_file_exists_THEN_it_is_the_same_as_version_pv_on_server(
+        self,
+    ):
         if not self.version_utils.version_file_exists():
             self.skipTest("Version file did not exist.")
 
@@ -36,16 +42,14 @@ class VersionTests(unittest.TestCase):
         if server_version is None:
             self.skipTest("Couldn't connect to version PV on server")
 
-        if (Settings.name == "POLREF" or Settings.name == "CRISP") and server_version.startswith(
-            "7.2.0"
-        ):
+        if (
+            self.context.name == "POLREF" or self.context.name == "CRISP"
+        ) and server_version.startswith("7.2.0"):
             self.skipTest("Reflectometry reverted to 7.2.0 due to #6472")
 
         # Special case for server version 0.0.0 which is a development release - assume it's always up to date.
         if not server_version.startswith("0.0.0"):
             self.assertTrue(
                 self.version_utils.versions_similar(config_version, server_version),
-                "Config version was wrong. Server version={}, config version={}".format(
-                    server_version, config_version
-                ),
+                f"Config version was wrong. Server version={server_version}, config version={config_version}",
             )
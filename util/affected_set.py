@@ -0,0 +1,92 @@
+from .configurations import CONFIGURATION_READ_ERRORS, ConfigurationUtils
+
+CONFIGURATIONS_PREFIX = "configurations/configurations/"
+COMPONENTS_PREFIX = "configurations/components/"
+SYNOPTICS_PREFIX = "configurations/synoptics/"
+
+# Files that every configuration and component check may read, so a change to any of them affects everything.
+SHARED_FILES = ["configurations/globals.txt"]
+
+
+class AffectedSet:
+    """
+    The configurations, components and synoptics of an instrument whose per-item checks may give a different result
+    after a set of files in its configurations branch has changed.
+
+    A configuration is affected if any of its own files changed, or if its components.xml references a component
+    whose files changed. Components and synoptics are only affected by changes to their own files.
+    """
+
+    def __init__(
+        self, configurations: set[str], components: set[str], synoptics: set[str]
+    ) -> None:
+        self.configurations = configurations
+        self.components = components
+        self.synoptics = synoptics
+
+    @staticmethod
+    def _get_names_under(changed_paths: set[str], prefix: str) -> set[str]:
+        """
+        Gets the names of the folders or files directly under a folder which contain a changed path.
+        """
+        return {
+            path[len(prefix) :].split("/")[0]
+            for path in changed_paths
+            if path.startswith(prefix)
+        }
+
+    @staticmethod
+    def get_dependent_configurations(
+        config_utils: ConfigurationUtils, components: set[str]
+    ) -> set[str]:
+        """
+        Gets the configurations which include any of the given components, using a reverse index from each component
+        to the configurations whose components.xml references it.
+
+        Configurations whose components.xml cannot be read are treated as dependent, so that they are still checked.
+
+        :param config_utils: The configuration utilities to read components.xml files with
+        :param components: The names of the components
+        :return: The names of the dependent configurations
+        """
+        configurations_by_component: dict[str, set[str]] = {}
+        unreadable = set()
+        for config in config_utils.get_configurations_as_list():
+            try:
+                for component in config_utils.get_active_components_as_list(config):
+                    configurations_by_component.setdefault(component, set()).add(config)
+            except CONFIGURATION_READ_ERRORS:
+                unreadable.add(config)
+
+        return unreadable.union(
+            *(
+                configurations_by_component.get(component, set())
+                for component in components
+            )
+        )
+
+    @staticmethod
+    def from_changed_paths(
+        changed_paths: set[str], config_utils: ConfigurationUtils
+    ) -> "AffectedSet | None":
+        """
+        Works out which configurations, components and synoptics are affected by a set of changed files.
+        :param changed_paths: The changed paths relative to the root of the repository, using forward slashes
+        :param config_utils: The configuration utilities for the instrument's new configurations
+        :return: The affected set, or None if everything is affected
+        """
+        if any(path in SHARED_FILES for path in changed_paths):
+            return None
+
+        configurations = AffectedSet._get_names_under(
+            changed_paths, CONFIGURATIONS_PREFIX
+        )
+        components = AffectedSet._get_names_under(changed_paths, COMPONENTS_PREFIX)
+        synoptics = AffectedSet._get_names_under(changed_paths, SYNOPTICS_PREFIX)
+
+        if components:
+            configurations |= AffectedSet.get_dependent_configurations(
+                config_utils, components
+            )
+
+        return AffectedSet(configurations, components, synoptics)
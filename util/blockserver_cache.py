@@ -0,0 +1,58 @@
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+
+class BlockserverCache:
+    """
+    Caches the decoded payloads of the blockserver PVs of the instrument being checked, such as its IOCs and its
+    interesting PVs, so that each is read and decoded once per instrument however many checks use it.
+
+    Each instrument's context has its own cache, so its hit and miss counts cover that instrument alone. Payloads
+    that could not be read are cached as None, so an unavailable PV does not time out again for each check.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._payloads: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def preload(self, payloads: dict[str, Any]) -> None:
+        """
+        Adds payloads that have already been read, for example while the previous instrument was being checked.
+        :param payloads: The decoded payload of each PV
+        """
+        with self._lock:
+            self._payloads.update(payloads)
+
+    def get_payloads(
+        self,
+        pvs: Sequence[str],
+        read_payloads: Callable[[list[str]], dict[str, Any]],
+        prefetch: Iterable[str] = (),
+    ) -> dict[str, Any]:
+        """
+        Gets the decoded payloads of some PVs, reading those that are not cached yet.
+        :param pvs: The names of the PVs, without the prefix
+        :param read_payloads: Reads and decodes the payloads of a list of PVs concurrently
+        :param prefetch: Other PVs to read along with any that are missing, so that later lookups of them are hits
+        :return: A dictionary of the decoded payload of each PV, or None for those that were unavailable
+        """
+        with self._lock:
+            missing = [pv for pv in pvs if pv not in self._payloads]
+            self.hits += len(pvs) - len(missing)
+            self.misses += len(missing)
+            if missing:
+                to_read = list(dict.fromkeys(missing + list(prefetch)))
+                self._payloads.update(
+                    read_payloads([pv for pv in to_read if pv not in self._payloads])
+                )
+            return {pv: self._payloads[pv] for pv in pvs}
+
+    def get_hit_rate(self) -> float:
+        """
+        :return: The fraction of lookups answered without reading the PV, 0 if there have been no lookups
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
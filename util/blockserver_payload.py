@@ -0,0 +1,203 @@
+import binascii
+import codecs
+import json
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+# The number of hex digits unhexlified and decompressed at a time. Must be even.
+HEX_CHUNK_SIZE = 1 << 16
+
+# The number of places to try splitting the buffered members of an array or object at before reading one on its own.
+MAX_BATCH_ATTEMPTS = 3
+
+# The errors raised by a payload that is not hex encoded, zlib compressed JSON of the expected structure. Hex, text
+# and JSON decoding errors are all ValueErrors.
+PAYLOAD_DECODE_ERRORS = (zlib.error, ValueError, TypeError, IndexError)
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_decompressed_text(
+    data: str, chunk_size: int = HEX_CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Converts the raw data of a compressed blockserver PV to text a chunk at a time, so that neither the whole
+    compressed nor the whole decompressed payload is held in memory at once.
+    :param data: The raw data from the PV, the hex encoded bytes of the zlib compressed payload
+    :param chunk_size: The number of hex digits to convert at a time
+    :return: An iterator of chunks of the decompressed, decoded text
+    """
+    decompressor = zlib.decompressobj()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for start in range(0, len(data), chunk_size):
+        text = decoder.decode(
+            decompressor.decompress(
+                binascii.unhexlify(data[start : start + chunk_size])
+            )
+        )
+        if text:
+            yield text
+    text = decoder.decode(decompressor.flush(), final=True)
+    if text:
+        yield text
+    if not decompressor.eof:
+        raise zlib.error("Incomplete compressed payload")
+
+
+class _JsonStreamReader:
+    """
+    Reads JSON values one at a time from a stream of text chunks, keeping only the text of the value being read.
+
+    Each value is parsed by the standard library's decoder, so only the structure around the values of interest is
+    handled here. The members of an array or object can also be read in batches of all of the complete members that
+    are buffered, which needs one call into the decoder per chunk rather than one per member.
+    """
+
+    def __init__(self, chunks: Iterable[str]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+
+    def _fill(self) -> bool:
+        """
+        Appends the next chunk to the buffer, dropping what has already been read.
+        :return: False if there are no more chunks
+        """
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._exhausted = True
+            return False
+        self._buffer = self._buffer[self._position :] + chunk
+        self._position = 0
+        return True
+
+    def peek(self) -> str | None:
+        """
+        :return: The next character that is not whitespace, without consuming it, or None at the end of the stream
+        """
+        while True:
+            while (
+                self._position < len(self._buffer)
+                and self._buffer[self._position] in _WHITESPACE
+            ):
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return None
+
+    def expect(self, characters: str) -> str:
+        """
+        Consumes the next character that is not whitespace.
+        :param characters: The characters allowed next
+        :return: The character consumed
+        """
+        character = self.peek()
+        if character is None or character not in characters:
+            raise ValueError(
+                f"Expected one of '{characters}' but found {character!r} in blockserver payload"
+            )
+        self._position += 1
+        return character
+
+    def read_value(self) -> Any:
+        """
+        Reads the next JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._exhausted or not self._fill():
+                    raise
+                continue
+            # A number or literal at the end of the buffer may continue in the next chunk.
+            if end < len(self._buffer) or self._exhausted or not self._fill():
+                self._position = end
+                return value
+
+    def read_batch(self, closer: str, brackets: str) -> list | dict | None:
+        """
+        Reads all of the complete members of an array or object in the buffer but the last, leaving the separator
+        after them unread.
+
+        The buffer is split just after the last occurrence of the character that closes a member followed by a
+        comma, which is usually the boundary between two members. If the split is actually inside a member, the text
+        before it is not valid JSON once bracketed, and an earlier split is tried.
+
+        :param closer: The last character of each member, e.g. "]" if the members are arrays
+        :param brackets: The brackets of the array or object, "[]" or "{}"
+        :return: The members read, as a list or dictionary, or None if no split was found
+        """
+        self.peek()
+        end = len(self._buffer)
+        for _ in range(MAX_BATCH_ATTEMPTS):
+            split = self._buffer.rfind(closer + ",", self._position, end)
+            if split < 0:
+                return None
+            try:
+                members = json.loads(
+                    brackets[0] + self._buffer[self._position : split + 1] + brackets[1]
+                )
+            except json.JSONDecodeError:
+                end = split
+                continue
+            self._position = split + 1
+            return members
+        return None
+
+
+def iter_json_array_items(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Reads the items of a JSON array one at a time.
+    :param chunks: The text of the array, in chunks
+    :return: An iterator of the items of the array
+    """
+    reader = _JsonStreamReader(chunks)
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    first_item = reader.read_value()
+    yield first_item
+    closer = _get_closer(first_item)
+    while reader.expect(",]") == ",":
+        batch = reader.read_batch(closer, "[]") if closer is not None else None
+        if batch:
+            yield from batch
+        else:
+            yield reader.read_value()
+
+
+def iter_json_object_keys(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Reads the keys of a JSON object one at a time, reading past their values without keeping them.
+    :param chunks: The text of the object, in chunks
+    :return: An iterator of the keys of the object
+    """
+    reader = _JsonStreamReader(chunks)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    yield reader.read_value()
+    reader.expect(":")
+    closer = _get_closer(reader.read_value())
+    while reader.expect(",}") == ",":
+        batch = reader.read_batch(closer, "{}") if closer is not None else None
+        if batch:
+            yield from batch
+        else:
+            yield reader.read_value()
+            reader.expect(":")
+            reader.read_value()
+
+
+def _get_closer(value: Any) -> str | None:
+    """
+    Gets the last character of the text of a container, so that members of the same type as this one can be batched.
+    :return: The closing bracket, or None if the value is not a container
+    """
+    return {list: "]", dict: "}"}.get(type(value))
@@ -0,0 +1,144 @@
+import contextlib
+import threading
+import time
+
+# The number of reads in a row that may time out before the breaker checks whether the instrument is still up.
+MAX_CONSECUTIVE_TIMEOUTS = 3
+
+# The total time the checks of one instrument may spend waiting on channel access by default, in seconds.
+CHANNEL_ACCESS_BUDGET = 300
+
+
+class ChannelAccessBreaker:
+    """
+    Stops the checks of one instrument reading PVs once the instrument has stopped responding or its time budget for
+    channel access has run out, so that later reads fail immediately instead of each waiting for a timeout.
+
+    A PV that does not exist times out in the same way as a PV on an instrument that is down, so the breaker does not
+    trip on timeouts alone. Once a number of reads in a row have timed out, the reader is asked to confirm by reading
+    the instrument's heartbeat PV, and the breaker trips only if that times out too.
+
+    The budget counts the time during which at least one read is outstanding, so reads that overlap are only counted
+    once.
+    """
+
+    def __init__(
+        self,
+        name: str = "",
+        max_consecutive_timeouts: int = MAX_CONSECUTIVE_TIMEOUTS,
+        budget: float | None = CHANNEL_ACCESS_BUDGET,
+        clock=time.monotonic,
+    ) -> None:
+        """
+        :param name: The name of the instrument, used in messages
+        :param max_consecutive_timeouts: The number of reads in a row that may time out before the breaker checks
+            whether the instrument is still up
+        :param budget: The total time reads may take, in seconds, or None for no limit
+        :param clock: Returns the current time in seconds
+        """
+        self.name = name
+        self.max_consecutive_timeouts = max_consecutive_timeouts
+        self.budget = budget
+        self.tripped = False
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._consecutive_timeouts = 0
+        self._confirming = False
+        self._active_reads = 0
+        self._active_since = 0.0
+        self._spent = 0.0
+
+    def get_time_spent(self) -> float:
+        """
+        :return: The time during which at least one read has been outstanding, in seconds
+        """
+        with self._lock:
+            if self._active_reads > 0:
+                return self._spent + self._clock() - self._active_since
+            return self._spent
+
+    def get_remaining_budget(self) -> float | None:
+        """
+        :return: The time left for reads, in seconds, or None if there is no limit
+        """
+        if self.budget is None:
+            return None
+        return max(self.budget - self.get_time_spent(), 0.0)
+
+    def allows_reads(self) -> bool:
+        """
+        :return: Whether a read may be attempted. Trips the breaker if the budget has run out.
+        """
+        if not self.tripped and self.get_remaining_budget() == 0:
+            self.trip(f"its channel access budget of {self.budget}s has run out")
+        return not self.tripped
+
+    def get_timeout(self, timeout: float) -> float:
+        """
+        :param timeout: The timeout a read would otherwise use, in seconds
+        :return: The timeout shortened so that the read can not exceed the remaining budget
+        """
+        remaining = self.get_remaining_budget()
+        return timeout if remaining is None else min(timeout, remaining)
+
+    @contextlib.contextmanager
+    def reading(self):
+        """
+        Counts the time spent inside the block against the budget.
+        """
+        with self._lock:
+            if self._active_reads == 0:
+                self._active_since = self._clock()
+            self._active_reads += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active_reads -= 1
+                if self._active_reads == 0:
+                    self._spent += self._clock() - self._active_since
+
+    def record_response(self) -> None:
+        """
+        Records that the instrument responded to a read.
+        """
+        with self._lock:
+            self._consecutive_timeouts = 0
+
+    def record_timeout(self) -> bool:
+        """
+        Records that a read timed out.
+        :return: True if the caller should now confirm whether the instrument is up, by reading its heartbeat PV and
+            calling confirm with the outcome
+        """
+        with self._lock:
+            self._consecutive_timeouts += 1
+            if (
+                self._confirming
+                or self._consecutive_timeouts < self.max_consecutive_timeouts
+            ):
+                return False
+            self._confirming = True
+            return True
+
+    def confirm(self, instrument_up: bool) -> None:
+        """
+        Records whether the instrument answered the heartbeat read requested by record_timeout, tripping the breaker
+        if it did not.
+        """
+        with self._lock:
+            self._confirming = False
+            self._consecutive_timeouts = 0
+        if not instrument_up:
+            self.trip(
+                f"{self.max_consecutive_timeouts} reads in a row timed out and its heartbeat PV did not answer"
+            )
+
+    def trip(self, reason: str) -> None:
+        """
+        Stops any further reads.
+        :param reason: Why reads are being stopped, for the message printed
+        """
+        if not self.tripped:
+            self.tripped = True
+            print(f"Stopped reading PVs from {self.name} because {reason}")
@@ -1,17 +1,40 @@
+import asyncio
 import binascii
+import hashlib
 import json
 import zlib
-from builtins import object
+from collections.abc import Sequence
 from enum import Enum
+from typing import Any
 
-from genie_python.channel_access_exceptions import ReadAccessException, UnableToConnectToPVException
+from CaChannel import CaChannel, CaChannelException, ca
+from genie_python.channel_access_exceptions import (
+    ReadAccessException,
+    UnableToConnectToPVException,
+)
 from genie_python.genie import PVValue
 from genie_python.genie_cachannel_wrapper import CaChannelWrapper
+from genie_python.utilities import waveform_to_string
+
+from util.blockserver_cache import BlockserverCache
+from util.blockserver_payload import (
+    iter_decompressed_text,
+    iter_json_array_items,
+    iter_json_object_keys,
+)
+from util.ca_breaker import ChannelAccessBreaker
 
 # Some instruments may not be available. If this is the case, we don't want to wait too long
 # for the response which will never come (which would slow down the tests)
 CHANNEL_ACCESS_TIMEOUT = 5
 
+# The number of PV reads an AsyncChannelAccess has outstanding at once by default.
+MAX_CONCURRENT_READS = 1000
+
+# The time to wait for an instrument's heartbeat PV when probing which instruments are up. A running blockserver
+# answers well within this, so waiting longer only delays the run when an instrument is off.
+LIVENESS_PROBE_TIMEOUT = 2
+
 
 class PvInterestingLevel(Enum):
     """
@@ -24,30 +47,292 @@ class PvInterestingLevel(Enum):
     FACILITY = "FACILITY"
 
 
-class ChannelAccessUtils(object):
+class ValueTimeoutError(asyncio.TimeoutError):
+    """
+    Raised when a PV connected but its value did not arrive in time, as opposed to a PV that never connected, which
+    may not exist at all.
+    """
+
+
+class BreakerTrippedError(asyncio.TimeoutError):
+    """
+    Raised instead of reading a PV once the circuit breaker of its instrument has tripped.
+    """
+
+
+def _set_future_result(future: asyncio.Future, result) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+class AsyncChannelAccess:
+    """
+    Reads PVs from an asyncio event loop.
+
+    Channel access runs with preemptive callbacks, so connection and get callbacks arrive on channel access' own
+    threads and complete futures on the event loop. One loop can therefore have thousands of reads outstanding
+    without a thread for each. A semaphore bounds how many reads are outstanding at once.
+
+    The semaphore belongs to the event loop it is first used in, so use a new instance for each event loop.
+    """
+
+    def __init__(
+        self,
+        pv_prefix: str = "",
+        max_concurrent_reads: int = MAX_CONCURRENT_READS,
+        breaker: ChannelAccessBreaker | None = None,
+    ):
+        """
+        :param pv_prefix: The prefix added to the name of each PV read
+        :param max_concurrent_reads: The maximum number of reads to have outstanding at once
+        :param breaker: The circuit breaker of the instrument the PVs are read from, if any
+        """
+        self.pv_prefix = pv_prefix
+        self.breaker = breaker
+        self._semaphore = asyncio.Semaphore(max_concurrent_reads)
+
+    @staticmethod
+    def _get_request_type(channel: CaChannel) -> int | None:
+        """
+        Gets the type to request a value as, converting text-like PVs to strings in the same way as get_value of
+        ChannelAccessUtils.
+        """
+        field_type = channel.field_type()
+        if ca.dbr_type_is_ENUM(field_type) or ca.dbr_type_is_STRING(field_type):
+            return ca.DBR_STRING
+        if ca.dbr_type_is_CHAR(field_type):
+            return ca.DBR_CHAR
+        return None
+
+    @staticmethod
+    def _complete_from_callback(
+        loop: asyncio.AbstractEventLoop, future: asyncio.Future, result
+    ):
+        """
+        Completes a future from a channel access callback thread.
+        """
+        try:
+            loop.call_soon_threadsafe(_set_future_result, future, result)
+        except RuntimeError:
+            # The loop has closed because the read already timed out.
+            pass
+
+    async def _read(self, channel: CaChannel, timeout: float) -> PVValue:
+        loop = asyncio.get_running_loop()
+        connected = loop.create_future()
+
+        def on_connection(epics_args, _):
+            if epics_args[1] == ca.CA_OP_CONN_UP:
+                AsyncChannelAccess._complete_from_callback(loop, connected, None)
+
+        deadline = loop.time() + timeout
+        channel.search_and_connect(None, on_connection)
+        channel.flush_io()
+        await asyncio.wait_for(connected, timeout)
+        if not channel.read_access():
+            return None
+
+        received = loop.create_future()
+        request_type = AsyncChannelAccess._get_request_type(channel)
+        channel.array_get_callback(
+            request_type,
+            None,
+            lambda epics_args, _: AsyncChannelAccess._complete_from_callback(
+                loop, received, epics_args
+            ),
+            use_numpy=False,
+        )
+        channel.flush_io()
+        try:
+            epics_args = await asyncio.wait_for(
+                received, max(deadline - loop.time(), 0)
+            )
+        except TimeoutError:
+            raise ValueTimeoutError() from None
+        if epics_args["status"] != ca.ECA_NORMAL:
+            return None
+
+        value = epics_args["pv_value"]
+        if request_type is not None:
+            value = waveform_to_string(value) if isinstance(value, list) else str(value)
+        return value
+
+    async def get_value(
+        self, pv: str, timeout: float | None = None, raise_timeout: bool = False
+    ) -> PVValue:
+        """
+        Gets the value of a PV.
+        :param pv: The name of the PV, without the prefix
+        :param timeout: The time to wait for the PV to connect and return its value, in seconds
+        :param raise_timeout: Whether to raise asyncio.TimeoutError if the PV times out, rather than returning None.
+            If the PV connected but its value did not arrive in time, ValueTimeoutError is raised, and if the breaker
+            has tripped so the PV is not read at all, BreakerTrippedError is raised.
+        :return: The value of the PV, or None if it was unavailable
+        """
+        async with self._semaphore:
+            if self.breaker is None:
+                return await self._read_pv(pv, timeout, raise_timeout)
+            if not self.breaker.allows_reads():
+                if raise_timeout:
+                    raise BreakerTrippedError()
+                return None
+            with self.breaker.reading():
+                try:
+                    value = await self._read_pv(
+                        pv,
+                        self.breaker.get_timeout(timeout or CHANNEL_ACCESS_TIMEOUT),
+                        True,
+                    )
+                except TimeoutError:
+                    if self.breaker.record_timeout():
+                        heartbeat = await self._read_pv(
+                            ChannelAccessUtils.HEARTBEAT_PV,
+                            self.breaker.get_timeout(CHANNEL_ACCESS_TIMEOUT),
+                        )
+                        self.breaker.confirm(heartbeat is not None)
+                    if raise_timeout:
+                        raise
+                    return None
+            self.breaker.record_response()
+            return value
+
+    async def _read_pv(
+        self, pv: str, timeout: float | None = None, raise_timeout: bool = False
+    ) -> PVValue:
+        """
+        :param raise_timeout: Whether to raise asyncio.TimeoutError if the PV times out, rather than returning None
+        """
+        channel = CaChannel(f"{self.pv_prefix}{pv}")
+        try:
+            return await self._read(channel, timeout or CHANNEL_ACCESS_TIMEOUT)
+        except TimeoutError:
+            if raise_timeout:
+                raise
+            return None
+        except CaChannelException:
+            return None
+        finally:
+            channel.clear_channel()
+            channel.flush_io()
+
+    async def get_values(
+        self, pvs: list[str], timeout: float | None = None
+    ) -> dict[str, PVValue]:
+        """
+        Gets the values of several PVs concurrently.
+        :param pvs: The names of the PVs, without the prefix
+        :param timeout: The time to wait for each PV, in seconds
+        :return: A dictionary of the value of each PV, or None for those that were unavailable
+        """
+        pvs = list(dict.fromkeys(pvs))
+        values = await asyncio.gather(*(self.get_value(pv, timeout) for pv in pvs))
+        return dict(zip(pvs, values))
+
+
+class ChannelAccessUtils:
     """
     Class containing utility methods for interacting with a PV
     """
 
-    def __init__(self, pv_prefix: str = "") -> None:
+    # The blockserver and server PVs whose values the configuration checks depend on.
+    CHECKED_SERVER_PVS = (
+        "CS:BLOCKSERVER:IOCS",
+        "CS:BLOCKSERVER:IOCS_NOT_TO_STOP",
+        "CS:VERSION:SVN:REV",
+        *("CS:BLOCKSERVER:PVS:INTEREST:" + level.value for level in PvInterestingLevel),
+    )
+
+    # The blockserver PVs whose decoded payloads are shared between checks through a BlockserverCache.
+    INTEREST_PVS = tuple(
+        "CS:BLOCKSERVER:PVS:INTEREST:" + level.value for level in PvInterestingLevel
+    )
+    BLOCKSERVER_PAYLOAD_PVS = (
+        "CS:BLOCKSERVER:IOCS",
+        "CS:BLOCKSERVER:IOCS_NOT_TO_STOP",
+        *INTEREST_PVS,
+    )
+
+    # A PV served by the blockserver of every running instrument, used to tell whether an instrument is up.
+    HEARTBEAT_PV = "CS:BLOCKSERVER:GET_CURR_CONFIG_DETAILS"
+
+    def __init__(
+        self,
+        pv_prefix: str = "",
+        breaker: ChannelAccessBreaker | None = None,
+        blockserver_cache: BlockserverCache | None = None,
+    ) -> None:
+        """
+        :param pv_prefix: The prefix added to the name of each PV read
+        :param breaker: The circuit breaker of the instrument the PVs are read from, if any. Once it has tripped,
+            reads return None immediately.
+        :param blockserver_cache: The cache of the instrument's blockserver payloads, if any. On the first miss, all
+            of the payloads in BLOCKSERVER_PAYLOAD_PVS are read together.
+        """
         self.pv_prefix = pv_prefix
+        self.breaker = breaker
+        self.blockserver_cache = blockserver_cache
 
-    def get_value(self, pv: str, timeout: float = None) -> PVValue:
+    def get_value(self, pv: str, timeout: float | None = None) -> PVValue:
         """
         Gets the value of the PV. Returns None if PV is unavailable.
         :return: The PV value as a string, or None if there was an error
         """
+        if self.breaker is None:
+            return self._get_value(pv, timeout)
+        if not self.breaker.allows_reads():
+            return None
+        with self.breaker.reading():
+            try:
+                value = self._get_value(
+                    pv,
+                    self.breaker.get_timeout(timeout or CHANNEL_ACCESS_TIMEOUT),
+                    True,
+                )
+            except UnableToConnectToPVException:
+                if self.breaker.record_timeout():
+                    heartbeat = self._get_value(
+                        ChannelAccessUtils.HEARTBEAT_PV,
+                        self.breaker.get_timeout(CHANNEL_ACCESS_TIMEOUT),
+                    )
+                    self.breaker.confirm(heartbeat is not None)
+                return None
+        self.breaker.record_response()
+        return value
+
+    def _get_value(
+        self, pv: str, timeout: float | None = None, raise_timeout: bool = False
+    ) -> PVValue:
+        """
+        :param raise_timeout: Whether to raise UnableToConnectToPVException if the PV can not be connected to,
+            rather than returning None
+        """
         try:
             return CaChannelWrapper.get_pv_value(
-                "{}{}".format(
-                    self.pv_prefix,
-                    pv,
-                ),
+                f"{self.pv_prefix}{pv}",
                 timeout=timeout or CHANNEL_ACCESS_TIMEOUT,
             )
-        except (UnableToConnectToPVException, ReadAccessException):
+        except UnableToConnectToPVException:
+            if raise_timeout:
+                raise
+            return None
+        except ReadAccessException:
             return None
 
+    def get_values(
+        self, pvs: list[str], timeout: float | None = None
+    ) -> dict[str, PVValue]:
+        """
+        Gets the values of several PVs at once, reading them all concurrently from one event loop.
+        :param pvs: The names of the PVs, without the prefix
+        :param timeout: The time to wait for each PV, in seconds
+        :return: A dictionary of the value of each PV, or None for those that were unavailable
+        """
+        return asyncio.run(
+            AsyncChannelAccess(self.pv_prefix, breaker=self.breaker).get_values(
+                pvs, timeout
+            )
+        )
+
     @staticmethod
     def _dehex_and_decompress(data: str) -> bytes:
         """
@@ -64,7 +349,9 @@ class ChannelAccessUtils(object):
         :return: a list of strings of instrument names.
         """
         pv_value = self.get_value("CS:INSTLIST")
-        return {} if pv_value is None else json.loads(self._dehex_and_decompress(pv_value))
+        return (
+            {} if pv_value is None else json.loads(self._dehex_and_decompress(pv_value))
+        )
 
     def get_interesting_pvs(self) -> set:
         """
@@ -73,17 +360,14 @@ class ChannelAccessUtils(object):
         prefix assigned to this class, which needs to be in the format IN:NAME_OF_INSTRUMENT.
         :return: A python set with the names of all the PVs with a high or medium interest status.
         """
-        all_interesting_pvs = (
-            self._get_pvs_by_interesting_level(PvInterestingLevel.HIGH)
-            + self._get_pvs_by_interesting_level(PvInterestingLevel.MEDIUM)
-            + self._get_pvs_by_interesting_level(PvInterestingLevel.LOW)
-            + self._get_pvs_by_interesting_level(PvInterestingLevel.FACILITY)
-        )
-        interesting_pvs = {pv for pv in all_interesting_pvs}
+        payloads = self._get_blockserver_payloads(ChannelAccessUtils.INTEREST_PVS)
+        interesting_pvs = {pv for pv_names in payloads.values() for pv in pv_names}
 
         return interesting_pvs
 
-    def _get_pvs_by_interesting_level(self, interesting_level: PvInterestingLevel) -> list:
+    def _get_pvs_by_interesting_level(
+        self, interesting_level: PvInterestingLevel
+    ) -> list:
         """
         Returns the list of all PVs with the specified interesting level from the
         corresponding instrument PV. The instrument for which it returns the list
@@ -93,22 +377,38 @@ class ChannelAccessUtils(object):
         :return: A python list with the names of all the PVs with the specified interesting level.
         """
 
-        pv_value = self.get_value("CS:BLOCKSERVER:PVS:INTEREST:" + interesting_level.value)
+        return self._get_pv_names(
+            self.get_value("CS:BLOCKSERVER:PVS:INTEREST:" + interesting_level.value)
+        )
+
+    def _get_pv_names(self, pv_value: str | None) -> list:
+        """
+        Gets the names of the PVs listed by one of the blockserver's PVs of interesting PVs. The payload is
+        streamed, so only the names are kept rather than every PV's full description.
+        :param pv_value: The raw value of the PV, or None if it was unavailable
+        :return: A python list with the names of the PVs.
+        """
         if pv_value is None:
             return []
         else:
-            interesting_pvs = json.loads(self._dehex_and_decompress(pv_value))
-            pv_names = [pv[0] for pv in interesting_pvs]
-
-            return pv_names
+            return [
+                pv[0] for pv in iter_json_array_items(iter_decompressed_text(pv_value))
+            ]
 
     def get_valid_iocs(self) -> list:
         """
         Gets the names of all valid IOCS from the PV of IOCs of the instrument.
         :return: a list of strings representing IOC names.
         """
-        pv_value = self.get_value("CS:BLOCKSERVER:IOCS")
-        return None if pv_value is None else json.loads(self._dehex_and_decompress(pv_value)).keys()
+        return self._get_valid_iocs_from_value(self.get_value("CS:BLOCKSERVER:IOCS"))
+
+    def _get_valid_iocs_from_value(self, pv_value: str | None) -> list:
+        if pv_value is None:
+            return None
+        # Only the names of the IOCs are kept, not their details.
+        return dict.fromkeys(
+            iter_json_object_keys(iter_decompressed_text(pv_value))
+        ).keys()
 
     def get_protected_iocs(self) -> list:
         """
@@ -116,8 +416,62 @@ class ChannelAccessUtils(object):
         Protected IOCs are IOCs that a user is not allowed to stop.
         :return: a list of strings representing IOC names.
         """
-        pv_value = self.get_value("CS:BLOCKSERVER:IOCS_NOT_TO_STOP")
-        return None if pv_value is None else json.loads(self._dehex_and_decompress(pv_value))
+        return self._get_protected_iocs_from_value(
+            self.get_value("CS:BLOCKSERVER:IOCS_NOT_TO_STOP")
+        )
+
+    def _get_protected_iocs_from_value(self, pv_value: str | None) -> list:
+        if pv_value is None:
+            return None
+        return list(iter_json_array_items(iter_decompressed_text(pv_value)))
+
+    def get_valid_and_protected_iocs(self) -> tuple:
+        """
+        Gets the names of all valid IOCs and of all protected IOCs, reading both PVs concurrently.
+        :return: a tuple of the valid and the protected IOC names, each None if its PV is unavailable.
+        """
+        payloads = self._get_blockserver_payloads(
+            ["CS:BLOCKSERVER:IOCS", "CS:BLOCKSERVER:IOCS_NOT_TO_STOP"]
+        )
+        return payloads["CS:BLOCKSERVER:IOCS"], payloads[
+            "CS:BLOCKSERVER:IOCS_NOT_TO_STOP"
+        ]
+
+    def read_blockserver_payloads(self) -> dict:
+        """
+        Reads and decodes all of the BLOCKSERVER_PAYLOAD_PVS concurrently, bypassing any blockserver cache, so that
+        they can be preloaded into a cache later.
+        :return: A dictionary of the decoded payload of each PV
+        """
+        return self._read_blockserver_payloads(
+            ChannelAccessUtils.BLOCKSERVER_PAYLOAD_PVS
+        )
+
+    def _decode_blockserver_payload(self, pv: str, pv_value: str | None):
+        """
+        Decodes the raw value of one of the BLOCKSERVER_PAYLOAD_PVS into the form the checks use.
+        """
+        if pv == "CS:BLOCKSERVER:IOCS":
+            return self._get_valid_iocs_from_value(pv_value)
+        if pv == "CS:BLOCKSERVER:IOCS_NOT_TO_STOP":
+            return self._get_protected_iocs_from_value(pv_value)
+        return self._get_pv_names(pv_value)
+
+    def _read_blockserver_payloads(self, pvs: Sequence[str]) -> dict:
+        pv_values = self.get_values(pvs)
+        return {pv: self._decode_blockserver_payload(pv, pv_values[pv]) for pv in pvs}
+
+    def _get_blockserver_payloads(self, pvs: Sequence[str]) -> dict:
+        """
+        Gets the decoded payloads of some of the BLOCKSERVER_PAYLOAD_PVS, from the blockserver cache if there is one.
+        """
+        if self.blockserver_cache is None:
+            return self._read_blockserver_payloads(pvs)
+        return self.blockserver_cache.get_payloads(
+            pvs,
+            self._read_blockserver_payloads,
+            ChannelAccessUtils.BLOCKSERVER_PAYLOAD_PVS,
+        )
 
     def get_version_string(self) -> str:
         """
@@ -125,3 +479,52 @@ class ChannelAccessUtils(object):
         :return: a compressed and hex encoded string representing the version.
         """
         return self.get_value("CS:VERSION:SVN:REV")
+
+    def get_checked_server_pvs_digest(self) -> str:
+        """
+        Gets a digest of the values of the server PVs that the configuration checks depend on, so that a change to
+        any of them can be detected without keeping the values themselves. The blockserver payloads are taken from
+        the blockserver cache if there is one, so they are read and decoded once for both the digest and the checks.
+        :return: a hex encoded SHA-256 digest.
+        """
+        pv_values = self._get_blockserver_payloads(
+            ChannelAccessUtils.BLOCKSERVER_PAYLOAD_PVS
+        )
+        pv_values["CS:VERSION:SVN:REV"] = self.get_version_string()
+        return ChannelAccessUtils.get_server_pvs_digest(pv_values)
+
+    @staticmethod
+    def get_server_pvs_digest(pv_values: dict[str, Any]) -> str:
+        """
+        Gets a digest of the values of the server PVs that the configuration checks depend on.
+        :param pv_values: The value of each of the checked server PVs, with blockserver payloads decoded into the
+            names the checks use, or None for those that are unavailable
+        :return: a hex encoded SHA-256 digest.
+        """
+        digest = hashlib.sha256()
+        for pv in ChannelAccessUtils.CHECKED_SERVER_PVS:
+            # Decoded IOC names are a view of dictionary keys, so are written out as a list.
+            value = json.dumps(pv_values[pv], default=list)
+            digest.update(f"{pv}={value}\n".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def get_live_instruments(
+        instruments: list, timeout: float = LIVENESS_PROBE_TIMEOUT
+    ) -> set:
+        """
+        Probes the heartbeat PV of every instrument concurrently to find which instruments are up.
+        :param instruments: Dictionaries representing the properties of instruments as per the CS:INSTLIST PV
+        :param timeout: The time to wait for each instrument's heartbeat PV, in seconds
+        :return: The names of the instruments whose heartbeat PV answered
+        """
+        heartbeat_pvs = {
+            instrument["name"]: "{}{}".format(
+                instrument["pvPrefix"], ChannelAccessUtils.HEARTBEAT_PV
+            )
+            for instrument in instruments
+        }
+        pv_values = ChannelAccessUtils().get_values(
+            list(heartbeat_pvs.values()), timeout
+        )
+        return {name for name, pv in heartbeat_pvs.items() if pv_values[pv] is not None}
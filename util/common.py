@@ -1,50 +1,48 @@
 import functools
 import itertools
-import os
 import unittest
-from builtins import object, range
+from builtins import range
 
-from tests.settings import Settings
+from util.config_source import FileSystemConfigSource
 
 
-class CommonUtils(object):
+class CommonUtils:
     """
     Class containing utility methods common to several other utilities
     """
 
     MOTOR_IOCS = [
-        "{}_{:02d}".format(p, i)
-        for p, i in itertools.product(["GALIL", "MCLENNAN", "LINMOT", "SM300"], range(1, 11))
+        f"{p}_{i:02d}"
+        for p, i in itertools.product(
+            ["GALIL", "MCLENNAN", "LINMOT", "SM300"], range(1, 11)
+        )
     ]
 
     @staticmethod
-    def get_directory_contents_as_list(path):
-        if os.path.isdir(path):
-            return os.listdir(path)
-        else:
-            raise IOError("Path '{}' is not a directory.".format(path))
+    def get_directory_contents_as_list(path, source=None):
+        source = source if source is not None else FileSystemConfigSource(path)
+        return source.list_dir(path)
 
     @staticmethod
-    def get_folders_in_directory_as_list(path):
-        if os.path.isdir(path):
-            return [d for d in os.listdir(path) if os.path.isdir(os.path.join(path, d))]
-        else:
-            raise IOError("Path '{}' is not a directory.".format(path))
+    def get_folders_in_directory_as_list(path, source=None):
+        source = source if source is not None else FileSystemConfigSource(path)
+        return source.list_folders(path)
 
     @staticmethod
-    def count_files_with_name(path, name):
+    def count_files_with_name(path, name, source=None):
         """
         Scans the given directory for files with a given name. Returns the number of these files that were found.
+        :param source: The config source to read the directory from, the working tree on disk if not given
         :return:
         """
-        if not os.path.isdir(path):
-            raise IOError("Path '{}' is not a directory.".format(path))
-        return sum(len([f for f in files if f == name]) for _, _, files in os.walk(path))
+        source = source if source is not None else FileSystemConfigSource(path)
+        return source.count_files_with_name(path, name)
 
 
 def skip_on_instruments(instruments_to_skip, skip_reason):
     """
-    Decorator to skip a given test on the provided list of instruments
+    Decorator to skip a given test on the provided list of instruments. The test case must have the context of
+    the instrument being checked.
 
     Usage:
 
@@ -55,12 +53,34 @@ def skip_on_instruments(instruments_to_skip, skip_reason):
 
     def _decorator(func):
         @functools.wraps(func)
-        def _wrapper(*args, **kwargs):
-            if Settings.name in instruments_to_skip:
+        def _wrapper(self, *args, **kwargs):
+            if self.context.name in instruments_to_skip:
                 raise unittest.SkipTest(skip_reason)
             else:
-                return func(*args, **kwargs)
+                return func(self, *args, **kwargs)
 
         return _wrapper
 
     return _decorator
+
+
+def skip_if_instrument_offline(func):
+    """
+    Decorator to skip a test that reads PVs from the instrument when the instrument did not answer the liveness
+    probe at the start of the run. The test case must have the context of the instrument being checked, so this
+    can also decorate setUp to skip every test of a test case.
+
+    Usage:
+
+    @skip_if_instrument_offline
+    def test_xyz(self):
+        ...
+    """
+
+    @functools.wraps(func)
+    def _wrapper(self, *args, **kwargs):
+        if not self.context.online:
+            raise unittest.SkipTest(f"Instrument {self.context.name} is offline")
+        return func(self, *args, **kwargs)
+
+    return _wrapper
@@ -0,0 +1,159 @@
+import concurrent.futures
+import io
+import sys
+import threading
+import time
+import unittest
+from typing import Any
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    Stands in for sys.stdout or sys.stderr while tests run on worker threads, sending what each thread writes to
+    that thread's own buffer, or to the original stream if the thread has none.
+    """
+
+    def __init__(self, stream) -> None:
+        """
+        :param stream: The stream to write to from threads that are not capturing their output
+        """
+        self.stream = stream
+        self._local = threading.local()
+
+    def start_capture(self) -> None:
+        self._local.buffer = io.StringIO()
+
+    def stop_capture(self) -> str:
+        """
+        :return: Everything written by this thread since it started capturing
+        """
+        buffer = self._local.buffer
+        self._local.buffer = None
+        return buffer.getvalue()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self) -> None:
+        if getattr(self._local, "buffer", None) is None:
+            self.stream.flush()
+
+
+class _RecordingResult(unittest.TestResult):
+    """
+    Records every call a test case makes on its result, so that the outcome of a test run on a worker thread can be
+    reported later on the thread that owns the real result.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.events: list[tuple[str, tuple]] = []
+        self.duration = 0.0
+        self.stdout = ""
+        self.stderr = ""
+
+    def startTest(self, test):
+        self.events.append(("startTest", (test,)))
+
+    def stopTest(self, test):
+        self.events.append(("stopTest", (test,)))
+
+    def addSuccess(self, test):
+        self.events.append(("addSuccess", (test,)))
+
+    def addFailure(self, test, err):
+        self.events.append(("addFailure", (test, err)))
+
+    def addError(self, test, err):
+        self.events.append(("addError", (test, err)))
+
+    def addSkip(self, test, reason):
+        self.events.append(("addSkip", (test, reason)))
+
+    def addSubTest(self, test, subtest, err):
+        self.events.append(("addSubTest", (test, subtest, err)))
+
+    def addExpectedFailure(self, test, err):
+        self.events.append(("addExpectedFailure", (test, err)))
+
+    def addUnexpectedSuccess(self, test):
+        self.events.append(("addUnexpectedSuccess", (test,)))
+
+    def replay(self, result: Any) -> None:
+        """
+        Reports the recorded outcome to another result, as if the test had just been run against it. Output the test
+        wrote is written again once the test has started, so a result that captures output captures it as usual.
+
+        XMLTestRunner times each test from startTest to stopTest, so its start time is moved back by the time the
+        test took on its worker thread.
+        """
+        for name, args in self.events:
+            getattr(result, name)(*args)
+            if name == "startTest":
+                if hasattr(result, "start_time"):
+                    result.start_time = time.time() - self.duration
+                sys.stdout.write(self.stdout)
+                sys.stderr.write(self.stderr)
+
+
+class ConcurrentTestSuite(unittest.TestSuite):
+    """
+    A suite of independent test cases that are run on a pool of threads. Outcomes are reported to the result in the
+    order the tests were added once they have all run, so reports are the same as if the tests had been run one
+    after another.
+
+    The tests must only read shared state, or share it through thread-safe caches. Class and module fixtures such as
+    setUpClass are not run, so the tests must not rely on them.
+    """
+
+    def __init__(self, tests=(), threads: int = 1) -> None:
+        """
+        :param tests: The test cases to run
+        :param threads: The number of threads to run tests on. With one thread, tests are run as an ordinary suite.
+        """
+        super().__init__(tests)
+        self.threads = threads
+
+    @staticmethod
+    def _run_test(
+        test: unittest.TestCase, stdout: _ThreadOutput, stderr: _ThreadOutput
+    ):
+        recording = _RecordingResult()
+        stdout.start_capture()
+        stderr.start_capture()
+        start = time.time()
+        try:
+            test.run(recording)
+        finally:
+            recording.duration = time.time() - start
+            recording.stdout = stdout.stop_capture()
+            recording.stderr = stderr.stop_capture()
+        return recording
+
+    def run(self, result, debug=False):
+        if debug or self.threads <= 1:
+            return super().run(result, debug)
+
+        stdout, stderr = _ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr)
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.threads
+            ) as executor:
+                recordings = list(
+                    executor.map(
+                        lambda test: self._run_test(test, stdout, stderr), list(self)
+                    )
+                )
+        finally:
+            sys.stdout, sys.stderr = stdout.stream, stderr.stream
+
+        for recording in recordings:
+            if result.shouldStop:
+                break
+            recording.replay(result)
+        return result
@@ -0,0 +1,151 @@
+import io
+import os
+from typing import BinaryIO
+
+from util.git_wrapper import GitObjectReader
+from util.validation_cache import get_blob_sha
+
+
+class FileSystemConfigSource:
+    """
+    Reads files from a configurations repository working tree on disk.
+
+    All paths passed to a config source are full paths inside the repository, as built by the utility classes with
+    os.path.join, so utilities work the same regardless of where the files are actually read from.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: The path of the repository working tree
+        """
+        self.root = root
+
+    def read(self, path: str) -> str:
+        with open(path) as f:
+            return f.read()
+
+    def read_bytes(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def open_binary(self, path: str) -> BinaryIO:
+        """
+        Opens a file for streaming, so it can be processed without holding all of its contents in memory.
+        """
+        return open(path, "rb")
+
+    def get_blob_sha(self, path: str) -> str:
+        return get_blob_sha(self.read_bytes(path))
+
+    def get_file_id(self, path: str) -> str:
+        """
+        Gets an identifier which changes whenever the contents of a file change, without reading the file.
+        """
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def is_dir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def is_file(self, path: str) -> bool:
+        return os.path.isfile(path)
+
+    def list_dir(self, path: str) -> list[str]:
+        if not self.is_dir(path):
+            raise OSError(f"Path '{path}' is not a directory.")
+        return os.listdir(path)
+
+    def list_folders(self, path: str) -> list[str]:
+        return [d for d in self.list_dir(path) if os.path.isdir(os.path.join(path, d))]
+
+    def count_files_with_name(self, path: str, name: str) -> int:
+        if not self.is_dir(path):
+            raise OSError(f"Path '{path}' is not a directory.")
+        return sum(
+            len([f for f in files if f == name]) for _, _, files in os.walk(path)
+        )
+
+
+class GitConfigSource:
+    """
+    Reads files for one revision of a configurations repository straight from the git object database.
+
+    Nothing is checked out, so any instrument branch can be read without resetting or cleaning the working tree.
+    Reads hold the lock of the object reader, so the source may be shared between threads.
+    """
+
+    def __init__(self, reader: GitObjectReader, revision: str) -> None:
+        """
+        :param reader: The object reader for the repository
+        :param revision: The branch, tag or commit to read files from
+        """
+        self.root = reader.path
+        self.reader = reader
+        self.revision = reader.resolve(revision)
+
+    def _get_object(self, path: str):
+        relative_path = os.path.relpath(path, self.root)
+        if relative_path == os.curdir:
+            relative_path = ""
+        elif relative_path.startswith(os.pardir):
+            return None
+        return self.reader.get_object(self.revision, relative_path.replace(os.sep, "/"))
+
+    def _get_blob(self, path: str):
+        blob = self._get_object(path)
+        if blob is None or blob.type != "blob":
+            raise OSError(f"No file '{path}' at revision {self.revision}.")
+        return blob
+
+    def _get_tree(self, path: str):
+        tree = self._get_object(path)
+        if tree is None or tree.type != "tree":
+            raise OSError(f"Path '{path}' is not a directory.")
+        return tree
+
+    def read(self, path: str) -> str:
+        return self.read_bytes(path).decode("utf-8").replace("\r\n", "\n")
+
+    def read_bytes(self, path: str) -> bytes:
+        with self.reader.lock:
+            return self.reader.read_blob(self._get_blob(path))
+
+    def open_binary(self, path: str) -> BinaryIO:
+        return io.BytesIO(self.read_bytes(path))
+
+    def get_blob_sha(self, path: str) -> str:
+        return self._get_blob(path).hexsha
+
+    def get_file_id(self, path: str) -> str:
+        return self.get_blob_sha(path)
+
+    def is_dir(self, path: str) -> bool:
+        tree = self._get_object(path)
+        return tree is not None and tree.type == "tree"
+
+    def is_file(self, path: str) -> bool:
+        blob = self._get_object(path)
+        return blob is not None and blob.type == "blob"
+
+    def list_dir(self, path: str) -> list[str]:
+        with self.reader.lock:
+            return [
+                item.name
+                for item in self._get_tree(path)
+                if item.type in ("tree", "blob")
+            ]
+
+    def list_folders(self, path: str) -> list[str]:
+        with self.reader.lock:
+            return [item.name for item in self._get_tree(path).trees]
+
+    def count_files_with_name(self, path: str, name: str) -> int:
+        with self.reader.lock:
+            return sum(
+                1
+                for item in self._get_tree(path).traverse()
+                if item.type == "blob" and item.name == name
+            )
+
+
+ConfigSource = FileSystemConfigSource | GitConfigSource
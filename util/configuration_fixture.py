@@ -0,0 +1,151 @@
+from util.config_source import ConfigSource, FileSystemConfigSource
+from util.configurations import (
+    AbstractConfigurationUtils,
+    ComponentUtils,
+    ConfigurationModel,
+    ConfigurationUtils,
+)
+from util.globals import GlobalsUtils
+from util.validation_cache import get_blob_sha
+from util.xml_cache import LruCache
+
+
+class GlobalsIndex:
+    """
+    The macros set in an instrument's globals.txt, read once and looked up by IOC however many checks need them.
+    """
+
+    def __init__(self, globals_utils: GlobalsUtils) -> None:
+        self.globals_utils = globals_utils
+        self._memo = LruCache()
+
+    def get_lines(self) -> list[str]:
+        return self._memo.get("lines", self.globals_utils.get_lines)
+
+    def get_macros(self, ioc_name: str) -> dict:
+        """
+        Gets the macros associated with an IOC, as GlobalsUtils.get_macros does but without reading the file again.
+        :param ioc_name: Name of the IOC to search for
+        :return: A dictionary of macros (keys) and values
+        """
+
+        def find_macros():
+            macros = {}
+            for line in self.get_lines():
+                if line.startswith(ioc_name):
+                    key, value = line.replace(f"{ioc_name}__", "").split("=")
+                    macros[key] = value
+            return macros
+
+        return dict(self._memo.get(("macros", ioc_name), find_macros))
+
+
+class ConfigurationFixture:
+    """
+    What the checks of one configuration or component read from the repository: its directory listing, the git
+    blob SHAs of its files and its parsed model. Each is read the first time a check needs it and shared by every
+    other check of the same configuration, so running more checks does not list its directory or parse its files
+    again. The contents of files are not kept, so memory use does not grow with the size of the configuration.
+
+    The configurations repository must not change while the fixture is in use.
+    """
+
+    def __init__(
+        self,
+        utils: AbstractConfigurationUtils,
+        name: str,
+        fixtures: "InstrumentFixtures",
+    ) -> None:
+        """
+        :param utils: The utilities for the kind of directory the configuration is in
+        :param name: The name of the configuration or component
+        :param fixtures: The fixtures of the instrument, which give the components and globals of the configuration
+        """
+        self.utils = utils
+        self.name = name
+        self.fixtures = fixtures
+        self.directory = utils.get_config_directory(name)
+        self._memo = LruCache()
+
+    @property
+    def globals_index(self) -> GlobalsIndex:
+        return self.fixtures.globals_index
+
+    def directory_exists(self) -> bool:
+        return self._memo.get(
+            "exists", lambda: self.utils.config_directory_exists(self.name)
+        )
+
+    def get_files(self) -> list[str]:
+        """
+        :return: the names of all files in the configuration's directory
+        """
+        return list(
+            self._memo.get("files", lambda: self.utils.get_config_files(self.name))
+        )
+
+    def get_file_bytes(self, filename: str) -> bytes:
+        """
+        Reads a file in the configuration's directory. The contents are read each time, since checks only need them
+        when their outcome for the file's blob SHA is not already known.
+        """
+        return self.utils.get_config_file_bytes(self.name, filename)
+
+    def get_file_blob_sha(self, filename: str) -> str:
+        """
+        Gets the git blob SHA of a file in the configuration's directory. A working tree has no blob SHAs to look
+        up, so the SHA is computed from the file's contents, which are then dropped.
+        """
+
+        def compute():
+            if isinstance(self.utils.source, FileSystemConfigSource):
+                return get_blob_sha(self.get_file_bytes(filename))
+            return self.utils.get_config_file_blob_sha(self.name, filename)
+
+        return self._memo.get(("blob_sha", filename), compute)
+
+    def get_model(self) -> ConfigurationModel:
+        """
+        :return: the model of the configuration, which is shared so must not be modified
+        """
+        return self._memo.get("model", lambda: self.utils.get_model(self.name))
+
+    def get_models_with_components(self) -> list[ConfigurationModel]:
+        """
+        :return: the model of the configuration followed by the models of each of its active components
+        """
+        return [self.get_model()] + [
+            self.fixtures.get_component(component).get_model()
+            for component in self.get_model().components
+        ]
+
+
+class InstrumentFixtures:
+    """
+    The fixtures of the configurations and components of one instrument, each created the first time a check asks
+    for it, and the index of its globals.txt.
+    """
+
+    def __init__(
+        self, config_repo_path: str, source: ConfigSource | None = None
+    ) -> None:
+        """
+        :param config_repo_path: The path of the configurations repository
+        :param source: The config source to read files from, the working tree on disk if not given
+        """
+        self.config_utils = ConfigurationUtils(config_repo_path, source)
+        self.component_utils = ComponentUtils(config_repo_path, source)
+        self.globals_index = GlobalsIndex(GlobalsUtils(config_repo_path, source))
+        self._memo = LruCache()
+
+    def get_configuration(self, name: str) -> ConfigurationFixture:
+        return self._memo.get(
+            ("configuration", name),
+            lambda: ConfigurationFixture(self.config_utils, name, self),
+        )
+
+    def get_component(self, name: str) -> ConfigurationFixture:
+        return self._memo.get(
+            ("component", name),
+            lambda: ConfigurationFixture(self.component_utils, name, self),
+        )
@@ -1,21 +1,303 @@
-from __future__ import absolute_import
-
+import io
 import os
 import re
 import xml.etree.ElementTree as ET
-from builtins import object
-
-from tests.settings import Settings
+from collections import Counter
+from collections.abc import Iterable, Iterator
 
 from .common import CommonUtils
+from .config_source import FileSystemConfigSource
+from .xml_cache import LruCache, ParsedXmlCache, as_xml_root
+
+# The errors raised when a configuration file can not be read or parsed, or an entry in it is missing the name of the
+# IOC or component it defines (KeyError).
+CONFIGURATION_READ_ERRORS = (ET.ParseError, OSError, KeyError)
+
+
+class BlockRecord:
+    """
+    A block defined in a blocks.xml file.
+    """
+
+    __slots__ = ("local", "name", "read_pv")
+
+    def __init__(
+        self, name: str | None, read_pv: str | None, local: bool | None
+    ) -> None:
+        self.name = name
+        self.read_pv = read_pv
+        self.local = local
+
+    @staticmethod
+    def from_element(block: ET.Element) -> "BlockRecord":
+        """
+        Makes the record of a block element. The name or local flag of a block missing that element is None.
+        """
+        name = block.find(f"{AbstractConfigurationUtils.BLOCK_XML_SCHEMA}name")
+        read_pv = block.find(f"{AbstractConfigurationUtils.BLOCK_XML_SCHEMA}read_pv")
+        local = block.find(f"{AbstractConfigurationUtils.BLOCK_XML_SCHEMA}local")
+        return BlockRecord(
+            None if name is None else name.text,
+            None if read_pv is None else read_pv.text,
+            None if local is None else local.text == "True",
+        )
 
 
-class AbstractConfigurationUtils(object):
+def iter_block_records(stream) -> Iterator[BlockRecord]:
+    """
+    Reads the blocks from a blocks.xml file without building its whole tree. Each block element is discarded as soon
+    as its record has been made, so memory use does not grow with the number of blocks.
+    :param stream: The blocks.xml file, opened in binary mode
+    :return: An iterator over the records of the blocks, in the order they are defined
+    """
+    block_tag = f"{AbstractConfigurationUtils.BLOCK_XML_SCHEMA}block"
+    root = None
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = element
+        elif event == "end" and element.tag == block_tag:
+            yield BlockRecord.from_element(element)
+            # Blocks are children of the root, so clearing the root drops every block read so far.
+            root.clear()
+
+
+class IocRecord:
+    """
+    An IOC defined in an iocs.xml file, with its macros indexed by name.
+    """
+
+    __slots__ = ("macros", "name", "simlevel")
+
+    def __init__(self, name: str, simlevel: str | None, macros: dict[str, str]) -> None:
+        self.name = name
+        self.simlevel = simlevel
+        self.macros = macros
+
+    @property
+    def in_sim_mode(self) -> bool:
+        """
+        :return: Whether the IOC has a simlevel other than none. An IOC without a simlevel is reported as a
+            malformed entry of its configuration instead.
+        """
+        return self.simlevel is not None and self.simlevel != "none"
+
+
+class ConfigurationModel:
+    """
+    The blocks, IOCs and components of one configuration or component, read in a single pass over its blocks.xml,
+    iocs.xml and components.xml and indexed by name.
+
+    If one of the files can not be read or parsed, the error is kept and raised again whenever something from that
+    file is looked up, so checks which need the file fail the same way they would when reading it directly. Entries
+    missing something they must define, such as a block without a local element, are kept in the model as far as
+    they can be and listed in its malformed entries, so they are reported once rather than by every check.
+
+    Models are shared by every configuration that includes the same component, so aggregates such as the counts of
+    IOC and block names are computed the first time they are needed and kept on the model.
+    """
+
+    FILES = ("blocks.xml", "iocs.xml", "components.xml")
+
+    __slots__ = (
+        "_block_counts",
+        "_blocks",
+        "_blocks_by_name",
+        "_components",
+        "_errors",
+        "_ioc_counts",
+        "_iocs",
+        "_iocs_by_name",
+        "_malformed_entries",
+        "_upper_block_counts",
+        "name",
+    )
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._blocks: list[BlockRecord] = []
+        self._blocks_by_name: dict[str, BlockRecord] = {}
+        self._iocs: list[IocRecord] = []
+        self._iocs_by_name: dict[str, IocRecord] = {}
+        self._components: list[str] = []
+        self._errors: dict[str, Exception] = {}
+        self._malformed_entries: list[str] = []
+        self._ioc_counts: Counter[str] | None = None
+        self._block_counts: Counter[str] | None = None
+        self._upper_block_counts: Counter[str] | None = None
+
+    @staticmethod
+    def from_roots(name: str, load_root, load_blocks=None) -> "ConfigurationModel":
+        """
+        Builds the model of a configuration or component.
+        :param name: The name of the configuration or component
+        :param load_root: Called with the name of a file in the configuration's directory, returns its root element
+        :param load_blocks: Called with no arguments, returns an iterable of the BlockRecords in blocks.xml. If not
+            given, the blocks are read from the root element of blocks.xml.
+        :return: The model
+        """
+        if load_blocks is None:
+
+            def load_blocks():
+                root = load_root("blocks.xml")
+                return [
+                    BlockRecord.from_element(block)
+                    for block in root.iter(
+                        f"{AbstractConfigurationUtils.BLOCK_XML_SCHEMA}block"
+                    )
+                ]
+
+        model = ConfigurationModel(name)
+        for filename, add in zip(
+            ConfigurationModel.FILES,
+            [
+                lambda: model._add_blocks(load_blocks()),
+                lambda: model._add_iocs(load_root("iocs.xml")),
+                lambda: model._add_components(load_root("components.xml")),
+            ],
+        ):
+            try:
+                add()
+            except CONFIGURATION_READ_ERRORS as e:
+                model._errors[filename] = e
+        return model
+
+    def _add_blocks(self, records: Iterable[BlockRecord]) -> None:
+        for record in records:
+            if record.name is None:
+                self._malformed_entries.append(
+                    "A block in blocks.xml has no name element"
+                )
+                continue
+            if record.local is None:
+                self._malformed_entries.append(
+                    f"Block {record.name} in blocks.xml has no local element"
+                )
+            self._blocks.append(record)
+            self._blocks_by_name.setdefault(record.name, record)
+
+    def _add_iocs(self, root) -> None:
+        for ioc in root.iter(f"{AbstractConfigurationUtils.IOC_XML_SCHEMA}ioc"):
+            if "simlevel" not in ioc.attrib:
+                self._malformed_entries.append(
+                    "IOC {} in iocs.xml has no simlevel attribute".format(
+                        ioc.attrib["name"]
+                    )
+                )
+            record = IocRecord(
+                ioc.attrib["name"],
+                ioc.attrib.get("simlevel"),
+                {
+                    m.attrib["name"]: m.attrib["value"]
+                    for m in ioc.iter(
+                        f"{AbstractConfigurationUtils.IOC_XML_SCHEMA}macro"
+                    )
+                },
+            )
+            self._iocs.append(record)
+            self._iocs_by_name.setdefault(record.name, record)
+
+    def _add_components(self, root) -> None:
+        self._components = [
+            component.attrib["name"]
+            for component in root.iter(
+                f"{AbstractConfigurationUtils.COMPONENT_XML_SCHEMA}component"
+            )
+        ]
+
+    def _check_readable(self, filename: str) -> None:
+        if filename in self._errors:
+            raise self._errors[filename]
+
+    @property
+    def blocks(self) -> list[BlockRecord]:
+        self._check_readable("blocks.xml")
+        return self._blocks
+
+    @property
+    def block_names(self) -> list[str]:
+        return [block.name for block in self.blocks]
+
+    def get_block(self, name: str) -> BlockRecord | None:
+        self._check_readable("blocks.xml")
+        return self._blocks_by_name.get(name)
+
+    @property
+    def iocs(self) -> list[IocRecord]:
+        self._check_readable("iocs.xml")
+        return self._iocs
+
+    @property
+    def ioc_names(self) -> list[str]:
+        return [ioc.name for ioc in self.iocs]
+
+    def get_ioc(self, name: str) -> IocRecord | None:
+        self._check_readable("iocs.xml")
+        return self._iocs_by_name.get(name)
+
+    def get_ioc_macros(self, name: str) -> dict[str, str]:
+        """
+        :param name: The name of the IOC
+        :return: The macros of the IOC, keyed by macro name, or an empty dictionary if the IOC is not defined
+        """
+        ioc = self.get_ioc(name)
+        return {} if ioc is None else ioc.macros
+
+    @property
+    def components(self) -> list[str]:
+        self._check_readable("components.xml")
+        return self._components
+
+    @property
+    def malformed_entries(self) -> list[str]:
+        """
+        :return: A description of each entry in the files that could be read which is missing something it must
+            define
+        """
+        return self._malformed_entries
+
+    @property
+    def ioc_counts(self) -> Counter[str]:
+        """
+        :return: The number of times each IOC name is defined
+        """
+        if self._ioc_counts is None:
+            self._ioc_counts = Counter(self.ioc_names)
+        return self._ioc_counts
+
+    @property
+    def block_counts(self) -> Counter[str]:
+        """
+        :return: The number of times each block name is defined
+        """
+        if self._block_counts is None:
+            self._block_counts = Counter(self.block_names)
+        return self._block_counts
+
+    @property
+    def upper_block_counts(self) -> Counter[str]:
+        """
+        :return: The number of times each block name is defined, ignoring case
+        """
+        if self._upper_block_counts is None:
+            upper_block_counts: Counter[str] = Counter()
+            for name, count in self.block_counts.items():
+                upper_block_counts[name.upper()] += count
+            self._upper_block_counts = upper_block_counts
+        return self._upper_block_counts
+
+
+class AbstractConfigurationUtils:
     """
     Class containing utility methods common to both configuration and component directories.
     """
 
-    REQUIRED_CONFIG_FILES = ["blocks.xml", "components.xml", "groups.xml", "iocs.xml", "meta.xml"]
+    REQUIRED_CONFIG_FILES = [
+        "blocks.xml",
+        "components.xml",
+        "groups.xml",
+        "iocs.xml",
+        "meta.xml",
+    ]
     BLOCK_GW_PVLIST = "gwblock.pvlist"
     ALLOWED_CONFIG_FILES = REQUIRED_CONFIG_FILES + [
         "screens.xml",
@@ -29,18 +311,161 @@ class AbstractConfigurationUtils(object):
     BLOCK_XML_SCHEMA = "{http://epics.isis.rl.ac.uk/schema/blocks/1.0}"
     DEVICES_XML_SCHEMA = "{http://epics.isis.rl.ac.uk/schema/screens/1.0/}"
 
-    def __init__(self, config_repo_path):
+    # Shared by all instances so that each file is parsed once however many tests read it.
+    PARSED_XML_CACHE = ParsedXmlCache()
+    MODEL_CACHE = LruCache()
+
+    def __init__(self, config_repo_path, source=None):
+        """
+        :param config_repo_path: The path of the configurations repository
+        :param source: The config source to read files from, the working tree on disk if not given
+        """
         self.config_repo_path = config_repo_path
+        self.source = (
+            source if source is not None else FileSystemConfigSource(config_repo_path)
+        )
 
     def get_configurations_directory(self):
-        raise NotImplementedError("This is an abstract class, use a concrete class instead")
+        raise NotImplementedError(
+            "This is an abstract class, use a concrete class instead"
+        )
 
     def get_configurations_as_list(self):
         """
         Gets a list of all configurations/components of the current instrument.
         :return: a list of strings.
         """
-        return CommonUtils.get_folders_in_directory_as_list(self.get_configurations_directory())
+        return CommonUtils.get_folders_in_directory_as_list(
+            self.get_configurations_directory(), self.source
+        )
+
+    def get_config_directory(self, config_name):
+        """
+        Gets the path of the directory for a particular configuration/component.
+        :param config_name: the configuration name
+        :return: the path as a string
+        """
+        return os.path.join(self.get_configurations_directory(), config_name)
+
+    def config_directory_exists(self, config_name):
+        return self.source.is_dir(self.get_config_directory(config_name))
+
+    def get_config_files(self, config_name):
+        """
+        Gets the names of all files in the directory of a particular configuration/component.
+        :param config_name: the configuration name
+        :return: a list of file names
+        """
+        return CommonUtils.get_directory_contents_as_list(
+            self.get_config_directory(config_name), self.source
+        )
+
+    def get_config_file_bytes(self, config_name, filename):
+        """
+        Gets the raw contents of a file in the directory of a particular configuration/component.
+        :param config_name: the configuration name
+        :param filename: the name of the file
+        :return: the contents of the file as bytes
+        """
+        return self.source.read_bytes(
+            os.path.join(self.get_config_directory(config_name), filename)
+        )
+
+    def get_config_file_blob_sha(self, config_name, filename):
+        """
+        Gets the git blob SHA of a file in the directory of a particular configuration/component, which identifies
+        its contents.
+        :param config_name: the configuration name
+        :param filename: the name of the file
+        :return: the SHA as a hex string
+        """
+        return self.source.get_blob_sha(
+            os.path.join(self.get_config_directory(config_name), filename)
+        )
+
+    def get_config_file_root(self, config_name, filename):
+        """
+        Gets the parsed XML of a file in the directory of a particular configuration/component. Each version of a
+        file is only parsed once, and the returned tree is shared so must not be modified.
+        :param config_name: the configuration name
+        :param filename: the name of the file
+        :return: the root element
+        """
+        path = os.path.join(self.get_config_directory(config_name), filename)
+        return AbstractConfigurationUtils.PARSED_XML_CACHE.get_root(
+            path, self.source.get_file_id(path), lambda: self.source.read_bytes(path)
+        )
+
+    def get_components_root(self, config_name):
+        return self.get_config_file_root(config_name, "components.xml")
+
+    def iter_block_records(self, config_name):
+        """
+        Streams the blocks of a particular configuration/component from its blocks.xml without building its tree.
+        :param config_name: the configuration name
+        :return: an iterator over the BlockRecords
+        """
+        with self.source.open_binary(
+            os.path.join(self.get_config_directory(config_name), "blocks.xml")
+        ) as stream:
+            yield from iter_block_records(stream)
+
+    def get_blocks_root(self, config_name):
+        return self.get_config_file_root(config_name, "blocks.xml")
+
+    def get_iocs_root(self, config_name):
+        return self.get_config_file_root(config_name, "iocs.xml")
+
+    def get_model(self, config_name):
+        """
+        Gets the model of the blocks, IOCs and components of a particular configuration/component. Each version of a
+        configuration is only read once, and the returned model is shared so must not be modified.
+        :param config_name: the configuration name
+        :return: the ConfigurationModel
+        """
+        config_directory = self.get_config_directory(config_name)
+        file_ids = []
+        for filename in ConfigurationModel.FILES:
+            try:
+                file_ids.append(
+                    self.source.get_file_id(os.path.join(config_directory, filename))
+                )
+            except OSError:
+                file_ids.append(None)
+
+        return AbstractConfigurationUtils.MODEL_CACHE.get(
+            (config_directory, tuple(file_ids)),
+            lambda: ConfigurationModel.from_roots(
+                config_name,
+                lambda filename: self.get_config_file_root(config_name, filename),
+                lambda: self.iter_block_records(config_name),
+            ),
+        )
+
+    def get_models_with_components(self, config_name, component_utils):
+        """
+        Gets the model of a configuration followed by the models of each of its active components.
+        :param config_name: the configuration name
+        :param component_utils: the utilities to read the components with
+        :return: a list of ConfigurationModel
+        """
+        model = self.get_model(config_name)
+        return [model] + [
+            component_utils.get_model(component) for component in model.components
+        ]
+
+    @staticmethod
+    def merge_counts(models, get_counts):
+        """
+        Adds up the counts precomputed by several models.
+        :param models: the ConfigurationModels to merge
+        :param get_counts: called with each model, returns the counts to add
+        :return: the merged Counter
+        """
+        merged = Counter()
+        for model in models:
+            merged.update(get_counts(model))
+        return merged
 
     def get_active_components_as_list(self, config_name):
         """
@@ -48,7 +473,7 @@ class AbstractConfigurationUtils(object):
         :param config_name: the configuration name
         :return: a list of components
         """
-        return self.get_active_components_from_xml(self.get_components_xml(config_name))
+        return list(self.get_model(config_name).components)
 
     def get_components_xml(self, config_name):
         """
@@ -56,45 +481,52 @@ class AbstractConfigurationUtils(object):
         :param config_name: the configuration name
         :return: the XML as a string
         """
-        path = os.path.join(self.get_configurations_directory(), config_name, "components.xml")
-        with open(path) as xml_file:
-            return xml_file.read()
+        path = os.path.join(self.get_config_directory(config_name), "components.xml")
+        return self.source.read(path)
 
     def get_active_components_from_xml(self, xml):
         """
         Gets a list of active components from a component XML.
-        :param xml: a components XML as a string
+        :param xml: a components XML as a string, or its root element
         :return: a list of components
         """
-        root = ET.fromstring(xml)
+        root = as_xml_root(xml)
 
         components = []
-        for component in root.iter("{}component".format(self.COMPONENT_XML_SCHEMA)):
+        for component in root.iter(f"{self.COMPONENT_XML_SCHEMA}component"):
             components.append(component.attrib["name"])
 
         return components
 
-    def get_set_of_block_pvs_for_all_configs(self):
+    def get_set_of_block_pvs_for_all_configs(self, pv_prefix=""):
         """
         Gets a set of all pvs that have a block on them in any configuration or component of the instrument.
+        :param pv_prefix: The PV prefix of the instrument, added to the PVs of local blocks
         :return: A set of strings representing the names of the pvs.
         """
         block_pvs_set = {
             block_pv
             for config in self.get_configurations_as_list()
-            for block_pv in self.get_block_pvs(config)
+            for block_pv in self.get_block_pvs(config, pv_prefix)
         }
 
         return block_pvs_set
 
-    def get_block_pvs(self, config_name):
+    def get_block_pvs(self, config_name, pv_prefix=""):
         """
         Gets list of PVs that have a block on them for a particular configuration or component.
         :param config_name: Name of configuration or component.
+        :param pv_prefix: The PV prefix of the instrument, added to the PVs of local blocks
         :return: list of PVs that have a block on them.
         """
 
-        return self.get_block_pvs_from_xml(Settings.pv_prefix, self.get_blocks_xml(config_name))
+        block_pvs = []
+        for block in self.get_model(config_name).blocks:
+            pv_name = AbstractConfigurationUtils._get_pv_name_without_field(
+                block.read_pv
+            )
+            block_pvs.append(pv_prefix + pv_name if block.local else pv_name)
+        return block_pvs
 
     def get_blocks_xml(self, config_name):
         """
@@ -102,31 +534,35 @@ class AbstractConfigurationUtils(object):
         :param config_name: the configuration name
         :return: the XML containing the blocks as a string
         """
-        path = os.path.join(self.get_configurations_directory(), config_name, "blocks.xml")
-
-        with open(path) as xml_file:
-            return xml_file.read()
+        path = os.path.join(self.get_config_directory(config_name), "blocks.xml")
+        return self.source.read(path)
 
     def get_block_pvs_from_xml(self, pv_prefix, block_xml):
         """
         Gets a list of all PVs which a have block on them in a certain component or configuration.
         :param pv_prefix: A string representing the instrument prefix of the PV. If the PV is local, then this prefix
         will be ignored.
-        :param block_xml: A string representing the XML block data of a component or configuration.
+        :param block_xml: A string representing the XML block data of a component or configuration, or its root
+        element.
         :return: A list of the names of all PVs which have a block on them. The names of the PV include the instrument
         prefix.
         """
-        root = ET.fromstring(block_xml)
-        pvs_with_blocks = []
-
-        for block in root.iter("{}block".format(self.BLOCK_XML_SCHEMA)):
-            pv_name = block.find("{}read_pv".format(self.BLOCK_XML_SCHEMA)).text
-            pv_name = AbstractConfigurationUtils._get_pv_name_without_field(pv_name)
-
-            if block.find("{}local".format(self.BLOCK_XML_SCHEMA)).text == "True":
-                pv_name = pv_prefix + pv_name
+        if isinstance(block_xml, ET.Element):
+            blocks = (
+                BlockRecord.from_element(block)
+                for block in block_xml.iter(f"{self.BLOCK_XML_SCHEMA}block")
+            )
+        else:
+            if isinstance(block_xml, str):
+                block_xml = block_xml.encode("utf-8")
+            blocks = iter_block_records(io.BytesIO(block_xml))
 
-            pvs_with_blocks.append(pv_name)
+        pvs_with_blocks = []
+        for block in blocks:
+            pv_name = AbstractConfigurationUtils._get_pv_name_without_field(
+                block.read_pv
+            )
+            pvs_with_blocks.append(pv_prefix + pv_name if block.local else pv_name)
 
         return pvs_with_blocks
 
@@ -136,13 +572,7 @@ class AbstractConfigurationUtils(object):
         :param config_name: the configuration name
         :return: The list of block names.
         """
-        root = ET.fromstring(self.get_blocks_xml(config_name))
-
-        blocks = []
-        for block in root.iter("{}block".format(self.BLOCK_XML_SCHEMA)):
-            blocks.append(block.find("{}name".format(self.BLOCK_XML_SCHEMA)).text)
-
-        return blocks
+        return self.get_model(config_name).block_names
 
     @staticmethod
     def _get_pv_name_without_field(pv_name):
@@ -158,7 +588,9 @@ class AbstractConfigurationUtils(object):
             return pv_name
 
     def get_devices_directory(self):
-        raise NotImplementedError("This is an abstract class, use a concrete class instead")
+        raise NotImplementedError(
+            "This is an abstract class, use a concrete class instead"
+        )
 
     def get_device_screens_from_xml(self):
         """
@@ -166,8 +598,7 @@ class AbstractConfigurationUtils(object):
         Returns: the XML as a string
         """
         path = os.path.join(self.get_devices_directory(), "screens.xml")
-        with open(path) as xml_file:
-            return xml_file.read()
+        return self.source.read(path)
 
     def get_device_screens(self, xml):
         """
@@ -176,9 +607,11 @@ class AbstractConfigurationUtils(object):
         Returns:
             (set): Set of device screens
         """
-        root = ET.fromstring(xml)
+        root = as_xml_root(xml)
 
-        return set({device.find(f"{self.DEVICES_XML_SCHEMA}key").text for device in root})
+        return set(
+            {device.find(f"{self.DEVICES_XML_SCHEMA}key").text for device in root}
+        )
 
     def get_iocs_xml(self, config_name):
         """
@@ -186,19 +619,18 @@ class AbstractConfigurationUtils(object):
         :param config_name: the configuration or component name
         :return: the XML as a string
         """
-        path = os.path.join(self.get_configurations_directory(), config_name, "iocs.xml")
-        with open(path) as xml_file:
-            return xml_file.read()
+        path = os.path.join(self.get_config_directory(config_name), "iocs.xml")
+        return self.source.read(path)
 
     def get_iocs(self, xml):
         """
         Returns a list of iocs in the xml provided.
         :return:
         """
-        root = ET.fromstring(xml)
+        root = as_xml_root(xml)
 
         iocs = []
-        for ioc in root.iter("{}ioc".format(self.IOC_XML_SCHEMA)):
+        for ioc in root.iter(f"{self.IOC_XML_SCHEMA}ioc"):
             iocs.append(ioc.attrib["name"])
 
         return iocs
@@ -207,16 +639,16 @@ class AbstractConfigurationUtils(object):
         """
         Returns a dictionary of macro information for a given ioc_name in the given xml.
 
-        :param xml: The IOC xml.
+        :param xml: The IOC xml, or its root element.
         :param ioc_name: The name of the ioc.
         :return: A dictionary of macro information. Keys are the macro name, values are the macro value
         """
         # Parse the XML
-        root = ET.fromstring(xml)
+        root = as_xml_root(xml)
 
         ioc_xml = tuple(
             ioc
-            for ioc in root.iter("{}ioc".format(self.IOC_XML_SCHEMA))
+            for ioc in root.iter(f"{self.IOC_XML_SCHEMA}ioc")
             if ioc.attrib["name"] == ioc_name
         )
 
@@ -226,24 +658,45 @@ class AbstractConfigurationUtils(object):
         else:
             return {
                 m.attrib["name"]: m.attrib["value"]
-                for m in ioc_xml[0].iter("{}macro".format(self.IOC_XML_SCHEMA))
+                for m in ioc_xml[0].iter(f"{self.IOC_XML_SCHEMA}macro")
             }
 
     def get_ioc_in_sim_mode(self, xml, ioc_name):
         """
         Returns true if the given ioc_name is in simulation mode
-        :param xml: The IOC xml.
+        :param xml: The IOC xml, or its root element.
         :param ioc_name: The name of the ioc.
         :return: True if in simulation mode, otherwise false.
         """
         # Parse the XML
-        root = ET.fromstring(xml)
+        root = as_xml_root(xml)
 
         # check the simulation mode for the given ioc
-        for ioc in root.iter("{}ioc".format(self.IOC_XML_SCHEMA)):
+        for ioc in root.iter(f"{self.IOC_XML_SCHEMA}ioc"):
             if ioc.attrib["name"] == ioc_name:
                 return ioc.attrib["simlevel"] != "none"
 
+    def get_motor_iocs_with_partial_settings(self, model):
+        """
+        Returns the motor IOCs in the given configuration which define only one of a controller number and a comms
+        setting. Both or neither must be defined.
+        :param model: The ConfigurationModel of the configuration or component.
+        :return: A list of IOC names.
+        """
+        motor_iocs = []
+        for motor_ioc in CommonUtils.MOTOR_IOCS:
+            defined_macros = model.get_ioc_macros(motor_ioc)
+
+            controller_number_defined = "MTRCTRL" in defined_macros
+            comms_macro_defined = any(
+                m in defined_macros for m in ["PORT", "GALILADDR"]
+            )
+
+            if controller_number_defined != comms_macro_defined:
+                motor_iocs.append(motor_ioc)
+
+        return motor_iocs
+
     @staticmethod
     def check_if_macros_match_pattern(macros, regex, search_for_value):
         """
@@ -0,0 +1,43 @@
+from collections.abc import Mapping
+
+
+class DuplicateDetector:
+    """
+    Finds names that are defined more than once across several configurations or components, recording where each
+    definition came from.
+
+    Each source is added once with the number of times it defines each name, so detection takes time linear in the
+    number of names. For case-insensitive detection, add counts whose names are already case-folded.
+    """
+
+    def __init__(self) -> None:
+        self._origins: dict[str, list[str]] = {}
+
+    def add(self, counts: Mapping[str, int], origin: str) -> None:
+        """
+        Adds the names defined by a source.
+        :param counts: The number of times the source defines each name
+        :param origin: A description of the source, e.g. "component _base"
+        """
+        for name, count in counts.items():
+            self._origins.setdefault(name, []).extend([origin] * count)
+
+    def get_duplicates(self) -> dict[str, list[str]]:
+        """
+        :return: The names defined more than once, mapped to the origin of each of their definitions
+        """
+        return {
+            name: origins for name, origins in self._origins.items() if len(origins) > 1
+        }
+
+    @staticmethod
+    def format_duplicates(duplicates: dict[str, list[str]]) -> str:
+        """
+        Describes duplicates for a test failure message.
+        :param duplicates: Duplicates as returned by get_duplicates
+        :return: The names and origins of the duplicates, e.g. "S2VG (configuration A, component B)"
+        """
+        return ", ".join(
+            "{} ({})".format(name, ", ".join(origins))
+            for name, origins in sorted(duplicates.items())
+        )
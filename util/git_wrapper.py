@@ -1,11 +1,13 @@
-from __future__ import print_function
-
-from builtins import object
+import os
+import shutil
+import threading
 
 import git
 
+from util.xml_cache import LruCache
+
 
-class GitUtils(object):
+class GitUtils:
     """
     Wrapper around the git library to provide a few useful high-level operations.
     """
@@ -34,25 +36,151 @@ class GitUtils(object):
             repo.git.reset("HEAD", hard=True)
             repo.git.clean(f=True, d=True, x=True)
             if is_tag:
-                repo.git.checkout("tags/{}".format(name), force=True)
+                repo.git.checkout(f"tags/{name}", force=True)
             else:
-                repo.git.checkout("origin/{}".format(name), force=True)
+                repo.git.checkout(f"origin/{name}", force=True)
         except (git.GitCommandError, git.InvalidGitRepositoryError) as e:
-            print("Git command failed. Error was: {}".format(e))
+            print(f"Git command failed. Error was: {e}")
             return False
         return True
 
-    def update_branch(self, branch: str, is_tag: bool = False) -> bool:
+    def update_branch(
+        self, branch: str, is_tag: bool = False, fetch: bool = True
+    ) -> bool:
+        """
+        Fetches from all remotes and then force checks out the given branch/tag.
+
+        :param branch: The name of the branch/tag to check out
+        :param is_tag: if we are checking out to a tag or a branch
+        :param fetch: whether to fetch before checking out. Callers which have already fetched this repository
+            (for example from the main process before starting parallel workers) can skip the fetch.
+        :return: True if successful, False otherwise
+        """
         try:
             repo = git.Repo(path=self.path)
-            repo.git.fetch(all=True)
+            if fetch:
+                repo.git.fetch(all=True)
             if not self.force_clean_checkout(branch, is_tag):
                 return False
         except (git.GitCommandError, git.InvalidGitRepositoryError) as e:
-            print("Git command failed. Error was: {}".format(e))
+            print(f"Git command failed. Error was: {e}")
             return False
         return True
 
+    def get_head_commit(self) -> str | None:
+        """
+        Gets the commit currently checked out in the repository.
+        :return: The SHA of the commit, or None if it could not be determined
+        """
+        try:
+            return git.Repo(
+                path=self.path, search_parent_directories=True
+            ).head.commit.hexsha
+        except (git.InvalidGitRepositoryError, git.NoSuchPathError, ValueError):
+            return None
+
     def fetch_all(self) -> None:
         repo = git.Repo(path=self.path)
         repo.git.fetch(all=True)
+
+    def add_worktree(self, worktree_path: str) -> None:
+        """
+        Creates a detached worktree of this repository at the given path, replacing any stale worktree
+        left behind at that path by a previous run.
+
+        Worktrees share the object database of this repository, so they are cheap to create and see
+        everything that has been fetched into it.
+
+        :param worktree_path: The path at which to create the worktree
+        """
+        repo = git.Repo(path=self.path)
+        if os.path.exists(worktree_path):
+            try:
+                repo.git.worktree("remove", "--force", worktree_path)
+            except git.GitCommandError:
+                shutil.rmtree(worktree_path, ignore_errors=True)
+        repo.git.worktree("prune")
+        repo.git.worktree("add", "--detach", worktree_path)
+
+    def remove_worktree(self, worktree_path: str) -> None:
+        """
+        Removes a worktree previously created with add_worktree.
+
+        :param worktree_path: The path of the worktree to remove
+        """
+        repo = git.Repo(path=self.path)
+        try:
+            repo.git.worktree("remove", "--force", worktree_path)
+        except git.GitCommandError as e:
+            print(f"Unable to remove worktree {worktree_path}. Error was: {e}")
+        repo.git.worktree("prune")
+
+
+class GitObjectReader:
+    """
+    Reads trees and blobs straight from the object database of a repository, without touching its working tree.
+
+    GitPython serves every object lookup made through one repository object from a single persistent
+    `git cat-file --batch` process, so one reader should be kept for the whole run rather than one per instrument.
+    The process can only serve one lookup at a time, so threads sharing a reader must hold its lock while reading
+    objects, including the entries of trees and the data of blobs. The most recently looked up objects are kept so
+    that checks of the same instrument do not look them up again.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: The path of the repository
+        """
+        self.path = path
+        self.repo = git.Repo(path=path)
+        self._objects = LruCache()
+        self.lock = threading.RLock()
+
+    def resolve(self, revision: str) -> str:
+        """
+        Resolves a branch, tag or commit to the SHA of a commit.
+        :param revision: The revision to resolve, for example origin/NDXDEMO
+        :return: The commit SHA
+        """
+        with self.lock:
+            return self.repo.commit(revision).hexsha
+
+    def get_object(self, commit_sha: str, path: str) -> git.Tree | git.Blob | None:
+        """
+        Looks up the tree or blob at a path in a commit.
+        :param commit_sha: The SHA of the commit, as returned by resolve
+        :param path: The path relative to the root of the repository using forward slashes, "" for the root
+        :return: The tree or blob, or None if nothing exists at that path
+        """
+
+        def look_up():
+            with self.lock:
+                tree = self.repo.commit(commit_sha).tree
+                if path == "":
+                    return tree
+                try:
+                    return tree / path
+                except KeyError:
+                    return None
+
+        return self._objects.get((commit_sha, path), look_up)
+
+    def get_changed_paths(self, old_commit_sha: str, new_commit_sha: str) -> set[str]:
+        """
+        Gets the paths of all files that were added, removed, changed or renamed between two commits.
+        :param old_commit_sha: The SHA of the older commit
+        :param new_commit_sha: The SHA of the newer commit
+        :return: The paths relative to the root of the repository using forward slashes. For renamed files both the
+            old and the new path are included.
+        """
+        changed_paths = set()
+        with self.lock:
+            for diff in self.repo.commit(old_commit_sha).diff(new_commit_sha):
+                changed_paths.update(
+                    path for path in (diff.a_path, diff.b_path) if path is not None
+                )
+        return changed_paths
+
+    @staticmethod
+    def read_blob(blob: git.Blob) -> bytes:
+        return blob.data_stream.read()
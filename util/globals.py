@@ -1,8 +1,8 @@
 import os
 import re
-from builtins import object
 
 from util.common import CommonUtils
+from util.config_source import ConfigSource, FileSystemConfigSource
 
 
 def strip_comments(line: str) -> str:
@@ -10,21 +10,28 @@ def strip_comments(line: str) -> str:
     return line.strip()
 
 
-class GlobalsUtils(object):
+class GlobalsUtils:
     """
     Class containing utility methods for interacting with globals.txt
     """
 
     GLOBALS_FILE = "globals.txt"
 
-    def __init__(self, config_repo_dir: str) -> None:
+    def __init__(
+        self, config_repo_dir: str, source: ConfigSource | None = None
+    ) -> None:
         self.config_repo_dir = config_repo_dir
+        self.source = (
+            source if source is not None else FileSystemConfigSource(config_repo_dir)
+        )
 
     def _get_file_path(self) -> str:
-        return os.path.join(self.config_repo_dir, "configurations", GlobalsUtils.GLOBALS_FILE)
+        return os.path.join(
+            self.config_repo_dir, "configurations", GlobalsUtils.GLOBALS_FILE
+        )
 
     def file_exists(self) -> bool:
-        return os.path.isfile(self._get_file_path())
+        return self.source.is_file(self._get_file_path())
 
     def get_number_of_globals_files(self) -> int:
         """
@@ -32,13 +39,14 @@ class GlobalsUtils(object):
         Returns the number of these files that were found.
         :return: the number of files named (GLOBALS_FILE)
         """
-        return CommonUtils.count_files_with_name(self.config_repo_dir, GlobalsUtils.GLOBALS_FILE)
+        return CommonUtils.count_files_with_name(
+            self.config_repo_dir, GlobalsUtils.GLOBALS_FILE, self.source
+        )
 
     def get_lines(self) -> list[str]:
         try:
-            globals_file = open(self._get_file_path(), "r")
-            return [i for i in globals_file.read().splitlines()]
-        except IOError:
+            return [i for i in self.source.read(self._get_file_path()).splitlines()]
+        except OSError:
             return []
 
     def get_macros(self, ioc_name: str) -> dict:
@@ -51,7 +59,7 @@ class GlobalsUtils(object):
         macros = dict()
         for line in lines:
             if line.startswith(ioc_name):
-                key, value = line.replace("{}__".format(ioc_name), "").split("=")
+                key, value = line.replace(f"{ioc_name}__", "").split("=")
                 macros[key] = value
         return macros
 
@@ -88,13 +96,11 @@ class GlobalsUtils(object):
 
         alphanumeric = r"[a-zA-Z0-9]+"
 
-        iocname_regex = r"{alphanumeric}(_?{alphanumeric})+".format(alphanumeric=alphanumeric)
+        iocname_regex = rf"{alphanumeric}(_?{alphanumeric})+"
         macro_regex = iocname_regex
         value_regex = r".*"
 
-        regexp = r"^({ioc}__)?{macro}={value}$".format(
-            ioc=iocname_regex, macro=macro_regex, value=value_regex
-        )
+        regexp = rf"^({iocname_regex}__)?{macro_regex}={value_regex}$"
 
         if line == "" or re.match(regexp, line):
             return True
@@ -1,26 +1,41 @@
+import json
 import os
 import xml.etree.ElementTree as ET
-from builtins import object
 
-from util.git_wrapper import GitUtils
+import git
+
+from util.git_wrapper import GitObjectReader, GitUtils
 from util.version import VersionUtils
 
 
-class GuiUtils(object):
+class GuiUtils:
     """
     Class containing utility methods for interacting with the gui repository.
     """
 
+    OPI_INFO_PATH = "base/uk.ac.stfc.isis.ibex.opis/resources/opi_info.xml"
+
     def __init__(self, path: str) -> None:
         self.git = GitUtils(path)
         self.path = path
 
-    def get_gui_repo_at_release(self, version_str: str) -> None:
-        version: list[int] = VersionUtils.extract_release_numbers_from_string(version_str)
-        branch_name: str = VersionUtils.convert_release_to_tag_name(*version)
-        if not self.git.update_branch(branch_name, True):
-            raise IOError(
-                "Couldn't check out GUI branch corresponding to release {}".format(version)
+    @staticmethod
+    def get_release_tag(version_str: str) -> str:
+        """
+        Gets the name of the GUI repository tag for a release.
+        :param version_str: The version of the release, for example 15.0.0
+        :return: The tag name, for example v15.0.0
+        """
+        version: list[int] = VersionUtils.extract_release_numbers_from_string(
+            version_str
+        )
+        return VersionUtils.convert_release_to_tag_name(*version)
+
+    def get_gui_repo_at_release(self, version_str: str, fetch: bool = True) -> None:
+        branch_name: str = self.get_release_tag(version_str)
+        if not self.git.update_branch(branch_name, True, fetch=fetch):
+            raise OSError(
+                f"Couldn't check out GUI branch corresponding to release {version_str}"
             )
 
     def get_valid_types(self, xml: str) -> list[str]:
@@ -52,9 +67,83 @@ class GuiUtils(object):
         return result
 
     def get_opi_info_xml(self) -> str:
-        with open(
-            os.path.join(
-                self.path, "base", "uk.ac.stfc.isis.ibex.opis", "resources", "opi_info.xml"
-            )
-        ) as f:
+        with open(os.path.join(self.path, *GuiUtils.OPI_INFO_PATH.split("/"))) as f:
             return f.read()
+
+
+class OpiInfoCache:
+    """
+    Persistent cache of the synoptic targets and types that each GUI release defines in its opi_info.xml.
+
+    On a miss, opi_info.xml is read straight from the release tag in the GUI repository's object database, so
+    nothing has to be checked out. The extracted targets and types are kept in memory for the rest of the run and,
+    if a cache folder is given, written to one JSON file per release tag so later runs skip the XML parse too.
+    """
+
+    def __init__(self, gui_repo_path: str, cache_path: str | None = None) -> None:
+        """
+        :param gui_repo_path: The path of the GUI repository
+        :param cache_path: The folder to keep cache files in, or None to only cache in memory
+        """
+        self.gui_repo_path = gui_repo_path
+        self.cache_path = cache_path
+        self._object_reader = None
+        self._releases: dict[str, tuple[set[str], set[str]]] = {}
+
+    def _get_cache_file(self, release_tag: str) -> str:
+        assert self.cache_path is not None
+        return os.path.join(self.cache_path, f"opi_info_{release_tag}.json")
+
+    def _load(self, release_tag: str) -> tuple[set[str], set[str]] | None:
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self._get_cache_file(release_tag)) as f:
+                contents = json.load(f)
+            return set(contents["targets"]), set(contents["types"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save(self, release_tag: str, targets: set[str], types: set[str]) -> None:
+        if self.cache_path is None:
+            return
+        os.makedirs(self.cache_path, exist_ok=True)
+        # Write to a file of our own and then rename it, so that parallel workers never read half a file.
+        cache_file = self._get_cache_file(release_tag)
+        temporary_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temporary_file, "w") as f:
+            json.dump({"targets": sorted(targets), "types": sorted(types)}, f)
+        os.replace(temporary_file, cache_file)
+
+    def _read_opi_info_xml(self, release_tag: str) -> str:
+        if self._object_reader is None:
+            self._object_reader = GitObjectReader(self.gui_repo_path)
+        try:
+            commit_sha = self._object_reader.resolve(f"refs/tags/{release_tag}")
+        except (git.BadName, ValueError) as e:
+            raise OSError(f"Couldn't find GUI release tag {release_tag}: {e}")
+        blob = self._object_reader.get_object(commit_sha, GuiUtils.OPI_INFO_PATH)
+        if blob is None or blob.type != "blob":
+            raise OSError(f"No opi_info.xml in GUI release {release_tag}")
+        return GitObjectReader.read_blob(blob).decode("utf-8")
+
+    def get_valid_targets_and_types(
+        self, release_tag: str
+    ) -> tuple[set[str], set[str]]:
+        """
+        Gets the synoptic targets and types that a GUI release knows about.
+        :param release_tag: The tag of the GUI release, for example v15.0.0
+        :return: A tuple of (valid targets, valid types)
+        """
+        if release_tag not in self._releases:
+            cached = self._load(release_tag)
+            if cached is None:
+                xml = self._read_opi_info_xml(release_tag)
+                gui_utils = GuiUtils(self.gui_repo_path)
+                cached = (
+                    set(gui_utils.get_valid_targets(xml)),
+                    set(gui_utils.get_valid_types(xml)),
+                )
+                self._save(release_tag, *cached)
+            self._releases[release_tag] = cached
+        return self._releases[release_tag]
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+
+from util.item_reports import get_report_suite_name
+
+
+class IncrementalState:
+    """
+    Records the inputs that each instrument was last checked successfully with, so that an incremental run can skip
+    instruments whose inputs have not changed since.
+
+    The inputs of an instrument are a dictionary of values that together determine the outcome of its checks, for
+    example the commit of its configurations branch and the GUI release it runs. The test reports of the last
+    successful run are kept alongside the state so that they can be replayed for skipped instruments.
+    """
+
+    STATE_FILE = "incremental_state.json"
+
+    def __init__(self, cache_path: str) -> None:
+        """
+        :param cache_path: The folder in which the state and the replayable reports are kept
+        """
+        self.cache_path = cache_path
+        self.state_file = os.path.join(cache_path, IncrementalState.STATE_FILE)
+        try:
+            with open(self.state_file) as f:
+                self._instruments: dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self._instruments = {}
+
+    def _get_reports_path(self, inst_name: str) -> str:
+        return os.path.join(self.cache_path, "reports", inst_name)
+
+    def get_inputs(self, inst_name: str) -> dict | None:
+        """
+        Gets the inputs that an instrument was last checked successfully with.
+        :param inst_name: The name of the instrument
+        :return: The inputs, or None if the instrument has not been checked successfully before
+        """
+        entry = self._instruments.get(inst_name)
+        return None if entry is None else entry["inputs"]
+
+    def get_results(self, inst_name: str) -> dict:
+        """
+        Gets the results recorded alongside the inputs of the last successful run of an instrument.
+        :param inst_name: The name of the instrument
+        :return: The results, empty if none were recorded
+        """
+        entry = self._instruments.get(inst_name)
+        return {} if entry is None else entry.get("results", {})
+
+    def is_unchanged(self, inst_name: str, inputs: dict) -> bool:
+        """
+        :param inst_name: The name of the instrument
+        :param inputs: The current inputs of the instrument
+        :return: True if the instrument was last checked successfully with exactly these inputs, False otherwise
+        """
+        return self.get_inputs(inst_name) == inputs
+
+    def get_previous_configs_commit(self, inst_name: str, inputs: dict) -> str | None:
+        """
+        Gets the configurations commit that an instrument last passed with, if that is the only one of its inputs
+        that has changed since. In that case only the items affected by the changes between the two commits need to
+        be checked again.
+        :param inst_name: The name of the instrument
+        :param inputs: The current inputs of the instrument
+        :return: The SHA of the previous commit, or None if the instrument must be checked in full
+        """
+        previous_inputs = self.get_inputs(inst_name)
+        if previous_inputs is None or previous_inputs.keys() != inputs.keys():
+            return None
+        other_inputs_unchanged = all(
+            previous_inputs[key] == inputs[key]
+            for key in inputs
+            if key != "configs_commit"
+        )
+        return previous_inputs["configs_commit"] if other_inputs_unchanged else None
+
+    def store_reports(
+        self,
+        inst_name: str,
+        report_files: list[str],
+        replaced_suites: set[str] | None = None,
+    ) -> None:
+        """
+        Keeps a copy of the test reports of a successful run, replacing those kept for an earlier run.
+        :param inst_name: The name of the instrument
+        :param report_files: The paths of the report files written by the run
+        :param replaced_suites: If the run only checked some items, the test suites of the items it checked. Their
+            earlier reports are dropped even if the run wrote none for them, for example because the item was
+            deleted. Earlier reports of other suites are kept unless the run wrote a report of the same suite. If
+            None, every earlier report is replaced.
+        """
+        reports_path = self._get_reports_path(inst_name)
+        if replaced_suites is None:
+            shutil.rmtree(reports_path, ignore_errors=True)
+        elif os.path.isdir(reports_path):
+            replaced_suites = set(replaced_suites).union(
+                get_report_suite_name(report_file) for report_file in report_files
+            )
+            for report_file in os.listdir(reports_path):
+                if get_report_suite_name(report_file) in replaced_suites:
+                    os.remove(os.path.join(reports_path, report_file))
+        os.makedirs(reports_path, exist_ok=True)
+        for report_file in report_files:
+            shutil.copy2(report_file, reports_path)
+
+    def replay_reports(self, inst_name: str, output_path: str) -> None:
+        """
+        Copies the test reports kept for the last successful run of an instrument into a reports folder.
+        :param inst_name: The name of the instrument
+        :param output_path: The folder to copy the reports to
+        """
+        reports_path = self._get_reports_path(inst_name)
+        if not os.path.isdir(reports_path):
+            return
+        os.makedirs(output_path, exist_ok=True)
+        for report_file in os.listdir(reports_path):
+            shutil.copy2(os.path.join(reports_path, report_file), output_path)
+
+    def record(
+        self, inst_name: str, inputs: dict | None, results: dict | None = None
+    ) -> None:
+        """
+        Records the outcome of checking an instrument.
+        :param inst_name: The name of the instrument
+        :param inputs: The inputs the instrument was checked successfully with, or None if the checks failed so the
+            instrument must be checked again next time
+        :param results: Any results of the run to replay alongside the reports when the instrument is skipped
+        """
+        if inputs is None:
+            self._instruments.pop(inst_name, None)
+        else:
+            self._instruments[inst_name] = {"inputs": inputs, "results": results or {}}
+
+    def save(self) -> None:
+        """
+        Writes the state to the cache folder.
+        """
+        os.makedirs(self.cache_path, exist_ok=True)
+        temporary_file = f"{self.state_file}.tmp"
+        with open(temporary_file, "w") as f:
+            json.dump(self._instruments, f, indent=2, sort_keys=True)
+        os.replace(temporary_file, self.state_file)
@@ -0,0 +1,53 @@
+import os
+import re
+
+from xmlrunner.result import _TestInfo, _XMLTestResult
+
+# XMLTestRunner names each report file after its test suite followed by the time of the run.
+_REPORT_FILE_PATTERN = re.compile(r"^TEST-(?P<suite>.*)-\d{14}\.xml$")
+
+
+def get_item_suite_name(test_class: type, item: str) -> str:
+    """
+    Gets the name of the test suite that the tests of one configuration, component or synoptic are reported in.
+    :param test_class: The class of the tests
+    :param item: The name of the configuration, component or synoptic
+    :return: The name of the suite
+    """
+    return f"{test_class.__module__}.{test_class.__name__}-{item}"
+
+
+def get_report_suite_name(report_file: str) -> str:
+    """
+    Gets the name of the test suite a report file was written for, without the time of the run.
+    :param report_file: The path of the report file
+    :return: The name of the suite, or the name of the file if it was not written by XMLTestRunner
+    """
+    file_name = os.path.basename(report_file)
+    match = _REPORT_FILE_PATTERN.match(file_name)
+    return file_name if match is None else match.group("suite")
+
+
+class _ItemTestInfo(_TestInfo):
+    """
+    The outcome of a test, grouped into a test suite of its own for each configuration, component or synoptic.
+    """
+
+    def __init__(self, test_result, test_method, *args, **kwargs):
+        super().__init__(test_result, test_method, *args, **kwargs)
+        get_item = getattr(test_method, "get_item", None)
+        item = None if get_item is None else get_item()
+        if item is not None:
+            self.test_name = get_item_suite_name(type(test_method), item)
+
+
+class ItemXMLTestResult(_XMLTestResult):
+    """
+    Writes the tests of each configuration, component and synoptic to a report of its own rather than one report per
+    test class, so that the reports of the items checked by an incremental run can replace those kept for the same
+    items. Test cases keep their class names, so they are listed in the same way.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("infoclass", _ItemTestInfo)
+        super().__init__(*args, **kwargs)
@@ -0,0 +1,207 @@
+import asyncio
+
+from util.channel_access import (
+    AsyncChannelAccess,
+    BreakerTrippedError,
+    ValueTimeoutError,
+)
+
+MAX_CONTROLLER = 16
+MAX_MOTOR = 8
+
+# Motor IOCs can be slow to answer while they are busy, so motor PVs are given longer than other PVs.
+MOTOR_READ_TIMEOUT = 30
+
+
+class MotorReadTimeoutError(Exception):
+    """
+    Raised when a PV of a motor axis times out, or is not read because the instrument's circuit breaker has tripped,
+    since the setting it holds could then not be checked.
+    """
+
+    def __init__(self, pv: str, breaker_tripped: bool = False) -> None:
+        if breaker_tripped:
+            message = (
+                f"Did not read motor PV {pv} because the instrument stopped responding"
+            )
+        else:
+            message = f"Timed out after {MOTOR_READ_TIMEOUT} s reading motor PV {pv}"
+        super().__init__(message)
+        self.pv = pv
+
+
+class MotorAxis:
+    """
+    The settings of a populated motor axis that the motor checks look at.
+    """
+
+    __slots__ = (
+        "controller_type",
+        "delay",
+        "mot_enc_sync_tol",
+        "name",
+        "read_errors",
+        "ueip",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        controller_type: str | None,
+        delay,
+        ueip,
+        mot_enc_sync_tol,
+        read_errors: dict[str, MotorReadTimeoutError] | None = None,
+    ) -> None:
+        """
+        :param name: The PV prefix of the axis, e.g. MOT:MTR0101
+        :param controller_type: The name of the IOC driving the axis, e.g. GALIL_01, or None if it timed out
+        :param delay: The motor record delay (.DLY), or None if unavailable
+        :param ueip: Whether the encoder is used (.UEIP), or None if unavailable
+        :param mot_enc_sync_tol: The motor-encoder sync tolerance, or None if unavailable
+        :param read_errors: The error of each of the above settings that timed out, by attribute name
+        """
+        self.name = name
+        self.controller_type = controller_type
+        self.delay = delay
+        self.ueip = ueip
+        self.mot_enc_sync_tol = mot_enc_sync_tol
+        self.read_errors = read_errors or {}
+
+    def get_read_errors(self, *settings: str) -> list[MotorReadTimeoutError]:
+        """
+        :param settings: The attribute names of the settings a check uses
+        :return: The errors of those settings that timed out, so the check could not be made
+        """
+        return [
+            self.read_errors[setting]
+            for setting in settings
+            if setting in self.read_errors
+        ]
+
+
+class MotorInventory:
+    """
+    The populated motor axes of an instrument, read in one scan so that every motor check can use them.
+
+    The first axis of each controller is read first, and the other axes of controllers without an IOC are never
+    read, so unpopulated controllers cost a single read each.
+
+    A setting of a populated axis that times out is recorded on the axis rather than failing the whole scan, so that
+    each check can report the axes it could not check. If the IOC name of the first axis of a controller times out,
+    the controller is reported through that axis alone.
+    """
+
+    def __init__(self, axes: list[MotorAxis]) -> None:
+        self.axes = axes
+
+    @staticmethod
+    def get_axis_name(controller: int, motor: int) -> str:
+        return f"MOT:MTR{controller:02d}{motor:02d}"
+
+    @staticmethod
+    async def _read(
+        ca: AsyncChannelAccess, pv: str, absent_if_unconnected: bool = False
+    ):
+        """
+        Reads a PV of a motor axis.
+        :param ca: The channel access client for the instrument
+        :param pv: The name of the PV, without the prefix
+        :param absent_if_unconnected: Whether a PV that never connects means the axis does not exist, in which case
+            None is returned rather than raising
+        :return: The value of the PV, or None if it was unavailable
+        :raises MotorReadTimeoutError: If the PV timed out
+        """
+        try:
+            return await ca.get_value(pv, MOTOR_READ_TIMEOUT, raise_timeout=True)
+        except ValueTimeoutError:
+            raise MotorReadTimeoutError(pv) from None
+        except BreakerTrippedError:
+            raise MotorReadTimeoutError(pv, breaker_tripped=True) from None
+        except TimeoutError:
+            if absent_if_unconnected:
+                return None
+            raise MotorReadTimeoutError(pv) from None
+
+    @staticmethod
+    async def _scan_axis(ca: AsyncChannelAccess, name: str) -> MotorAxis | None:
+        read_errors = {}
+
+        async def read_setting(
+            setting: str, pv: str, absent_if_unconnected: bool = False
+        ):
+            try:
+                return await MotorInventory._read(ca, pv, absent_if_unconnected)
+            except MotorReadTimeoutError as e:
+                read_errors[setting] = e
+                return None
+
+        # Only populated axes have an IOC name PV, so one that never connects is an axis that does not exist.
+        controller_type = await read_setting(
+            "controller_type", f"{name}_IOCNAME", absent_if_unconnected=True
+        )
+        if read_errors:
+            # Every check needs to know which IOC drives the axis, so its other settings are not read.
+            return MotorAxis(name, None, None, None, None, read_errors)
+        if not isinstance(controller_type, str):
+            return None
+        delay, ueip, mot_enc_sync_tol = await asyncio.gather(
+            read_setting("delay", f"{name}.DLY"),
+            read_setting("ueip", f"{name}.UEIP"),
+            read_setting("mot_enc_sync_tol", f"{name}_MOT_ENC_SYNC_TOL_SP"),
+        )
+        return MotorAxis(
+            name, controller_type, delay, ueip, mot_enc_sync_tol, read_errors
+        )
+
+    @staticmethod
+    async def _scan_controller(
+        ca: AsyncChannelAccess, controller: int
+    ) -> list[MotorAxis]:
+        first_axis = await MotorInventory._scan_axis(
+            ca, MotorInventory.get_axis_name(controller, 1)
+        )
+        if first_axis is None:
+            return []
+        if first_axis.controller_type is None:
+            return [first_axis]
+        other_axes = await asyncio.gather(
+            *(
+                MotorInventory._scan_axis(
+                    ca, MotorInventory.get_axis_name(controller, motor)
+                )
+                for motor in range(2, MAX_MOTOR + 1)
+            )
+        )
+        return [first_axis] + [axis for axis in other_axes if axis is not None]
+
+    @staticmethod
+    async def scan(ca: AsyncChannelAccess) -> "MotorInventory":
+        """
+        Reads the populated motor axes of an instrument, reading all controllers concurrently. Each PV is given
+        MOTOR_READ_TIMEOUT seconds to answer.
+        :param ca: The channel access client for the instrument
+        :return: The inventory
+        """
+        controllers = await asyncio.gather(
+            *(
+                MotorInventory._scan_controller(ca, controller)
+                for controller in range(1, MAX_CONTROLLER + 1)
+            )
+        )
+        return MotorInventory([axis for axes in controllers for axis in axes])
+
+    def get_axes_with_controller_type(
+        self, controller_type_prefix: str
+    ) -> list[MotorAxis]:
+        """
+        :param controller_type_prefix: The start of the IOC name, e.g. "GALIL_"
+        :return: The axes driven by an IOC whose name starts with the prefix, and the axes whose IOC name timed out
+            since they may be driven by one
+        """
+        return [
+            axis
+            for axis in self.axes
+            if axis.controller_type is None
+            or axis.controller_type.startswith(controller_type_prefix)
+        ]
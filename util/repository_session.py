@@ -0,0 +1,160 @@
+import concurrent.futures
+
+import git
+
+from util.config_source import GitConfigSource
+from util.git_wrapper import GitObjectReader, GitUtils
+from util.gui import GuiUtils, OpiInfoCache
+from util.version import VersionUtils
+
+
+class RepositorySession:
+    """
+    Run-scoped access to the configurations and GUI repositories.
+
+    Each repository is fetched at most once per session, so per-instrument operations only resolve refs that are
+    already local instead of fetching the same remotes again for every instrument.
+    """
+
+    def __init__(
+        self,
+        config_repo_path: str,
+        gui_repo_path: str | None,
+        fetched: bool = False,
+        cache_path: str | None = None,
+    ) -> None:
+        """
+        :param config_repo_path: The path of the configurations repository
+        :param gui_repo_path: The path of the GUI repository, or None if the GUI repository is not used
+        :param fetched: True if both repositories have already been fetched for this run, for example by the
+            main process before it created worktrees for parallel workers
+        :param cache_path: The folder in which to keep caches that persist between runs, or None to only cache
+            for the lifetime of this session
+        """
+        self.config_repo_path = config_repo_path
+        self.gui_repo_path = gui_repo_path
+        self.cache_path = cache_path
+        self._fetched = {config_repo_path, gui_repo_path} if fetched else set()
+        self._config_object_reader = None
+        self._opi_info_cache = None
+
+    def _ensure_fetched(self, path: str | None) -> bool:
+        """
+        Fetches all remotes of a repository unless that has already been done in this session.
+        :param path: The path of the repository
+        :return: True if the repository has been fetched, False otherwise
+        """
+        if path is None or path in self._fetched:
+            return True
+        try:
+            GitUtils(path).fetch_all()
+        except (git.GitCommandError, git.InvalidGitRepositoryError) as e:
+            print(f"Git fetch failed for {path}. Error was: {e}")
+            return False
+        self._fetched.add(path)
+        return True
+
+    def fetch_all(self) -> bool:
+        """
+        Fetches the configurations and GUI repositories concurrently.
+        :return: True if both repositories were fetched, False otherwise
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            return all(
+                executor.map(
+                    self._ensure_fetched, [self.config_repo_path, self.gui_repo_path]
+                )
+            )
+
+    @property
+    def config_object_reader(self) -> GitObjectReader:
+        """
+        The object reader for the configurations repository, shared by every instrument in the session so that
+        its git process is reused.
+        """
+        if self._config_object_reader is None:
+            self._config_object_reader = GitObjectReader(self.config_repo_path)
+        return self._config_object_reader
+
+    def checkout_config_branch(self, branch: str) -> bool:
+        """
+        Force checks out a branch of the configurations repository.
+        :param branch: The name of the branch
+        :return: True if successful, False otherwise
+        """
+        return self._ensure_fetched(self.config_repo_path) and GitUtils(
+            self.config_repo_path
+        ).update_branch(branch, fetch=False)
+
+    def get_config_branch_source(self, branch: str) -> GitConfigSource | None:
+        """
+        Gets a config source which reads a branch of the configurations repository from git objects.
+        :param branch: The name of the branch
+        :return: The config source, or None if the branch could not be read
+        """
+        if not self._ensure_fetched(self.config_repo_path):
+            return None
+        try:
+            return GitConfigSource(self.config_object_reader, f"origin/{branch}")
+        except (git.GitCommandError, git.InvalidGitRepositoryError, git.BadName) as e:
+            print(f"Git command failed. Error was: {e}")
+            return None
+
+    def get_config_branch_commit(self, branch: str) -> str | None:
+        """
+        Gets the commit a branch of the configurations repository points at, without checking it out.
+        :param branch: The name of the branch
+        :return: The SHA of the commit, or None if the branch could not be read
+        """
+        source = self.get_config_branch_source(branch)
+        return None if source is None else source.revision
+
+    def get_gui_release_tag(self, branch: str) -> str | None:
+        """
+        Looks up the GUI release tag an instrument uses from the config version file on its configurations branch,
+        reading it from git objects so that nothing has to be checked out.
+        :param branch: The name of the instrument's configurations branch
+        :return: The tag name, or None if the version could not be determined
+        """
+        source = self.get_config_branch_source(branch)
+        if source is None:
+            return None
+        version_utils = VersionUtils(self.config_repo_path, source)
+        if not version_utils.version_file_exists():
+            return None
+        try:
+            return GuiUtils.get_release_tag(version_utils.get_version())
+        except ValueError:
+            return None
+
+    @property
+    def opi_info_cache(self) -> OpiInfoCache:
+        """
+        The cache of synoptic targets and types for each GUI release, shared by every instrument in the session.
+        """
+        if self._opi_info_cache is None:
+            assert self.gui_repo_path is not None
+            self._opi_info_cache = OpiInfoCache(self.gui_repo_path, self.cache_path)
+        return self._opi_info_cache
+
+    def get_valid_synoptic_targets_and_types(
+        self, version_str: str
+    ) -> tuple[set[str], set[str]]:
+        """
+        Gets the synoptic targets and types defined by the GUI release an instrument runs, without checking out
+        the GUI repository.
+
+        The GUI repository is only fetched if the release is neither cached nor already known locally.
+
+        :param version_str: The version of the release, for example 15.0.0
+        :return: A tuple of (valid targets, valid types)
+        """
+        tag = GuiUtils.get_release_tag(version_str)
+        try:
+            return self.opi_info_cache.get_valid_targets_and_types(tag)
+        except OSError:
+            if self.gui_repo_path in self._fetched or not self._ensure_fetched(
+                self.gui_repo_path
+            ):
+                raise
+        return self.opi_info_cache.get_valid_targets_and_types(tag)
@@ -1,16 +1,22 @@
 import os
-from builtins import object
 
 import git
 
+from util.config_source import ConfigSource, FileSystemConfigSource
 
-class ScriptingUtils(object):
+
+class ScriptingUtils:
     """
     Class containing utility methods for interacting with the Python scripting directory
     """
 
-    def __init__(self, config_repo_path: str) -> None:
+    def __init__(
+        self, config_repo_path: str, source: ConfigSource | None = None
+    ) -> None:
         self.config_repo_path = config_repo_path
+        self.source = (
+            source if source is not None else FileSystemConfigSource(config_repo_path)
+        )
 
     def get_scripting_directory(self) -> str:
         """
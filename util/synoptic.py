@@ -1,45 +1,60 @@
-from __future__ import absolute_import
-
 import os
 import xml.etree.ElementTree as ET
-from builtins import object
 
 from .common import CommonUtils
+from .config_source import ConfigSource, FileSystemConfigSource
+from .configurations import AbstractConfigurationUtils
+from .xml_cache import as_xml_root
 
 
-class SynopticUtils(object):
+class SynopticUtils:
     """
     Utility methods for interacting with a synoptic.
     """
 
     SCHEMA = "{http://www.isis.stfc.ac.uk//instrument}"
 
-    def __init__(self, config_repo_path: str) -> None:
-        self.synoptics_path = os.path.join(config_repo_path, "configurations", "synoptics")
+    def __init__(
+        self, config_repo_path: str, source: ConfigSource | None = None
+    ) -> None:
+        self.synoptics_path = os.path.join(
+            config_repo_path, "configurations", "synoptics"
+        )
+        self.source = (
+            source if source is not None else FileSystemConfigSource(config_repo_path)
+        )
 
     def _prefix_schema(self, tag: str) -> str:
-        return "{schema}{tag}".format(schema=SynopticUtils.SCHEMA, tag=tag)
+        return f"{SynopticUtils.SCHEMA}{tag}"
 
     def get_synoptics_filenames(self) -> list[str]:
         return [
             f
-            for f in CommonUtils.get_directory_contents_as_list(self.synoptics_path)
+            for f in CommonUtils.get_directory_contents_as_list(
+                self.synoptics_path, self.source
+            )
             if f.endswith(".xml")
         ]
 
-    def get_type_target_pairs(self, synoptic_xml: str) -> list[tuple[str, str]]:
+    def get_type_target_pairs(
+        self, synoptic_xml: str | ET.Element
+    ) -> list[tuple[str, str]]:
         """
         Returns a set of type, target pairs used in this synoptic
-        :param synoptic_xml: the string version of the xml
+        :param synoptic_xml: the string version of the xml, or its root element
         """
 
-        root = ET.fromstring(synoptic_xml)
+        root = as_xml_root(synoptic_xml)
         result = []
 
         for component in root.iter(self._prefix_schema("component")):
-            type: ET.Element | None = component.find("./{}".format(self._prefix_schema("type")))
+            type: ET.Element | None = component.find(
+                "./{}".format(self._prefix_schema("type"))
+            )
             target: ET.Element | None = component.find(
-                "./{}/{}".format(self._prefix_schema("target"), self._prefix_schema("name"))
+                "./{}/{}".format(
+                    self._prefix_schema("target"), self._prefix_schema("name")
+                )
             )
 
             if target is None and type is not None:
@@ -51,28 +66,40 @@ class SynopticUtils(object):
             else:
                 message = "Couldn't find ./type or ./target/name in component.".format()
 
-                name = component.find("./{schema}name".format(schema=SynopticUtils.SCHEMA))
+                name = component.find(f"./{SynopticUtils.SCHEMA}name")
                 if name is not None:
-                    message += "\n Component name is: {}".format(name.text)
+                    message += f"\n Component name is: {name.text}"
                 else:
                     message += "\n Component name could not be extracted."
 
                 if type is not None:
-                    message += "\n Component type is: {}".format(type.text)
+                    message += f"\n Component type is: {type.text}"
                 else:
                     message += "\n Component type could not be extracted."
 
                 # Target name is already guaranteed not to be None
                 assert target is not None
-                message += "\n Component target name is: {}".format(target.text)
+                message += f"\n Component target name is: {target.text}"
 
                 raise ValueError(message)
 
         return result
 
     def get_xml(self, file_name: str) -> str:
-        with open(os.path.join(self.synoptics_path, file_name)) as f:
-            return f.read()
+        return self.source.read(os.path.join(self.synoptics_path, file_name))
+
+    def get_root(self, file_name: str) -> ET.Element:
+        """
+        Gets the parsed XML of a synoptic, shared with the configuration utilities' cache of parsed files so that
+        each version of a synoptic is only parsed once. The returned tree must not be modified.
+        """
+        path = os.path.join(self.synoptics_path, file_name)
+        return AbstractConfigurationUtils.PARSED_XML_CACHE.get_root(
+            path, self.source.get_file_id(path), lambda: self.source.read_bytes(path)
+        )
+
+    def get_blob_sha(self, file_name: str) -> str:
+        return self.source.get_blob_sha(os.path.join(self.synoptics_path, file_name))
 
     def type_should_be_ignored(self, type: str) -> bool:
         return type in ["UNKNOWN", "DAE", "BEAMSTOP"]
@@ -80,14 +107,16 @@ class SynopticUtils(object):
     def target_should_be_ignored(self, target: str) -> bool:
         return target == "NONE"
 
-    def get_pv_addresses(self, synoptic_xml: str) -> dict[str, str]:
+    def get_pv_addresses(self, synoptic_xml: str | ET.Element) -> dict[str, str]:
         pv_addresses = dict()
 
-        for pv in ET.fromstring(synoptic_xml).iter(self._prefix_schema("pv")):
+        for pv in as_xml_root(synoptic_xml).iter(self._prefix_schema("pv")):
             address_element: ET.Element | None = pv.find(self._prefix_schema("address"))
             assert address_element is not None
             address = address_element.text
-            name_element: ET.Element | None = pv.find(self._prefix_schema("displayname"))
+            name_element: ET.Element | None = pv.find(
+                self._prefix_schema("displayname")
+            )
             assert name_element is not None
             name = name_element.text
             pv_addresses[name] = address
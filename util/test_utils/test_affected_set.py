@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from util.affected_set import AffectedSet
+from util.configurations import ConfigurationUtils
+
+components_xml = """<?xml version="1.0" ?>
+             <components xmlns="http://epics.isis.rl.ac.uk/schema/components/1.0">
+                 {}
+             </components>
+      """
+
+
+class AffectedSetTests(unittest.TestCase):
+    def setUp(self):
+        self.repo_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_path, ignore_errors=True)
+
+        self._write_components("CONFIG_A", ["COMP_1"])
+        self._write_components("CONFIG_B", ["COMP_1", "COMP_2"])
+        self._write_components("CONFIG_C", [])
+        self.config_utils = ConfigurationUtils(self.repo_path)
+
+    def _write_components(self, config, components):
+        path = os.path.join(self.repo_path, "configurations", "configurations", config)
+        os.makedirs(path)
+        with open(os.path.join(path, "components.xml"), "w") as f:
+            f.write(
+                components_xml.format(
+                    "".join(f'<component name="{c}"/>' for c in components)
+                )
+            )
+
+    def test_GIVEN_a_changed_configuration_THEN_only_that_configuration_is_affected(
+        self,
+    ):
+        affected = AffectedSet.from_changed_paths(
+            {"configurations/configurations/CONFIG_C/blocks.xml"}, self.config_utils
+        )
+
+        self.assertSetEqual(affected.configurations, {"CONFIG_C"})
+        self.assertSetEqual(affected.components, set())
+        self.assertSetEqual(affected.synoptics, set())
+
+    def test_GIVEN_a_changed_component_THEN_configurations_that_include_it_are_affected(
+        self,
+    ):
+        affected = AffectedSet.from_changed_paths(
+            {"configurations/components/COMP_2/iocs.xml"}, self.config_utils
+        )
+
+        self.assertSetEqual(affected.configurations, {"CONFIG_B"})
+        self.assertSetEqual(affected.components, {"COMP_2"})
+
+    def test_GIVEN_a_changed_synoptic_THEN_only_that_synoptic_is_affected(self):
+        affected = AffectedSet.from_changed_paths(
+            {
+                "configurations/synoptics/beamline.xml",
+                "configurations/devices/screens.xml",
+            },
+            self.config_utils,
+        )
+
+        self.assertSetEqual(affected.configurations, set())
+        self.assertSetEqual(affected.components, set())
+        self.assertSetEqual(affected.synoptics, {"beamline.xml"})
+
+    def test_GIVEN_changed_globals_THEN_everything_is_affected(self):
+        self.assertIsNone(
+            AffectedSet.from_changed_paths(
+                {"configurations/globals.txt"}, self.config_utils
+            )
+        )
+
+    def test_GIVEN_a_configuration_without_components_xml_WHEN_a_component_changes_THEN_it_is_affected(
+        self,
+    ):
+        os.makedirs(
+            os.path.join(self.repo_path, "configurations", "configurations", "CONFIG_D")
+        )
+
+        affected = AffectedSet.from_changed_paths(
+            {"configurations/components/COMP_2/iocs.xml"}, self.config_utils
+        )
+
+        self.assertSetEqual(affected.configurations, {"CONFIG_B", "CONFIG_D"})
+
+    def test_GIVEN_a_configuration_with_unparseable_components_xml_WHEN_a_component_changes_THEN_it_is_affected(
+        self,
+    ):
+        path = os.path.join(
+            self.repo_path, "configurations", "configurations", "CONFIG_D"
+        )
+        os.makedirs(path)
+        with open(os.path.join(path, "components.xml"), "w") as f:
+            f.write("<components")
+
+        affected = AffectedSet.from_changed_paths(
+            {"configurations/components/COMP_2/iocs.xml"}, self.config_utils
+        )
+
+        self.assertSetEqual(affected.configurations, {"CONFIG_B", "CONFIG_D"})
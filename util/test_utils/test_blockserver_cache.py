@@ -0,0 +1,91 @@
+import binascii
+import unittest
+import zlib
+
+from util.blockserver_cache import BlockserverCache
+from util.channel_access import ChannelAccessUtils
+
+
+def compress_payload(text):
+    return binascii.hexlify(zlib.compress(text.encode("utf-8"))).decode("ascii")
+
+
+class BlockserverCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = BlockserverCache()
+        self.reads = []
+
+    def _read_payloads(self, pvs):
+        self.reads.append(pvs)
+        return {pv: pv.lower() for pv in pvs}
+
+    def test_GIVEN_empty_cache_WHEN_getting_payloads_THEN_read_together_with_prefetched_pvs(
+        self,
+    ):
+        payloads = self.cache.get_payloads(["A"], self._read_payloads, ["A", "B"])
+
+        self.assertDictEqual(payloads, {"A": "a"})
+        self.assertListEqual(self.reads, [["A", "B"]])
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+
+    def test_GIVEN_prefetched_pvs_WHEN_getting_them_THEN_not_read_again(self):
+        self.cache.get_payloads(["A"], self._read_payloads, ["A", "B"])
+
+        self.assertDictEqual(
+            self.cache.get_payloads(["A", "B"], self._read_payloads),
+            {"A": "a", "B": "b"},
+        )
+        self.assertEqual(len(self.reads), 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+
+    def test_GIVEN_unavailable_payload_WHEN_getting_it_again_THEN_not_read_again(self):
+        self.cache.get_payloads(["A"], lambda pvs: {pv: None for pv in pvs})
+
+        self.assertDictEqual(
+            self.cache.get_payloads(["A"], self._read_payloads), {"A": None}
+        )
+        self.assertListEqual(self.reads, [])
+
+    def test_GIVEN_preloaded_payloads_WHEN_getting_them_THEN_not_read(self):
+        self.cache.preload({"A": "preloaded"})
+
+        self.assertDictEqual(
+            self.cache.get_payloads(["A"], self._read_payloads), {"A": "preloaded"}
+        )
+        self.assertListEqual(self.reads, [])
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 0))
+
+    def test_GIVEN_no_lookups_WHEN_getting_hit_rate_THEN_zero(self):
+        self.assertEqual(self.cache.get_hit_rate(), 0.0)
+
+
+class ChannelAccessUtilsBlockserverCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.channel_access = ChannelAccessUtils(
+            "IN:DEMO:", blockserver_cache=BlockserverCache()
+        )
+        self.reads = []
+
+        def mock_get_values(pvs):
+            self.reads.append(pvs)
+            payloads = {
+                "CS:BLOCKSERVER:IOCS": '{"GALIL_01": {}, "INSTETC_01": {}}',
+                "CS:BLOCKSERVER:IOCS_NOT_TO_STOP": '["INSTETC_01"]',
+                "CS:BLOCKSERVER:PVS:INTEREST:HIGH": '[["IN:DEMO:PV_1", "ai", "", "GALIL_01"]]',
+            }
+            return {pv: compress_payload(payloads.get(pv, "[]")) for pv in pvs}
+
+        self.channel_access.get_values = mock_get_values
+
+    def test_GIVEN_iocs_read_WHEN_getting_interesting_pvs_THEN_all_payloads_read_once(
+        self,
+    ):
+        valid_iocs, protected_iocs = self.channel_access.get_valid_and_protected_iocs()
+        self.assertSetEqual(self.channel_access.get_interesting_pvs(), {"IN:DEMO:PV_1"})
+        self.assertSetEqual(self.channel_access.get_interesting_pvs(), {"IN:DEMO:PV_1"})
+
+        self.assertListEqual(list(valid_iocs), ["GALIL_01", "INSTETC_01"])
+        self.assertListEqual(protected_iocs, ["INSTETC_01"])
+        self.assertListEqual(
+            self.reads, [list(ChannelAccessUtils.BLOCKSERVER_PAYLOAD_PVS)]
+        )
@@ -0,0 +1,79 @@
+import binascii
+import json
+import unittest
+import zlib
+
+from util.blockserver_payload import (
+    iter_decompressed_text,
+    iter_json_array_items,
+    iter_json_object_keys,
+)
+
+
+def split_text(text, size):
+    return [text[start : start + size] for start in range(0, len(text), size)]
+
+
+class DecompressedTextTests(unittest.TestCase):
+    def test_GIVEN_payload_WHEN_decompressed_in_small_chunks_THEN_whole_text_returned(
+        self,
+    ):
+        text = json.dumps([[f"IN:DEMO:µ_{i}", "ai"] for i in range(1000)])
+        data = binascii.hexlify(zlib.compress(text.encode("utf-8"))).decode("ascii")
+
+        self.assertEqual("".join(iter_decompressed_text(data, chunk_size=16)), text)
+
+    def test_GIVEN_truncated_payload_WHEN_decompressed_THEN_error_raised(self):
+        data = binascii.hexlify(zlib.compress(b"[1, 2, 3]" * 100)).decode("ascii")
+
+        with self.assertRaises(zlib.error):
+            list(iter_decompressed_text(data[:-8]))
+
+
+class JsonStreamTests(unittest.TestCase):
+    ITEMS = [
+        ["IN:DEMO:PV_1", "ai", "A description, with a comma], [", "IOC_01"],
+        ["IN:DEMO:PV_2", "bo", "", "IOC_02"],
+        ["IN:DEMO:PV_3", "mbbi", 'Quote "]," in text', "IOC_03"],
+    ] * 50
+
+    def test_GIVEN_array_WHEN_read_in_chunks_of_any_size_THEN_all_items_returned(self):
+        text = json.dumps(self.ITEMS)
+        for size in [1, 7, 64, len(text)]:
+            with self.subTest(size=size):
+                self.assertListEqual(
+                    list(iter_json_array_items(split_text(text, size))), self.ITEMS
+                )
+
+    def test_GIVEN_array_of_numbers_split_inside_number_WHEN_read_THEN_numbers_whole(
+        self,
+    ):
+        self.assertListEqual(
+            list(iter_json_array_items(["[12", "34, 5", "6]"])), [1234, 56]
+        )
+
+    def test_GIVEN_empty_array_WHEN_read_THEN_no_items(self):
+        self.assertListEqual(list(iter_json_array_items([" [ ", " ] "])), [])
+
+    def test_GIVEN_object_WHEN_read_in_chunks_THEN_keys_returned_in_order(self):
+        document = {
+            f"IOC_{i}": {"running": False, "macros": [1, {"a": "}, "}]}
+            for i in range(100)
+        }
+        text = json.dumps(document)
+        for size in [1, 13, len(text)]:
+            with self.subTest(size=size):
+                self.assertListEqual(
+                    list(iter_json_object_keys(split_text(text, size))), list(document)
+                )
+
+    def test_GIVEN_empty_object_WHEN_read_THEN_no_keys(self):
+        self.assertListEqual(list(iter_json_object_keys(["{}"])), [])
+
+    def test_GIVEN_truncated_array_WHEN_read_THEN_error_raised(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array_items(split_text(json.dumps(self.ITEMS)[:-5], 10)))
+
+    def test_GIVEN_object_instead_of_array_WHEN_read_THEN_error_raised(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array_items(["{}"]))
@@ -0,0 +1,143 @@
+import unittest
+from unittest.mock import patch
+
+from genie_python.channel_access_exceptions import UnableToConnectToPVException
+
+from util.ca_breaker import ChannelAccessBreaker
+from util.channel_access import ChannelAccessUtils
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ChannelAccessBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = ChannelAccessBreaker("DEMO", 3, 10, self.clock)
+
+    def test_GIVEN_fewer_timeouts_than_limit_WHEN_recording_THEN_no_confirmation_requested(
+        self,
+    ):
+        self.assertFalse(self.breaker.record_timeout())
+        self.assertFalse(self.breaker.record_timeout())
+        self.assertTrue(self.breaker.allows_reads())
+
+    def test_GIVEN_response_between_timeouts_WHEN_recording_THEN_count_starts_again(
+        self,
+    ):
+        self.breaker.record_timeout()
+        self.breaker.record_timeout()
+        self.breaker.record_response()
+
+        self.assertFalse(self.breaker.record_timeout())
+
+    def test_GIVEN_limit_of_timeouts_WHEN_recording_THEN_confirmation_requested_once(
+        self,
+    ):
+        self.breaker.record_timeout()
+        self.breaker.record_timeout()
+
+        self.assertTrue(self.breaker.record_timeout())
+        self.assertFalse(self.breaker.record_timeout())
+
+    def test_GIVEN_confirmation_requested_WHEN_instrument_up_THEN_not_tripped(self):
+        for _ in range(3):
+            self.breaker.record_timeout()
+        self.breaker.confirm(True)
+
+        self.assertTrue(self.breaker.allows_reads())
+
+    def test_GIVEN_confirmation_requested_WHEN_instrument_down_THEN_tripped(self):
+        for _ in range(3):
+            self.breaker.record_timeout()
+        self.breaker.confirm(False)
+
+        self.assertFalse(self.breaker.allows_reads())
+
+    def test_GIVEN_overlapping_reads_WHEN_counting_time_spent_THEN_overlap_counted_once(
+        self,
+    ):
+        with self.breaker.reading():
+            self.clock.now = 2
+            with self.breaker.reading():
+                self.clock.now = 3
+            self.clock.now = 4
+        self.clock.now = 100
+
+        self.assertEqual(self.breaker.get_time_spent(), 4)
+        self.assertEqual(self.breaker.get_remaining_budget(), 6)
+
+    def test_GIVEN_remaining_budget_WHEN_getting_timeout_THEN_shortened_to_budget(self):
+        with self.breaker.reading():
+            self.clock.now = 8
+
+        self.assertEqual(self.breaker.get_timeout(5), 2)
+        self.assertEqual(self.breaker.get_timeout(1), 1)
+
+    def test_GIVEN_budget_run_out_WHEN_checking_reads_allowed_THEN_tripped(self):
+        with self.breaker.reading():
+            self.clock.now = 10
+
+        self.assertFalse(self.breaker.allows_reads())
+        self.assertTrue(self.breaker.tripped)
+
+    def test_GIVEN_no_budget_WHEN_getting_timeout_THEN_unchanged(self):
+        breaker = ChannelAccessBreaker("DEMO", 3, None, self.clock)
+        with breaker.reading():
+            self.clock.now = 1000
+
+        self.assertIsNone(breaker.get_remaining_budget())
+        self.assertEqual(breaker.get_timeout(5), 5)
+        self.assertTrue(breaker.allows_reads())
+
+
+class ChannelAccessUtilsBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.breaker = ChannelAccessBreaker("DEMO", 2, None)
+        self.channel_access = ChannelAccessUtils("IN:DEMO:", self.breaker)
+        self.reads = []
+
+    def _get_pv_value(self, up_pvs):
+        def get_pv_value(pv, timeout):
+            self.reads.append(pv)
+            if pv not in up_pvs:
+                raise UnableToConnectToPVException(pv, "timed out")
+            return "value"
+
+        return get_pv_value
+
+    def test_GIVEN_instrument_down_WHEN_reads_time_out_THEN_later_reads_not_attempted(
+        self,
+    ):
+        with patch(
+            "util.channel_access.CaChannelWrapper.get_pv_value",
+            side_effect=self._get_pv_value([]),
+        ):
+            for pv in ["A", "B", "C", "D"]:
+                self.assertIsNone(self.channel_access.get_value(pv))
+
+        self.assertListEqual(
+            self.reads,
+            ["IN:DEMO:A", "IN:DEMO:B", "IN:DEMO:" + ChannelAccessUtils.HEARTBEAT_PV],
+        )
+        self.assertTrue(self.breaker.tripped)
+
+    def test_GIVEN_instrument_up_WHEN_missing_pvs_time_out_THEN_later_reads_attempted(
+        self,
+    ):
+        with patch(
+            "util.channel_access.CaChannelWrapper.get_pv_value",
+            side_effect=self._get_pv_value(
+                ["IN:DEMO:D", "IN:DEMO:" + ChannelAccessUtils.HEARTBEAT_PV]
+            ),
+        ):
+            for pv in ["A", "B", "C"]:
+                self.assertIsNone(self.channel_access.get_value(pv))
+            self.assertEqual(self.channel_access.get_value("D"), "value")
+
+        self.assertFalse(self.breaker.tripped)
@@ -1,11 +1,33 @@
+import asyncio
+import binascii
+import threading
 import unittest
+import zlib
+from unittest.mock import patch
 
-from util.channel_access import ChannelAccessUtils, PvInterestingLevel
+from CaChannel import ca
+
+from util.blockserver_cache import BlockserverCache
+from util.ca_breaker import ChannelAccessBreaker
+from util.channel_access import (
+    AsyncChannelAccess,
+    BreakerTrippedError,
+    ChannelAccessUtils,
+    PvInterestingLevel,
+    ValueTimeoutError,
+)
+
+
+def compress_payload(text):
+    """
+    Encodes JSON text in the same way as the blockserver: zlib compressed, then hex encoded.
+    """
+    return binascii.hexlify(zlib.compress(text.encode("utf-8"))).decode("ascii")
 
 
 class ChannelAccessTests(unittest.TestCase):
     def setUp(self):
-        def mock_get_value(pv):
+        def get_payload(pv):
             if pv == "CS:BLOCKSERVER:PVS:INTEREST:HIGH":
                 return """[["IN:DEMO:PV_HIGH_INTEREST_1", "longin", "Current pump speed", "WM323_02"],\
                 ["IN:DEMO:PV_HIGH_INTEREST_2", "bi", "Pump running status", "WM323_02"]]"""
@@ -27,20 +49,22 @@ class ChannelAccessTests(unittest.TestCase):
                     "interesting level"
                 )
 
-        def mock_dehex_and_decompress(data):
-            return data
+        def mock_get_value(pv):
+            return compress_payload(get_payload(pv))
 
         self.channel_access = ChannelAccessUtils()
         self.channel_access.get_value = mock_get_value
-        self.channel_access._dehex_and_decompress = mock_dehex_and_decompress
 
-    def test_GIVEN_interesting_level_WHEN_disconnected_pv_THEN_empty_list_returned(self):
+    def test_GIVEN_interesting_level_WHEN_disconnected_pv_THEN_empty_list_returned(
+        self,
+    ):
         def mock_get_value_none(pv):
             return None
 
         self.channel_access.get_value = mock_get_value_none
         self.assertListEqual(
-            self.channel_access._get_pvs_by_interesting_level(PvInterestingLevel.HIGH), []
+            self.channel_access._get_pvs_by_interesting_level(PvInterestingLevel.HIGH),
+            [],
         )
 
     def test_GIVEN_interesting_level_WHEN_high_THEN_correct_high_pvs_returned(self):
@@ -51,7 +75,9 @@ class ChannelAccessTests(unittest.TestCase):
 
     def test_GIVEN_interesting_level_WHEN_medium_THEN_correct_medium_pvs_returned(self):
         self.assertListEqual(
-            self.channel_access._get_pvs_by_interesting_level(PvInterestingLevel.MEDIUM),
+            self.channel_access._get_pvs_by_interesting_level(
+                PvInterestingLevel.MEDIUM
+            ),
             ["IN:DEMO:PV_MEDIUM_INTEREST_1", "IN:DEMO:PV_MEDIUM_INTEREST_2"],
         )
 
@@ -61,8 +87,212 @@ class ChannelAccessTests(unittest.TestCase):
             ["IN:DEMO:PV_LOW_INTEREST_1", "IN:DEMO:PV_LOW_INTEREST_2"],
         )
 
-    def test_GIVEN_interesting_level_WHEN_facility_THEN_correct_facility_pvs_returned(self):
+    def test_GIVEN_interesting_level_WHEN_facility_THEN_correct_facility_pvs_returned(
+        self,
+    ):
         self.assertListEqual(
-            self.channel_access._get_pvs_by_interesting_level(PvInterestingLevel.FACILITY),
+            self.channel_access._get_pvs_by_interesting_level(
+                PvInterestingLevel.FACILITY
+            ),
             ["IN:DEMO:PV_FACILITY_1", "IN:DEMO:PV_FACILITY_2"],
         )
+
+    def test_GIVEN_all_interest_levels_WHEN_getting_interesting_pvs_THEN_pvs_of_every_level_returned(
+        self,
+    ):
+        def mock_get_values(pvs):
+            return {pv: self.channel_access.get_value(pv) for pv in pvs}
+
+        self.channel_access.get_values = mock_get_values
+        self.assertSetEqual(
+            self.channel_access.get_interesting_pvs(),
+            {
+                "IN:DEMO:PV_HIGH_INTEREST_1",
+                "IN:DEMO:PV_HIGH_INTEREST_2",
+                "IN:DEMO:PV_MEDIUM_INTEREST_1",
+                "IN:DEMO:PV_MEDIUM_INTEREST_2",
+                "IN:DEMO:PV_LOW_INTEREST_1",
+                "IN:DEMO:PV_LOW_INTEREST_2",
+                "IN:DEMO:PV_FACILITY_1",
+                "IN:DEMO:PV_FACILITY_2",
+            },
+        )
+
+    def test_GIVEN_no_pvs_WHEN_getting_values_THEN_empty_dictionary_returned(self):
+        self.assertDictEqual(ChannelAccessUtils().get_values([]), {})
+
+    def test_GIVEN_ioc_pvs_WHEN_getting_valid_and_protected_iocs_THEN_both_read_together(
+        self,
+    ):
+        def mock_get_values(pvs):
+            self.assertListEqual(
+                pvs, ["CS:BLOCKSERVER:IOCS", "CS:BLOCKSERVER:IOCS_NOT_TO_STOP"]
+            )
+            return {
+                "CS:BLOCKSERVER:IOCS": compress_payload(
+                    '{"GALIL_01": {}, "INSTETC_01": {}}'
+                ),
+                "CS:BLOCKSERVER:IOCS_NOT_TO_STOP": compress_payload('["INSTETC_01"]'),
+            }
+
+        self.channel_access.get_values = mock_get_values
+        valid_iocs, protected_iocs = self.channel_access.get_valid_and_protected_iocs()
+
+        self.assertListEqual(list(valid_iocs), ["GALIL_01", "INSTETC_01"])
+        self.assertListEqual(protected_iocs, ["INSTETC_01"])
+
+    def test_GIVEN_unavailable_ioc_pvs_WHEN_getting_valid_and_protected_iocs_THEN_none_returned(
+        self,
+    ):
+        self.channel_access.get_values = lambda pvs: {pv: None for pv in pvs}
+
+        self.assertEqual(
+            self.channel_access.get_valid_and_protected_iocs(), (None, None)
+        )
+
+    def test_GIVEN_instruments_WHEN_probing_liveness_THEN_only_instruments_answering_heartbeat_are_live(
+        self,
+    ):
+        instruments = [
+            {"name": "LARMOR", "pvPrefix": "IN:LARMOR:"},
+            {"name": "ZOOM", "pvPrefix": "IN:ZOOM:"},
+        ]
+
+        def mock_get_values(pvs, timeout=None):
+            self.assertListEqual(
+                pvs,
+                [
+                    "IN:LARMOR:CS:BLOCKSERVER:GET_CURR_CONFIG_DETAILS",
+                    "IN:ZOOM:CS:BLOCKSERVER:GET_CURR_CONFIG_DETAILS",
+                ],
+            )
+            self.assertEqual(timeout, 1)
+            return {pv: ("789c" if pv.startswith("IN:LARMOR:") else None) for pv in pvs}
+
+        with patch.object(
+            ChannelAccessUtils, "get_values", side_effect=mock_get_values
+        ):
+            self.assertSetEqual(
+                ChannelAccessUtils.get_live_instruments(instruments, timeout=1),
+                {"LARMOR"},
+            )
+
+    def test_GIVEN_cached_payloads_WHEN_getting_digest_THEN_payloads_not_read_again(
+        self,
+    ):
+        blockserver_cache = BlockserverCache()
+        blockserver_cache.preload(
+            {pv: [pv] for pv in ChannelAccessUtils.BLOCKSERVER_PAYLOAD_PVS}
+        )
+        channel_access = ChannelAccessUtils(blockserver_cache=blockserver_cache)
+        channel_access.get_values = lambda pvs: self.fail(f"read {pvs}")
+        channel_access.get_value = lambda pv: "1.0"
+
+        digest = channel_access.get_checked_server_pvs_digest()
+
+        self.assertEqual(blockserver_cache.misses, 0)
+        channel_access.get_value = lambda pv: "2.0"
+        self.assertNotEqual(channel_access.get_checked_server_pvs_digest(), digest)
+
+    def test_GIVEN_decoded_iocs_WHEN_getting_digest_THEN_same_as_digest_of_their_list(
+        self,
+    ):
+        pv_values = dict.fromkeys(ChannelAccessUtils.CHECKED_SERVER_PVS)
+        pv_values["CS:BLOCKSERVER:IOCS"] = dict.fromkeys(
+            ["GALIL_01", "INSTETC_01"]
+        ).keys()
+        listed_values = dict(
+            pv_values, **{"CS:BLOCKSERVER:IOCS": ["GALIL_01", "INSTETC_01"]}
+        )
+
+        self.assertEqual(
+            ChannelAccessUtils.get_server_pvs_digest(pv_values),
+            ChannelAccessUtils.get_server_pvs_digest(listed_values),
+        )
+
+
+class FakeCaChannel:
+    """
+    Stands in for a CaChannel, calling back from another thread as channel access does with preemptive callbacks.
+    """
+
+    def __init__(self, value=None, connects=True, answers=True):
+        """
+        :param value: The value of the PV
+        :param connects: Whether the PV connects
+        :param answers: Whether the PV's value arrives once it has connected
+        """
+        self.value = value
+        self.connects = connects
+        self.answers = answers
+        self.requested = False
+
+    @staticmethod
+    def _call_back(callback, *args):
+        thread = threading.Thread(target=callback, args=args)
+        thread.start()
+        thread.join()
+
+    def search_and_connect(self, _, callback):
+        if self.connects:
+            self._call_back(callback, (None, ca.CA_OP_CONN_UP), None)
+
+    def flush_io(self):
+        pass
+
+    def read_access(self):
+        return True
+
+    def field_type(self):
+        return ca.DBR_DOUBLE
+
+    def array_get_callback(self, request_type, count, callback, use_numpy=False):
+        self.requested = True
+        if self.answers:
+            self._call_back(
+                callback, {"status": ca.ECA_NORMAL, "pv_value": self.value}, None
+            )
+
+
+class AsyncChannelAccessReadTests(unittest.TestCase):
+    def test_GIVEN_pv_answers_WHEN_read_THEN_value_returned(self):
+        channel = FakeCaChannel(value=1.5)
+
+        self.assertEqual(asyncio.run(AsyncChannelAccess()._read(channel, 1)), 1.5)
+
+    def test_GIVEN_pv_does_not_connect_WHEN_read_THEN_timeout_raised_without_requesting_value(
+        self,
+    ):
+        channel = FakeCaChannel(connects=False)
+
+        with self.assertRaises(asyncio.TimeoutError) as context:
+            asyncio.run(AsyncChannelAccess()._read(channel, 0.1))
+
+        self.assertNotIsInstance(context.exception, ValueTimeoutError)
+        self.assertFalse(channel.requested)
+
+    def test_GIVEN_value_does_not_arrive_WHEN_read_THEN_value_timeout_raised(self):
+        channel = FakeCaChannel(answers=False)
+
+        with self.assertRaises(ValueTimeoutError):
+            asyncio.run(AsyncChannelAccess()._read(channel, 0.1))
+
+        self.assertTrue(channel.requested)
+
+    def test_GIVEN_tripped_breaker_WHEN_getting_value_THEN_none_or_error_without_reading(
+        self,
+    ):
+        breaker = ChannelAccessBreaker()
+        breaker.trip("it is down")
+
+        with patch("util.channel_access.CaChannel") as channel:
+            self.assertIsNone(
+                asyncio.run(AsyncChannelAccess(breaker=breaker).get_value("PV"))
+            )
+            with self.assertRaises(BreakerTrippedError):
+                asyncio.run(
+                    AsyncChannelAccess(breaker=breaker).get_value(
+                        "PV", raise_timeout=True
+                    )
+                )
+        channel.assert_not_called()
@@ -0,0 +1,112 @@
+import io
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from xmlrunner import XMLTestRunner
+
+from util.concurrent_suite import ConcurrentTestSuite
+
+
+class ConcurrentTestSuiteTests(unittest.TestCase):
+    class _ItemTests(unittest.TestCase):
+        def __init__(self, method_name="runTest", item=None):
+            super().__init__(method_name)
+            self.item = item
+
+        def test_passes(self):
+            # Later items finish first, so they would be reported first if reported as they finish.
+            time.sleep(0.01 * (3 - self.item))
+            print(f"checked item {self.item}")
+
+        def test_fails_on_second_item(self):
+            self.assertNotEqual(self.item, 1, "item 1 is broken")
+
+        def test_skipped(self):
+            self.skipTest(f"not checked on item {self.item}")
+
+    class _OverlappingTests(unittest.TestCase):
+        barrier = None
+
+        def test_waits_for_others(self):
+            ConcurrentTestSuiteTests._OverlappingTests.barrier.wait()
+
+    @staticmethod
+    def _make_suite(threads):
+        item_tests = ConcurrentTestSuiteTests._ItemTests
+        return ConcurrentTestSuite(
+            [
+                item_tests(test, item)
+                for item in range(3)
+                for test in unittest.TestLoader().getTestCaseNames(item_tests)
+            ],
+            threads,
+        )
+
+    def setUp(self):
+        self.reports_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.reports_path, ignore_errors=True)
+
+    def _run_xml(self, threads):
+        output = os.path.join(self.reports_path, str(threads))
+        result = XMLTestRunner(output=output, stream=io.StringIO()).run(
+            self._make_suite(threads)
+        )
+        (report,) = os.listdir(output)
+        with open(os.path.join(output, report)) as f:
+            # Timings and the run timestamp in suite names differ between runs, nothing else may.
+            return result, re.sub(
+                r'(time|timestamp)="[^"]*"|-\d{14}(?=")', "", f.read()
+            )
+
+    def test_GIVEN_several_threads_WHEN_running_THEN_tests_overlap(self):
+        overlapping_tests = ConcurrentTestSuiteTests._OverlappingTests
+        overlapping_tests.barrier = threading.Barrier(3, timeout=5)
+        result = unittest.TestResult()
+
+        ConcurrentTestSuite(
+            [overlapping_tests("test_waits_for_others") for _ in range(3)], 3
+        ).run(result)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(result.testsRun, 3)
+
+    def test_GIVEN_several_threads_WHEN_running_THEN_outcomes_reported_in_suite_order(
+        self,
+    ):
+        started = []
+        result = unittest.TestResult()
+        result.startTest = lambda test: started.append(
+            (test._testMethodName, test.item)
+        )
+
+        self._make_suite(4).run(result)
+
+        self.assertListEqual(
+            started,
+            [
+                (test, item)
+                for item in range(3)
+                for test in ["test_fails_on_second_item", "test_passes", "test_skipped"]
+            ],
+        )
+        self.assertListEqual([test.item for test, _ in result.failures], [1])
+        self.assertListEqual(
+            [reason for _, reason in result.skipped],
+            [f"not checked on item {item}" for item in range(3)],
+        )
+
+    def test_GIVEN_several_threads_WHEN_running_with_xml_runner_THEN_same_report_as_one_thread(
+        self,
+    ):
+        sequential_result, sequential_report = self._run_xml(1)
+        concurrent_result, concurrent_report = self._run_xml(4)
+
+        self.assertEqual(concurrent_report, sequential_report)
+        self.assertIn("checked item 2", concurrent_report)
+        self.assertEqual(concurrent_result.testsRun, sequential_result.testsRun)
+        self.assertEqual(len(concurrent_result.failures), 1)
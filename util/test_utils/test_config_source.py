@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import git
+
+from util.config_source import FileSystemConfigSource, GitConfigSource
+from util.git_wrapper import GitObjectReader
+
+
+class ConfigSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.repo_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_path, ignore_errors=True)
+
+        repo = git.Repo.init(self.repo_path)
+        self._write(
+            os.path.join("configurations", "globals.txt"), "GALIL_01__MTRCTRL=1\n"
+        )
+        self._write(
+            os.path.join("configurations", "configurations", "cfg", "iocs.xml"),
+            "<iocs/>",
+        )
+        self._write(
+            os.path.join("configurations", "components", "_base", "iocs.xml"), "<iocs/>"
+        )
+        repo.index.add(["configurations"])
+        author = git.Actor("test", "test@example.com")
+        self.commit = repo.index.commit(
+            "Add configurations", author=author, committer=author
+        )
+
+        # Change the working tree after committing so that we can tell which one each source reads.
+        self._write(
+            os.path.join("configurations", "globals.txt"), "GALIL_01__MTRCTRL=2\n"
+        )
+
+        self.git_source = GitConfigSource(
+            GitObjectReader(self.repo_path), self.commit.hexsha
+        )
+        self.file_source = FileSystemConfigSource(self.repo_path)
+
+    def _write(self, relative_path, contents):
+        path = os.path.join(self.repo_path, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(contents)
+
+    def _path(self, *parts):
+        return os.path.join(self.repo_path, *parts)
+
+    def test_GIVEN_a_changed_working_tree_WHEN_reading_from_git_THEN_committed_contents_returned(
+        self,
+    ):
+        path = self._path("configurations", "globals.txt")
+
+        self.assertEqual(self.git_source.read(path), "GALIL_01__MTRCTRL=1\n")
+        self.assertEqual(self.file_source.read(path), "GALIL_01__MTRCTRL=2\n")
+
+    def test_GIVEN_a_directory_WHEN_listing_folders_THEN_both_sources_agree(self):
+        path = self._path("configurations")
+
+        self.assertListEqual(
+            sorted(self.git_source.list_folders(path)), ["components", "configurations"]
+        )
+        self.assertListEqual(
+            sorted(self.git_source.list_folders(path)),
+            sorted(self.file_source.list_folders(path)),
+        )
+
+    def test_GIVEN_a_file_name_WHEN_counting_files_THEN_both_sources_agree(self):
+        self.assertEqual(
+            self.git_source.count_files_with_name(self.repo_path, "iocs.xml"), 2
+        )
+        self.assertEqual(
+            self.file_source.count_files_with_name(self.repo_path, "iocs.xml"), 2
+        )
+
+    def test_GIVEN_a_path_that_does_not_exist_THEN_it_is_neither_a_file_nor_a_directory(
+        self,
+    ):
+        path = self._path("configurations", "missing")
+
+        self.assertFalse(self.git_source.is_file(path))
+        self.assertFalse(self.git_source.is_dir(path))
+        self.assertRaises(IOError, self.git_source.read, path)
+        self.assertRaises(IOError, self.git_source.list_dir, path)
+
+    def test_GIVEN_a_file_WHEN_checking_its_type_THEN_it_is_a_file_and_not_a_directory(
+        self,
+    ):
+        path = self._path("configurations", "configurations", "cfg", "iocs.xml")
+
+        self.assertTrue(self.git_source.is_file(path))
+        self.assertFalse(self.git_source.is_dir(path))
+
+    def test_GIVEN_a_second_commit_WHEN_getting_changed_paths_THEN_only_changed_files_returned(
+        self,
+    ):
+        repo = git.Repo(self.repo_path)
+        repo.index.add([os.path.join("configurations", "globals.txt")])
+        author = git.Actor("test", "test@example.com")
+        new_commit = repo.index.commit(
+            "Change globals", author=author, committer=author
+        )
+
+        self.assertSetEqual(
+            self.git_source.reader.get_changed_paths(
+                self.commit.hexsha, new_commit.hexsha
+            ),
+            {"configurations/globals.txt"},
+        )
@@ -0,0 +1,133 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from util.config_source import FileSystemConfigSource
+from util.configuration_fixture import InstrumentFixtures
+from util.globals import GlobalsUtils
+from util.validation_cache import get_blob_sha
+
+IOCS_XML = """<?xml version="1.0" ?>
+<iocs xmlns="http://epics.isis.rl.ac.uk/schema/iocs/1.0">
+    <ioc name="{}" simlevel="none"><macros/></ioc>
+</iocs>"""
+
+COMPONENTS_XML = """<?xml version="1.0" ?>
+<components xmlns="http://epics.isis.rl.ac.uk/schema/components/1.0">{}</components>"""
+
+
+class CountingConfigSource(FileSystemConfigSource):
+    def __init__(self, root):
+        super().__init__(root)
+        self.counts = Counter()
+
+    def read(self, path):
+        self.counts["read"] += 1
+        return super().read(path)
+
+    def read_bytes(self, path):
+        self.counts["read_bytes"] += 1
+        return super().read_bytes(path)
+
+    def list_dir(self, path):
+        self.counts["list_dir"] += 1
+        return super().list_dir(path)
+
+
+class ConfigurationFixtureTests(unittest.TestCase):
+    def setUp(self):
+        self.repo_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_path, ignore_errors=True)
+
+        self._write(
+            ["configurations", "CONFIG", "iocs.xml"],
+            IOCS_XML.format("GALIL_01").encode("utf-8"),
+        )
+        self._write(
+            ["configurations", "CONFIG", "components.xml"],
+            COMPONENTS_XML.format('<component name="COMP"/>').encode("utf-8"),
+        )
+        self._write(
+            ["components", "COMP", "iocs.xml"], IOCS_XML.format("EUROTHRM_01").encode()
+        )
+        self._write(
+            ["components", "COMP", "components.xml"], COMPONENTS_XML.format("").encode()
+        )
+        self._write(
+            ["globals.txt"],
+            b"GALIL_01__MTRCTRL=1\nGALIL_01__AXIS1=yes\nGALIL_02__X=2\n",
+        )
+
+        self.source = CountingConfigSource(self.repo_path)
+        self.fixtures = InstrumentFixtures(self.repo_path, self.source)
+        self.fixture = self.fixtures.get_configuration("CONFIG")
+
+    def _write(self, parts, contents):
+        path = os.path.join(self.repo_path, "configurations", *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(contents)
+
+    def test_GIVEN_configuration_WHEN_getting_its_fixture_again_THEN_same_fixture_returned(
+        self,
+    ):
+        self.assertIs(self.fixtures.get_configuration("CONFIG"), self.fixture)
+        self.assertIsNot(self.fixtures.get_component("CONFIG"), self.fixture)
+
+    def test_GIVEN_fixture_WHEN_listing_files_repeatedly_THEN_directory_listed_once(
+        self,
+    ):
+        for _ in range(3):
+            self.assertListEqual(
+                sorted(self.fixture.get_files()), ["components.xml", "iocs.xml"]
+            )
+
+        self.assertEqual(self.source.counts["list_dir"], 1)
+
+    def test_GIVEN_fixture_WHEN_getting_blob_sha_repeatedly_THEN_file_read_once(self):
+        for _ in range(3):
+            self.assertEqual(
+                self.fixture.get_file_blob_sha("iocs.xml"),
+                get_blob_sha(IOCS_XML.format("GALIL_01").encode("utf-8")),
+            )
+
+        self.assertEqual(self.source.counts["read_bytes"], 1)
+
+    def test_GIVEN_fixture_WHEN_getting_contents_THEN_contents_not_kept(self):
+        self.fixture.get_file_bytes("iocs.xml")
+        self.fixture.get_file_bytes("iocs.xml")
+
+        self.assertEqual(self.source.counts["read_bytes"], 2)
+
+    def test_GIVEN_several_threads_WHEN_getting_the_same_model_THEN_all_given_one_model(
+        self,
+    ):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            models = list(executor.map(lambda _: self.fixture.get_model(), range(8)))
+
+        self.assertTrue(all(model is models[0] for model in models))
+
+    def test_GIVEN_fixture_WHEN_getting_models_with_components_THEN_component_model_shared(
+        self,
+    ):
+        models = self.fixture.get_models_with_components()
+
+        self.assertListEqual([model.name for model in models], ["CONFIG", "COMP"])
+        self.assertListEqual(models[1].ioc_names, ["EUROTHRM_01"])
+        self.assertIs(models[1], self.fixtures.get_component("COMP").get_model())
+        self.assertIs(models[0], self.fixture.get_model())
+
+    def test_GIVEN_globals_WHEN_getting_macros_of_several_iocs_THEN_file_read_once(
+        self,
+    ):
+        globals_utils = GlobalsUtils(self.repo_path)
+
+        for ioc in ["GALIL_01", "GALIL_02", "GALIL_03"]:
+            self.assertDictEqual(
+                self.fixture.globals_index.get_macros(ioc),
+                globals_utils.get_macros(ioc),
+            )
+        self.assertEqual(self.source.counts["read"], 1)
@@ -1,6 +1,12 @@
+import io
 import unittest
+import xml.etree.ElementTree as ET
 
-from util.configurations import ConfigurationUtils
+from util.configurations import (
+    ConfigurationModel,
+    ConfigurationUtils,
+    iter_block_records,
+)
 from util.globals import GlobalsUtils
 
 generic_component_xml = """<?xml version="1.0" ?>
@@ -29,13 +35,16 @@ class ConfigurationTests(unittest.TestCase):
     def test_GIVEN_component_xml_WHEN_parsed_THEN_can_extract_a_single_component(self):
         xml = generic_component_xml.format("")
 
-        self.assertListEqual(self.config_utils.get_active_components_from_xml(xml), ["COMPONENT_1"])
+        self.assertListEqual(
+            self.config_utils.get_active_components_from_xml(xml), ["COMPONENT_1"]
+        )
 
     def test_GIVEN_component_xml_WHEN_parsed_THEN_can_extract_multiple_components(self):
         xml = generic_component_xml.format('<component name="COMPONENT_2"/>')
 
         self.assertListEqual(
-            self.config_utils.get_active_components_from_xml(xml), ["COMPONENT_1", "COMPONENT_2"]
+            self.config_utils.get_active_components_from_xml(xml),
+            ["COMPONENT_1", "COMPONENT_2"],
         )
 
     def test_GIVEN_block_xml_WHEN_parsed_and_no_blocks_THEN_return_no_data(self):
@@ -106,7 +115,8 @@ class ConfigurationTests(unittest.TestCase):
         )
 
         self.assertListEqual(
-            self.config_utils.get_block_pvs_from_xml("IN:DEMO", xml), ["MOT:JAWS2:VGAP", "CY", "CX"]
+            self.config_utils.get_block_pvs_from_xml("IN:DEMO", xml),
+            ["MOT:JAWS2:VGAP", "CY", "CX"],
         )
 
     def test_GIVEN_block_xml_WHEN_block_on_field_THEN_can_extract_one_global_pv_(self):
@@ -128,12 +138,14 @@ class ConfigurationTests(unittest.TestCase):
         )
 
         self.assertListEqual(
-            self.config_utils.get_block_pvs_from_xml("IN:DEMO:", xml), ["IN:DEMO:MOT:JAWS2:VGAP"]
+            self.config_utils.get_block_pvs_from_xml("IN:DEMO:", xml),
+            ["IN:DEMO:MOT:JAWS2:VGAP"],
         )
 
     def test_GIVEN_pv_name_THEN_returns_it_unchanged(self):
         self.assertEqual(
-            self.config_utils._get_pv_name_without_field("MOT:JAWS2:MTR0123"), "MOT:JAWS2:MTR0123"
+            self.config_utils._get_pv_name_without_field("MOT:JAWS2:MTR0123"),
+            "MOT:JAWS2:MTR0123",
         )
 
     def test_GIVEN_field_name_THEN_returns_pv_name(self):
@@ -161,7 +173,8 @@ class ConfigurationTests(unittest.TestCase):
         )
 
         self.assertListEqual(
-            self.config_utils.get_block_pvs_from_xml("IN:DEMO:", xml), ["IN:DEMO:MOT:JAWS2:VGAP"]
+            self.config_utils.get_block_pvs_from_xml("IN:DEMO:", xml),
+            ["IN:DEMO:MOT:JAWS2:VGAP"],
         )
 
     def test_GIVEN_ioc_xml_WHEN_parsed_THEN_can_extract_a_single_ioc(self):
@@ -195,7 +208,9 @@ class ConfigurationTests(unittest.TestCase):
                     </iocs>
                     """
 
-        self.assertListEqual(self.config_utils.get_iocs(xml), ["SIMPLE_01", "SIMPLE_02"])
+        self.assertListEqual(
+            self.config_utils.get_iocs(xml), ["SIMPLE_01", "SIMPLE_02"]
+        )
 
     def test_GIVEN_ioc_xml_WHEN_macros_requested_for_ioc_that_exists_THEN_macro_information_matches_xml(
         self,
@@ -208,7 +223,7 @@ class ConfigurationTests(unittest.TestCase):
         value_2_01 = "3.45"
         value_2_02 = "0x2a"
 
-        xml = """<?xml version="1.0" ?>
+        xml = f"""<?xml version="1.0" ?>
                     <iocs xmlns="http://epics.isis.rl.ac.uk/schema/iocs/1.0" 
                     xmlns:ioc="http://epics.isis.rl.ac.uk/schema/iocs/1.0" xmlns:xi="http://www.w3.org/2001/XInclude">
                         <ioc autostart="true" name="SIMPLE_01" restart="false" simlevel="none">
@@ -228,14 +243,7 @@ class ConfigurationTests(unittest.TestCase):
                             <pvsets/>
                         </ioc>
                     </iocs>
-                    """.format(
-            name_1=name_1,
-            name_2=name_2,
-            value_1_01=value_1_01,
-            value_1_02=value_1_02,
-            value_2_01=value_2_01,
-            value_2_02=value_2_02,
-        )
+                    """
 
         macros_1 = self.config_utils.get_ioc_macros(xml, "SIMPLE_01")
         self.assertEqual(macros_1[name_1], value_1_01)
@@ -255,7 +263,9 @@ class ConfigurationTests(unittest.TestCase):
                     </iocs>
                     """
 
-        self.assertEqual(len(self.config_utils.get_ioc_macros(xml, "SIMPL").values()), 0)
+        self.assertEqual(
+            len(self.config_utils.get_ioc_macros(xml, "SIMPL").values()), 0
+        )
 
     def test_GIVEN_ioc_xml_WHEN_simlevel_is_not_none_THEN_returns_false(self):
         xml = """<?xml version="1.0" ?>
@@ -339,3 +349,206 @@ class ConfigurationTests(unittest.TestCase):
         )
 
         self.assertTrue(len(valid_config_macros) == 0, len(valid_globals_macros) == 0)
+
+
+model_iocs_xml = """<?xml version="1.0" ?>
+                    <iocs xmlns="http://epics.isis.rl.ac.uk/schema/iocs/1.0">
+                        <ioc autostart="true" name="GALIL_01" restart="false" simlevel="none">
+                            <macros>
+                                <macro name="MTRCTRL" value="1"/>
+                                <macro name="GALILADDR" value="130.246.0.1"/>
+                            </macros>
+                        </ioc>
+                        <ioc autostart="true" name="GALIL_02" restart="false" simlevel="recsim">
+                            <macros>
+                                <macro name="MTRCTRL" value="2"/>
+                            </macros>
+                        </ioc>
+                    </iocs>
+                    """
+
+
+class ConfigurationModelTests(unittest.TestCase):
+    def setUp(self):
+        self.files = {
+            "blocks.xml": generic_block_xml.format(
+                """<block><name>S2VG</name><read_pv>MOT:JAWS2:VGAP.VAL</read_pv><local>True</local></block>""",
+                """<block><name>TEMP</name><read_pv>IN:OTHER:TEMP</read_pv><local>False</local></block>""",
+                "",
+            ),
+            "iocs.xml": model_iocs_xml,
+            "components.xml": generic_component_xml.format(
+                '<component name="COMPONENT_2"/>'
+            ),
+        }
+
+    def _load_root(self, filename):
+        return ET.fromstring(self.files[filename])
+
+    def test_GIVEN_configuration_files_WHEN_model_built_THEN_blocks_are_indexed_by_name(
+        self,
+    ):
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.block_names, ["S2VG", "TEMP"])
+        self.assertEqual(model.get_block("S2VG").read_pv, "MOT:JAWS2:VGAP.VAL")
+        self.assertTrue(model.get_block("S2VG").local)
+        self.assertFalse(model.get_block("TEMP").local)
+        self.assertIsNone(model.get_block("MISSING"))
+
+    def test_GIVEN_configuration_files_WHEN_model_built_THEN_iocs_and_macros_are_indexed_by_name(
+        self,
+    ):
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.ioc_names, ["GALIL_01", "GALIL_02"])
+        self.assertEqual(
+            model.get_ioc_macros("GALIL_01"),
+            {"MTRCTRL": "1", "GALILADDR": "130.246.0.1"},
+        )
+        self.assertEqual(model.get_ioc_macros("MISSING"), {})
+        self.assertFalse(model.get_ioc("GALIL_01").in_sim_mode)
+        self.assertTrue(model.get_ioc("GALIL_02").in_sim_mode)
+
+    def test_GIVEN_configuration_files_WHEN_model_built_THEN_components_are_listed(
+        self,
+    ):
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.components, ["COMPONENT_1", "COMPONENT_2"])
+
+    def test_GIVEN_unparseable_file_WHEN_model_built_THEN_error_raised_only_when_that_file_is_used(
+        self,
+    ):
+        self.files["blocks.xml"] = "<blocks"
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.ioc_names, ["GALIL_01", "GALIL_02"])
+        with self.assertRaises(ET.ParseError):
+            model.get_block("S2VG")
+
+    def test_GIVEN_well_formed_entries_WHEN_model_built_THEN_no_malformed_entries(self):
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.malformed_entries, [])
+
+    def test_GIVEN_ioc_without_simlevel_WHEN_model_built_THEN_ioc_kept_and_reported_as_malformed(
+        self,
+    ):
+        self.files["iocs.xml"] = model_iocs_xml.replace(' simlevel="recsim"', "")
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.ioc_names, ["GALIL_01", "GALIL_02"])
+        self.assertIsNone(model.get_ioc("GALIL_02").simlevel)
+        self.assertListEqual(
+            model.malformed_entries,
+            ["IOC GALIL_02 in iocs.xml has no simlevel attribute"],
+        )
+
+    def test_GIVEN_block_without_local_WHEN_model_built_THEN_block_kept_and_reported_as_malformed(
+        self,
+    ):
+        self.files["blocks.xml"] = self.files["blocks.xml"].replace(
+            "<local>False</local>", ""
+        )
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.block_names, ["S2VG", "TEMP"])
+        self.assertIsNone(model.get_block("TEMP").local)
+        self.assertListEqual(
+            model.malformed_entries, ["Block TEMP in blocks.xml has no local element"]
+        )
+
+    def test_GIVEN_block_without_name_WHEN_model_built_THEN_block_skipped_and_reported_as_malformed(
+        self,
+    ):
+        self.files["blocks.xml"] = self.files["blocks.xml"].replace(
+            "<name>TEMP</name>", ""
+        )
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(model.block_names, ["S2VG"])
+        self.assertListEqual(
+            model.malformed_entries, ["A block in blocks.xml has no name element"]
+        )
+
+    def test_GIVEN_streamed_block_without_local_WHEN_streamed_THEN_local_is_none(self):
+        stream = io.BytesIO(
+            self.files["blocks.xml"].replace("<local>True</local>", "").encode("utf-8")
+        )
+
+        self.assertListEqual(
+            [record.local for record in iter_block_records(stream)], [None, False]
+        )
+
+    def test_GIVEN_motor_iocs_WHEN_only_one_of_controller_and_comms_set_THEN_ioc_is_reported(
+        self,
+    ):
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+
+        self.assertListEqual(
+            ConfigurationUtils("").get_motor_iocs_with_partial_settings(model),
+            ["GALIL_02"],
+        )
+
+    def test_GIVEN_models_WHEN_counts_merged_THEN_names_are_counted_across_all_models(
+        self,
+    ):
+        model = ConfigurationModel.from_roots("CONFIG", self._load_root)
+        self.files["blocks.xml"] = generic_block_xml.format(
+            """<block><name>s2vg</name><read_pv>MOT:JAWS2:VGAP</read_pv><local>True</local></block>""",
+            "",
+            "",
+        )
+        component = ConfigurationModel.from_roots("COMPONENT", self._load_root)
+
+        block_counts = ConfigurationUtils.merge_counts(
+            [model, component], lambda m: m.block_counts
+        )
+        upper_block_counts = ConfigurationUtils.merge_counts(
+            [model, component], lambda m: m.upper_block_counts
+        )
+        ioc_counts = ConfigurationUtils.merge_counts(
+            [model, component], lambda m: m.ioc_counts
+        )
+
+        self.assertEqual(block_counts, {"S2VG": 1, "s2vg": 1, "TEMP": 1})
+        self.assertEqual(upper_block_counts, {"S2VG": 2, "TEMP": 1})
+        self.assertEqual(ioc_counts, {"GALIL_01": 2, "GALIL_02": 2})
+        self.assertIs(model.block_counts, model.block_counts)
+
+    def test_GIVEN_blocks_xml_WHEN_streamed_THEN_records_yielded_in_order(self):
+        stream = io.BytesIO(self.files["blocks.xml"].encode("utf-8"))
+
+        records = list(iter_block_records(stream))
+
+        self.assertListEqual([record.name for record in records], ["S2VG", "TEMP"])
+        self.assertListEqual(
+            [record.read_pv for record in records],
+            ["MOT:JAWS2:VGAP.VAL", "IN:OTHER:TEMP"],
+        )
+        self.assertListEqual([record.local for record in records], [True, False])
+
+    def test_GIVEN_streamed_blocks_WHEN_model_built_THEN_blocks_taken_from_stream(self):
+        model = ConfigurationModel.from_roots(
+            "CONFIG",
+            self._load_root,
+            lambda: iter_block_records(io.BytesIO(b"<blocks/>")),
+        )
+
+        self.assertListEqual(model.block_names, [])
+        self.assertListEqual(model.ioc_names, ["GALIL_01", "GALIL_02"])
+
+    def test_GIVEN_truncated_blocks_xml_WHEN_streamed_into_model_THEN_error_raised_when_blocks_used(
+        self,
+    ):
+        model = ConfigurationModel.from_roots(
+            "CONFIG",
+            self._load_root,
+            lambda: iter_block_records(
+                io.BytesIO(self.files["blocks.xml"][:-20].encode("utf-8"))
+            ),
+        )
+
+        with self.assertRaises(ET.ParseError):
+            model.get_block("S2VG")
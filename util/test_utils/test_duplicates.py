@@ -0,0 +1,45 @@
+import unittest
+from collections import Counter
+
+from util.duplicates import DuplicateDetector
+
+
+class DuplicateDetectorTests(unittest.TestCase):
+    def test_GIVEN_names_defined_once_WHEN_getting_duplicates_THEN_none_found(self):
+        detector = DuplicateDetector()
+        detector.add(Counter(["A", "B"]), "configuration CONFIG")
+        detector.add(Counter(["C"]), "component COMP")
+
+        self.assertEqual(detector.get_duplicates(), {})
+
+    def test_GIVEN_name_in_two_sources_WHEN_getting_duplicates_THEN_both_origins_named(
+        self,
+    ):
+        detector = DuplicateDetector()
+        detector.add(Counter(["A", "B"]), "configuration CONFIG")
+        detector.add(Counter(["B"]), "component COMP")
+
+        self.assertEqual(
+            detector.get_duplicates(), {"B": ["configuration CONFIG", "component COMP"]}
+        )
+
+    def test_GIVEN_name_twice_in_one_source_WHEN_getting_duplicates_THEN_origin_named_twice(
+        self,
+    ):
+        detector = DuplicateDetector()
+        detector.add(Counter(["A", "A"]), "component COMP")
+
+        self.assertEqual(
+            detector.get_duplicates(), {"A": ["component COMP", "component COMP"]}
+        )
+
+    def test_GIVEN_duplicates_WHEN_formatted_THEN_names_listed_with_origins(self):
+        duplicates = {
+            "B": ["configuration CONFIG", "component COMP"],
+            "A": ["component X"] * 2,
+        }
+
+        self.assertEqual(
+            DuplicateDetector.format_duplicates(duplicates),
+            "A (component X, component X), B (configuration CONFIG, component COMP)",
+        )
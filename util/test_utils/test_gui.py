@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import git
+
+from util.gui import GuiUtils, OpiInfoCache
+
+OPI_INFO_XML = """<?xml version="1.0" ?>
+<opis>
+    <entry>
+        <key>HLG</key>
+        <value>
+            <type>HE_LEVEL_GAUGE</type>
+        </value>
+    </entry>
+    <entry>
+        <key>Eurotherm</key>
+        <value>
+            <type>TEMPERATURE_CONTROLLER</type>
+        </value>
+    </entry>
+</opis>
+"""
+
+
+class OpiInfoCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.repo_path = tempfile.mkdtemp()
+        self.cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.repo_path, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.cache_path, ignore_errors=True)
+
+        repo = git.Repo.init(self.repo_path)
+        path = os.path.join(self.repo_path, *GuiUtils.OPI_INFO_PATH.split("/"))
+        os.makedirs(os.path.dirname(path))
+        with open(path, "w") as f:
+            f.write(OPI_INFO_XML)
+        repo.index.add([GuiUtils.OPI_INFO_PATH])
+        author = git.Actor("test", "test@example.com")
+        repo.index.commit("Add opi info", author=author, committer=author)
+        repo.create_tag("v15.0.0")
+
+        # Remove the working tree copy so that the cache can only have read it from the tag.
+        os.remove(path)
+
+    def test_GIVEN_a_release_tag_WHEN_getting_targets_and_types_THEN_they_are_read_from_the_tag(
+        self,
+    ):
+        targets, types = OpiInfoCache(self.repo_path).get_valid_targets_and_types(
+            "v15.0.0"
+        )
+
+        self.assertSetEqual(targets, {"HLG", "Eurotherm"})
+        self.assertSetEqual(types, {"HE_LEVEL_GAUGE", "TEMPERATURE_CONTROLLER"})
+
+    def test_GIVEN_a_release_cached_on_disk_WHEN_getting_targets_and_types_THEN_repository_not_read(
+        self,
+    ):
+        OpiInfoCache(self.repo_path, self.cache_path).get_valid_targets_and_types(
+            "v15.0.0"
+        )
+
+        targets, types = OpiInfoCache(
+            "not_a_repository", self.cache_path
+        ).get_valid_targets_and_types("v15.0.0")
+
+        self.assertSetEqual(targets, {"HLG", "Eurotherm"})
+        self.assertSetEqual(types, {"HE_LEVEL_GAUGE", "TEMPERATURE_CONTROLLER"})
+
+    def test_GIVEN_an_unknown_release_tag_WHEN_getting_targets_and_types_THEN_io_error_raised(
+        self,
+    ):
+        self.assertRaises(
+            IOError, OpiInfoCache(self.repo_path).get_valid_targets_and_types, "v99.0.0"
+        )
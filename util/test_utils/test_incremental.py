@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from util.incremental import IncrementalState
+
+INPUTS = {
+    "checker_version": "abc",
+    "configs_commit": "def",
+    "gui_release_tag": "v15.0.0",
+    "server_pvs_digest": "123",
+}
+
+
+class IncrementalStateTests(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_path, ignore_errors=True)
+
+    def test_GIVEN_an_instrument_never_checked_THEN_it_has_changed(self):
+        self.assertFalse(IncrementalState(self.cache_path).is_unchanged("DEMO", INPUTS))
+
+    def test_GIVEN_a_saved_state_WHEN_inputs_are_the_same_THEN_instrument_is_unchanged(
+        self,
+    ):
+        state = IncrementalState(self.cache_path)
+        state.record("DEMO", INPUTS, {"component_total": 2})
+        state.save()
+
+        reloaded = IncrementalState(self.cache_path)
+
+        self.assertTrue(reloaded.is_unchanged("DEMO", dict(INPUTS)))
+        self.assertDictEqual(reloaded.get_results("DEMO"), {"component_total": 2})
+
+    def test_GIVEN_a_saved_state_WHEN_one_input_differs_THEN_instrument_has_changed(
+        self,
+    ):
+        state = IncrementalState(self.cache_path)
+        state.record("DEMO", INPUTS)
+
+        self.assertFalse(state.is_unchanged("DEMO", dict(INPUTS, configs_commit="fed")))
+
+    def test_GIVEN_an_instrument_that_failed_WHEN_recorded_THEN_it_has_changed(self):
+        state = IncrementalState(self.cache_path)
+        state.record("DEMO", INPUTS)
+
+        state.record("DEMO", None)
+
+        self.assertFalse(state.is_unchanged("DEMO", INPUTS))
+
+    def test_GIVEN_stored_reports_WHEN_replayed_THEN_they_are_copied_to_the_output_folder(
+        self,
+    ):
+        run_path = os.path.join(self.cache_path, "run")
+        os.makedirs(run_path)
+        report_file = os.path.join(run_path, "TEST-report.xml")
+        with open(report_file, "w") as f:
+            f.write("<testsuite/>")
+        state = IncrementalState(self.cache_path)
+        state.store_reports("DEMO", [report_file])
+
+        output_path = os.path.join(self.cache_path, "output")
+        state.replay_reports("DEMO", output_path)
+
+        self.assertListEqual(os.listdir(output_path), ["TEST-report.xml"])
+
+    def _write_reports(self, run_name, *file_names):
+        run_path = os.path.join(self.cache_path, run_name)
+        os.makedirs(run_path)
+        report_files = []
+        for file_name in file_names:
+            report_file = os.path.join(run_path, file_name)
+            with open(report_file, "w") as f:
+                f.write(run_name)
+            report_files.append(report_file)
+        return report_files
+
+    def test_GIVEN_an_affected_only_run_WHEN_inputs_unchanged_next_run_THEN_replayed_reports_are_merged(
+        self,
+    ):
+        state = IncrementalState(self.cache_path)
+        state.store_reports(
+            "DEMO",
+            self._write_reports(
+                "full",
+                "TEST-tests.globals_tests.GlobalsTests-20240101000000.xml",
+                "TEST-tests.configuration_tests.ConfigurationsTests-CHANGED-20240101000000.xml",
+                "TEST-tests.configuration_tests.ConfigurationsTests-DELETED-20240101000000.xml",
+                "TEST-tests.configuration_tests.ConfigurationsTests-UNCHANGED-20240101000000.xml",
+            ),
+        )
+
+        # Only CHANGED and DELETED were affected, and DELETED no longer exists so has no report
+        state.store_reports(
+            "DEMO",
+            self._write_reports(
+                "affected",
+                "TEST-tests.globals_tests.GlobalsTests-20240102000000.xml",
+                "TEST-tests.configuration_tests.ConfigurationsTests-CHANGED-20240102000000.xml",
+            ),
+            {
+                "tests.configuration_tests.ConfigurationsTests-CHANGED",
+                "tests.configuration_tests.ConfigurationsTests-DELETED",
+            },
+        )
+
+        output_path = os.path.join(self.cache_path, "output")
+        state.replay_reports("DEMO", output_path)
+
+        replayed = {}
+        for file_name in os.listdir(output_path):
+            with open(os.path.join(output_path, file_name)) as f:
+                replayed[file_name] = f.read()
+        self.assertDictEqual(
+            replayed,
+            {
+                "TEST-tests.globals_tests.GlobalsTests-20240102000000.xml": "affected",
+                "TEST-tests.configuration_tests.ConfigurationsTests-CHANGED-20240102000000.xml": "affected",
+                "TEST-tests.configuration_tests.ConfigurationsTests-UNCHANGED-20240101000000.xml": "full",
+            },
+        )
+
+    def test_GIVEN_only_the_configs_commit_moved_THEN_previous_configs_commit_returned(
+        self,
+    ):
+        state = IncrementalState(self.cache_path)
+        state.record("DEMO", INPUTS)
+
+        self.assertEqual(
+            state.get_previous_configs_commit(
+                "DEMO", dict(INPUTS, configs_commit="fed")
+            ),
+            "def",
+        )
+
+    def test_GIVEN_another_input_changed_THEN_no_previous_configs_commit_returned(self):
+        state = IncrementalState(self.cache_path)
+        state.record("DEMO", INPUTS)
+
+        self.assertIsNone(
+            state.get_previous_configs_commit(
+                "DEMO", dict(INPUTS, configs_commit="fed", gui_release_tag="v16.0.0")
+            )
+        )
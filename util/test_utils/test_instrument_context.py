@@ -0,0 +1,100 @@
+import unittest
+
+from tests.context import InstrumentContext, InstrumentTestCase
+from util.blockserver_cache import BlockserverCache
+from util.channel_access import ChannelAccessUtils
+from util.common import skip_if_instrument_offline, skip_on_instruments
+
+
+class InstrumentContextTests(unittest.TestCase):
+    def test_GIVEN_context_WHEN_changing_attribute_THEN_error_raised(self):
+        context = InstrumentContext("DEMO", "NDXDEMO", "IN:DEMO:", "configs", "gui")
+
+        with self.assertRaises(AttributeError):
+            context.name = "LARMOR"
+        self.assertEqual(context.name, "DEMO")
+
+    def test_GIVEN_two_contexts_THEN_each_has_its_own_breaker_and_blockserver_cache(
+        self,
+    ):
+        demo = InstrumentContext("DEMO", "NDXDEMO", "IN:DEMO:", "configs", "gui")
+        larmor = InstrumentContext(
+            "LARMOR", "NDXLARMOR", "IN:LARMOR:", "configs", "gui"
+        )
+
+        self.assertIsNot(demo.ca_breaker, larmor.ca_breaker)
+        self.assertIsNot(demo.blockserver_cache, larmor.blockserver_cache)
+
+    def test_GIVEN_offline_instrument_WHEN_creating_context_THEN_iocs_unknown_and_breaker_tripped(
+        self,
+    ):
+        context = InstrumentContext.for_instrument(
+            "DEMO", "NDXDEMO", "IN:DEMO:", "configs", "gui", online=False
+        )
+
+        self.assertIsNone(context.valid_iocs)
+        self.assertIsNone(context.protected_iocs)
+        self.assertTrue(context.ca_breaker.tripped)
+
+    def test_GIVEN_payloads_read_in_advance_WHEN_creating_context_THEN_iocs_taken_from_them(
+        self,
+    ):
+        payloads = {pv: None for pv in ChannelAccessUtils.BLOCKSERVER_PAYLOAD_PVS}
+        payloads["CS:BLOCKSERVER:IOCS"] = ["GALIL_01", "INSTETC_01"]
+        payloads["CS:BLOCKSERVER:IOCS_NOT_TO_STOP"] = ["INSTETC_01"]
+        blockserver_cache = BlockserverCache()
+        blockserver_cache.preload(payloads)
+
+        context = InstrumentContext.for_instrument(
+            "DEMO",
+            "NDXDEMO",
+            "IN:DEMO:",
+            "configs",
+            "gui",
+            valid_synoptic_targets_and_types=({"TARGET"}, {"TYPE"}),
+            blockserver_cache=blockserver_cache,
+        )
+
+        self.assertListEqual(list(context.valid_iocs), ["GALIL_01", "INSTETC_01"])
+        self.assertListEqual(list(context.protected_iocs), ["INSTETC_01"])
+        self.assertSetEqual(context.valid_synoptic_targets, {"TARGET"})
+        self.assertEqual(context.blockserver_cache.misses, 0)
+
+
+class InstrumentSkipTests(unittest.TestCase):
+    class _Checks(InstrumentTestCase):
+        @skip_on_instruments(["DEMO"], "Not on DEMO")
+        def test_skipped_on_demo(self):
+            pass
+
+        @skip_if_instrument_offline
+        def test_skipped_when_offline(self):
+            pass
+
+    def _run(self, method_name, context):
+        result = unittest.TestResult()
+        InstrumentSkipTests._Checks(method_name, context).run(result)
+        return [reason for _, reason in result.skipped]
+
+    def test_GIVEN_contexts_of_two_instruments_WHEN_running_THEN_each_skipped_by_its_own_name(
+        self,
+    ):
+        demo = InstrumentContext("DEMO", "NDXDEMO", "IN:DEMO:", "configs", "gui")
+        larmor = InstrumentContext(
+            "LARMOR", "NDXLARMOR", "IN:LARMOR:", "configs", "gui"
+        )
+
+        self.assertListEqual(self._run("test_skipped_on_demo", demo), ["Not on DEMO"])
+        self.assertListEqual(self._run("test_skipped_on_demo", larmor), [])
+
+    def test_GIVEN_offline_context_WHEN_running_THEN_skipped(self):
+        offline = InstrumentContext(
+            "DEMO", "NDXDEMO", "IN:DEMO:", "configs", "gui", online=False
+        )
+        online = InstrumentContext("DEMO", "NDXDEMO", "IN:DEMO:", "configs", "gui")
+
+        self.assertListEqual(
+            self._run("test_skipped_when_offline", offline),
+            ["Instrument DEMO is offline"],
+        )
+        self.assertListEqual(self._run("test_skipped_when_offline", online), [])
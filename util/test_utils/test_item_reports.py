@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+from io import StringIO
+
+from xmlrunner import XMLTestRunner
+
+from util.item_reports import (
+    ItemXMLTestResult,
+    get_item_suite_name,
+    get_report_suite_name,
+)
+
+
+class _ItemTests(unittest.TestCase):
+    def __init__(self, method_name, item=None):
+        super().__init__(method_name)
+        self.item = item
+
+    def get_item(self):
+        return self.item
+
+    def test_item(self):
+        pass
+
+
+class ItemReportsTests(unittest.TestCase):
+    def setUp(self):
+        self.reports_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.reports_path, ignore_errors=True)
+
+    def test_GIVEN_a_report_file_THEN_suite_name_has_no_run_time(self):
+        self.assertEqual(
+            get_report_suite_name(
+                os.path.join("reports", "TEST-tests.Tests-ITEM-1-20240101000000.xml")
+            ),
+            "tests.Tests-ITEM-1",
+        )
+
+    def test_GIVEN_a_file_not_written_by_the_runner_THEN_suite_name_is_the_file_name(
+        self,
+    ):
+        self.assertEqual(get_report_suite_name("notes.txt"), "notes.txt")
+
+    def test_GIVEN_tests_of_several_items_WHEN_run_THEN_each_item_is_reported_separately(
+        self,
+    ):
+        suite = unittest.TestSuite(
+            [
+                _ItemTests("test_item", "A"),
+                _ItemTests("test_item", "B"),
+                _ItemTests("test_item"),
+            ]
+        )
+
+        XMLTestRunner(
+            output=self.reports_path, stream=StringIO(), resultclass=ItemXMLTestResult
+        ).run(suite)
+
+        self.assertSetEqual(
+            {get_report_suite_name(f) for f in os.listdir(self.reports_path)},
+            {
+                get_item_suite_name(_ItemTests, "A"),
+                get_item_suite_name(_ItemTests, "B"),
+                f"{_ItemTests.__module__}.{_ItemTests.__name__}",
+            },
+        )
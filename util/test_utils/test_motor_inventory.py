@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+
+from util.channel_access import BreakerTrippedError, ValueTimeoutError
+from util.motor_inventory import (
+    MOTOR_READ_TIMEOUT,
+    MotorInventory,
+    MotorReadTimeoutError,
+)
+
+
+class FakeChannelAccess:
+    """
+    Answers reads from a dictionary of values, or the default for PVs not in it. A value that is an exception class
+    is raised instead.
+    """
+
+    def __init__(self, values, default=None):
+        self.values = values
+        self.default = default
+        self.reads = []
+        self.timeouts = set()
+
+    async def get_value(self, pv, timeout=None, raise_timeout=False):
+        self.reads.append(pv)
+        self.timeouts.add(timeout)
+        value = self.values.get(pv, self.default)
+        if isinstance(value, type) and issubclass(value, Exception):
+            raise value()
+        return value
+
+
+class MotorInventoryTests(unittest.TestCase):
+    def setUp(self):
+        self.ca = FakeChannelAccess(
+            {
+                "MOT:MTR0101_IOCNAME": "GALIL_01",
+                "MOT:MTR0101.UEIP": "Yes",
+                "MOT:MTR0101_MOT_ENC_SYNC_TOL_SP": 0,
+                "MOT:MTR0102_IOCNAME": "GALIL_01",
+                "MOT:MTR0301_IOCNAME": "TC_01",
+                "MOT:MTR0301.DLY": 0.25,
+            }
+        )
+        self.inventory = asyncio.run(MotorInventory.scan(self.ca))
+
+    def test_GIVEN_populated_axes_WHEN_scanned_THEN_their_settings_are_recorded(self):
+        self.assertListEqual(
+            [axis.name for axis in self.inventory.axes],
+            ["MOT:MTR0101", "MOT:MTR0102", "MOT:MTR0301"],
+        )
+        galil = self.inventory.axes[0]
+        self.assertEqual(galil.controller_type, "GALIL_01")
+        self.assertEqual(galil.ueip, "Yes")
+        self.assertEqual(galil.mot_enc_sync_tol, 0)
+        self.assertEqual(self.inventory.axes[2].delay, 0.25)
+
+    def test_GIVEN_controller_without_ioc_WHEN_scanned_THEN_only_its_first_axis_is_read(
+        self,
+    ):
+        self.assertIn("MOT:MTR0201_IOCNAME", self.ca.reads)
+        self.assertNotIn("MOT:MTR0202_IOCNAME", self.ca.reads)
+        self.assertNotIn("MOT:MTR0201.DLY", self.ca.reads)
+
+    def test_GIVEN_inventory_WHEN_filtering_by_controller_type_THEN_matching_axes_returned(
+        self,
+    ):
+        self.assertListEqual(
+            [axis.name for axis in self.inventory.get_axes_with_controller_type("TC_")],
+            ["MOT:MTR0301"],
+        )
+
+    def test_GIVEN_scan_THEN_every_read_given_the_motor_timeout(self):
+        self.assertSetEqual(self.ca.timeouts, {MOTOR_READ_TIMEOUT})
+
+    def test_GIVEN_ioc_name_that_never_connects_WHEN_scanned_THEN_axis_absent(self):
+        ca = FakeChannelAccess({"MOT:MTR0101_IOCNAME": asyncio.TimeoutError})
+
+        self.assertListEqual(asyncio.run(MotorInventory.scan(ca)).axes, [])
+
+    def test_GIVEN_ioc_name_whose_value_times_out_WHEN_scanned_THEN_axis_recorded_for_every_type(
+        self,
+    ):
+        ca = FakeChannelAccess({"MOT:MTR0101_IOCNAME": ValueTimeoutError})
+
+        inventory = asyncio.run(MotorInventory.scan(ca))
+
+        (axis,) = inventory.get_axes_with_controller_type("TC_")
+        self.assertIs(inventory.get_axes_with_controller_type("GALIL_")[0], axis)
+        self.assertIsNone(axis.controller_type)
+        (error,) = axis.get_read_errors("controller_type", "delay")
+        self.assertIsInstance(error, MotorReadTimeoutError)
+        self.assertEqual(error.pv, "MOT:MTR0101_IOCNAME")
+
+    def test_GIVEN_setting_of_populated_axis_times_out_WHEN_scanned_THEN_error_recorded_on_axis(
+        self,
+    ):
+        ca = FakeChannelAccess(
+            {
+                "MOT:MTR0301_IOCNAME": "TC_01",
+                "MOT:MTR0301.DLY": asyncio.TimeoutError,
+                "MOT:MTR0302_IOCNAME": "TC_01",
+                "MOT:MTR0302.DLY": 0.25,
+            }
+        )
+
+        first_axis, second_axis = asyncio.run(MotorInventory.scan(ca)).axes
+
+        (error,) = first_axis.get_read_errors("delay")
+        self.assertEqual(error.pv, "MOT:MTR0301.DLY")
+        self.assertListEqual(first_axis.get_read_errors("ueip"), [])
+        self.assertListEqual(second_axis.get_read_errors("delay"), [])
+        self.assertEqual(second_axis.delay, 0.25)
+
+    def test_GIVEN_breaker_tripped_WHEN_scanned_THEN_first_axes_recorded_as_not_read(
+        self,
+    ):
+        ca = FakeChannelAccess({}, default=BreakerTrippedError)
+
+        axes = asyncio.run(MotorInventory.scan(ca)).axes
+
+        self.assertListEqual(
+            [axis.name for axis in axes],
+            [
+                MotorInventory.get_axis_name(controller, 1)
+                for controller in range(1, 17)
+            ],
+        )
+        self.assertIn(
+            "stopped responding", str(axes[0].get_read_errors("controller_type")[0])
+        )
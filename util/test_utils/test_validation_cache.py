@@ -0,0 +1,111 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from util.validation_cache import ValidationCache, get_blob_sha
+
+
+class ValidationCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache_path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_path, ignore_errors=True)
+        self.checks_run = 0
+
+    def _check(self):
+        self.checks_run += 1
+        return ["GALIL_01"]
+
+    def test_GIVEN_the_same_blob_and_inputs_WHEN_checked_twice_THEN_check_only_runs_once(
+        self,
+    ):
+        cache = ValidationCache()
+
+        first = cache.get_problems("unknown_iocs", "abc", ["GALIL_02"], self._check)
+        second = cache.get_problems("unknown_iocs", "abc", ["GALIL_02"], self._check)
+
+        self.assertListEqual(first, ["GALIL_01"])
+        self.assertListEqual(second, ["GALIL_01"])
+        self.assertEqual(self.checks_run, 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertAlmostEqual(cache.get_hit_rate(), 0.5)
+
+    def test_GIVEN_different_inputs_WHEN_checked_THEN_check_runs_again(self):
+        cache = ValidationCache()
+
+        cache.get_problems("unknown_iocs", "abc", ["GALIL_02"], self._check)
+        cache.get_problems("unknown_iocs", "abc", ["GALIL_03"], self._check)
+        cache.get_problems("protected_iocs", "abc", ["GALIL_02"], self._check)
+        cache.get_problems("unknown_iocs", "def", ["GALIL_02"], self._check)
+
+        self.assertEqual(self.checks_run, 4)
+
+    def test_GIVEN_a_cache_folder_WHEN_checked_by_a_later_run_THEN_outcome_read_from_disk(
+        self,
+    ):
+        ValidationCache(self.cache_path, "v1").get_problems(
+            "check", "abc", None, self._check
+        )
+
+        cache = ValidationCache(self.cache_path, "v1")
+
+        self.assertListEqual(
+            cache.get_problems("check", "abc", None, self._check), ["GALIL_01"]
+        )
+        self.assertEqual(self.checks_run, 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test_GIVEN_a_cache_folder_WHEN_checker_version_changes_THEN_check_runs_again(
+        self,
+    ):
+        ValidationCache(self.cache_path, "v1").get_problems(
+            "check", "abc", None, self._check
+        )
+
+        ValidationCache(self.cache_path, "v2").get_problems(
+            "check", "abc", None, self._check
+        )
+
+        self.assertEqual(self.checks_run, 2)
+
+    def test_GIVEN_a_cache_folder_WHEN_checked_from_several_threads_THEN_every_lookup_counted(
+        self,
+    ):
+        cache = ValidationCache(self.cache_path, "v1")
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            outcomes = list(
+                executor.map(
+                    lambda i: cache.get_problems(
+                        "check", str(i % 5), None, lambda: [str(i % 5)]
+                    ),
+                    range(40),
+                )
+            )
+
+        self.assertListEqual(outcomes, [[str(i % 5)] for i in range(40)])
+        self.assertEqual(cache.hits + cache.misses, 40)
+        later_run = ValidationCache(self.cache_path, "v1")
+        self.assertListEqual(
+            later_run.get_problems("check", "4", None, self._check), ["4"]
+        )
+        self.assertEqual(self.checks_run, 0)
+
+    def test_GIVEN_no_lookups_THEN_hit_rate_is_zero(self):
+        self.assertEqual(ValidationCache().get_hit_rate(), 0.0)
+
+    def test_GIVEN_file_contents_WHEN_getting_blob_sha_THEN_same_as_git(self):
+        contents = b"<iocs/>\n"
+        git_sha = (
+            subprocess.run(
+                ["git", "hash-object", "--stdin"],
+                input=contents,
+                capture_output=True,
+                check=True,
+            )
+            .stdout.decode()
+            .strip()
+        )
+
+        self.assertEqual(get_blob_sha(contents), git_sha)
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from util.xml_backend import (
+    ElementTreeBackend,
+    LxmlBackend,
+    get_xml_backend,
+    lxml_etree,
+)
+
+BLOCKS_XSD = """<?xml version="1.0" encoding="UTF-8"?>
+<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"
+           targetNamespace="http://epics.isis.rl.ac.uk/schema/blocks/1.0"
+           xmlns="http://epics.isis.rl.ac.uk/schema/blocks/1.0"
+           elementFormDefault="qualified">
+    <xs:element name="blocks">
+        <xs:complexType>
+            <xs:sequence>
+                <xs:element name="block" minOccurs="0" maxOccurs="unbounded">
+                    <xs:complexType>
+                        <xs:sequence>
+                            <xs:element name="name" type="xs:string"/>
+                            <xs:element name="read_pv" type="xs:string"/>
+                            <xs:element name="local" type="xs:string"/>
+                        </xs:sequence>
+                    </xs:complexType>
+                </xs:element>
+            </xs:sequence>
+        </xs:complexType>
+    </xs:element>
+</xs:schema>
+"""
+
+VALID_BLOCKS_XML = b"""<blocks xmlns="http://epics.isis.rl.ac.uk/schema/blocks/1.0">
+    <block><name>S2VG</name><read_pv>MOT:JAWS2:VGAP</read_pv><local>True</local></block>
+</blocks>"""
+
+INVALID_BLOCKS_XML = b"""<blocks xmlns="http://epics.isis.rl.ac.uk/schema/blocks/1.0">
+    <block><name>S2VG</name><local>True</local></block>
+</blocks>"""
+
+UNKNOWN_ENCODING_XML = b"""<?xml version="1.0" encoding="bogus"?><blocks/>"""
+
+
+class ElementTreeBackendTests(unittest.TestCase):
+    def test_GIVEN_malformed_xml_WHEN_parsed_THEN_error_returned(self):
+        self.assertEqual(len(ElementTreeBackend().get_parse_errors(b"<blocks>")), 1)
+
+    def test_GIVEN_well_formed_xml_WHEN_parsed_THEN_no_errors(self):
+        self.assertListEqual(
+            ElementTreeBackend().get_parse_errors(VALID_BLOCKS_XML), []
+        )
+
+    def test_GIVEN_unknown_encoding_WHEN_parsed_THEN_error_returned(self):
+        self.assertEqual(
+            len(ElementTreeBackend().get_parse_errors(UNKNOWN_ENCODING_XML)), 1
+        )
+
+    def test_GIVEN_any_file_THEN_no_schema_available(self):
+        self.assertIsNone(ElementTreeBackend().get_schema_digest("blocks.xml"))
+        self.assertListEqual(
+            ElementTreeBackend().get_schema_errors("blocks.xml", b"<blocks/>"), []
+        )
+
+
+@unittest.skipIf(lxml_etree is None, "lxml is not installed")
+class LxmlBackendTests(unittest.TestCase):
+    def setUp(self):
+        self.schema_path = tempfile.mkdtemp()
+        with open(os.path.join(self.schema_path, "blocks.xsd"), "w") as f:
+            f.write(BLOCKS_XSD)
+        self.backend = LxmlBackend(self.schema_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.schema_path)
+
+    def test_GIVEN_lxml_installed_WHEN_getting_backend_THEN_lxml_used(self):
+        self.assertIsInstance(get_xml_backend(self.schema_path), LxmlBackend)
+
+    def test_GIVEN_malformed_xml_WHEN_parsed_THEN_error_returned(self):
+        self.assertEqual(len(self.backend.get_parse_errors(b"<blocks>")), 1)
+
+    def test_GIVEN_unknown_encoding_WHEN_parsed_THEN_error_returned(self):
+        self.assertEqual(len(self.backend.get_parse_errors(UNKNOWN_ENCODING_XML)), 1)
+
+    def test_GIVEN_text_declaring_an_encoding_WHEN_parsed_THEN_error_returned(self):
+        self.assertEqual(
+            len(
+                self.backend.get_parse_errors(
+                    '<?xml version="1.0" encoding="UTF-8"?><blocks/>'
+                )
+            ),
+            1,
+        )
+
+    def test_GIVEN_file_matching_schema_WHEN_validated_THEN_no_errors(self):
+        self.assertListEqual(
+            self.backend.get_schema_errors("blocks.xml", VALID_BLOCKS_XML), []
+        )
+
+    def test_GIVEN_file_not_matching_schema_WHEN_validated_THEN_errors_name_the_line(
+        self,
+    ):
+        errors = self.backend.get_schema_errors("blocks.xml", INVALID_BLOCKS_XML)
+
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("line 2:"), errors[0])
+
+    def test_GIVEN_no_schema_for_file_THEN_no_digest(self):
+        self.assertIsNotNone(self.backend.get_schema_digest("blocks.xml"))
+        self.assertIsNone(self.backend.get_schema_digest("iocs.xml"))
+
+    def test_GIVEN_schema_WHEN_used_twice_THEN_only_compiled_once(self):
+        self.backend.get_schema_errors("blocks.xml", VALID_BLOCKS_XML)
+        os.remove(os.path.join(self.schema_path, "blocks.xsd"))
+
+        self.assertListEqual(
+            self.backend.get_schema_errors("blocks.xml", VALID_BLOCKS_XML), []
+        )
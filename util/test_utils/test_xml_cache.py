@@ -0,0 +1,55 @@
+import unittest
+
+from util.xml_cache import ParsedXmlCache, as_xml_root
+
+
+class ParsedXmlCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.reads = 0
+
+    def _read(self, xml="<iocs/>"):
+        def read():
+            self.reads += 1
+            return xml
+
+        return read
+
+    def test_GIVEN_the_same_file_id_WHEN_getting_root_twice_THEN_file_only_read_and_parsed_once(
+        self,
+    ):
+        cache = ParsedXmlCache()
+
+        first = cache.get_root("iocs.xml", "1", self._read())
+        second = cache.get_root("iocs.xml", "1", self._read())
+
+        self.assertIs(first, second)
+        self.assertEqual(self.reads, 1)
+
+    def test_GIVEN_a_changed_file_id_WHEN_getting_root_THEN_file_parsed_again(self):
+        cache = ParsedXmlCache()
+        cache.get_root("iocs.xml", "1", self._read())
+
+        root = cache.get_root("iocs.xml", "2", self._read("<blocks/>"))
+
+        self.assertEqual(root.tag, "blocks")
+        self.assertEqual(self.reads, 2)
+
+    def test_GIVEN_a_full_cache_WHEN_adding_a_file_THEN_least_recently_used_file_evicted(
+        self,
+    ):
+        cache = ParsedXmlCache(max_size=2)
+        cache.get_root("a.xml", "1", self._read())
+        cache.get_root("b.xml", "1", self._read())
+        cache.get_root("a.xml", "1", self._read())
+
+        cache.get_root("c.xml", "1", self._read())
+        cache.get_root("a.xml", "1", self._read())
+        self.assertEqual(self.reads, 3)
+
+        cache.get_root("b.xml", "1", self._read())
+        self.assertEqual(self.reads, 4)
+
+    def test_GIVEN_a_root_element_WHEN_getting_root_THEN_same_element_returned(self):
+        root = as_xml_root("<iocs/>")
+
+        self.assertIs(as_xml_root(root), root)
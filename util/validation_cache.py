@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Callable
+from typing import Any
+
+
+class ValidationCache:
+    """
+    Content-addressed cache of the outcomes of checks that only depend on the contents of a single file.
+
+    Outcomes are keyed by the name of the check, the git blob SHA of the file, the version of this checker and any
+    external inputs the check uses, such as the set of valid IOCs, so identical files on different instruments or
+    nights are only validated once. Outcomes are kept in memory for the run and, if a cache folder is given, in an
+    SQLite database that parallel workers and later runs share. The cache may be shared by checks running on several
+    threads.
+    """
+
+    DATABASE_FILE = "validation_cache.sqlite"
+
+    def __init__(
+        self, cache_path: str | None = None, checker_version: str | None = None
+    ) -> None:
+        """
+        :param cache_path: The folder to keep the database in, or None to only cache in memory
+        :param checker_version: The commit of this checker. Outcomes are only persisted if it is known, since
+            outcomes from a different version of the checks can not be trusted.
+        """
+        self.checker_version = checker_version
+        self.hits = 0
+        self.misses = 0
+        self._outcomes: dict[str, list[str]] = {}
+        self._connection = None
+        self._lock = threading.Lock()
+        if cache_path is not None and checker_version is not None:
+            os.makedirs(cache_path, exist_ok=True)
+            self._connection = sqlite3.connect(
+                os.path.join(cache_path, ValidationCache.DATABASE_FILE),
+                timeout=30,
+                check_same_thread=False,
+            )
+            with self._connection:
+                self._connection.execute(
+                    "CREATE TABLE IF NOT EXISTS outcomes (key TEXT PRIMARY KEY, problems TEXT NOT NULL)"
+                )
+
+    def _get_key(self, check_name: str, blob_sha: str, inputs: Any) -> str:
+        key = json.dumps(
+            [check_name, blob_sha, self.checker_version, inputs], sort_keys=True
+        )
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _load(self, key: str) -> list[str] | None:
+        if self._connection is None:
+            return None
+        row = self._connection.execute(
+            "SELECT problems FROM outcomes WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _save(self, key: str, problems: list[str]) -> None:
+        if self._connection is None:
+            return
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO outcomes (key, problems) VALUES (?, ?)",
+                (key, json.dumps(problems)),
+            )
+
+    def get_problems(
+        self,
+        check_name: str,
+        blob_sha: str,
+        inputs: Any,
+        check: Callable[[], list[str]],
+    ) -> list[str]:
+        """
+        Gets the outcome of a check on a file, running the check only if it has not been run on identical contents
+        with identical inputs before.
+
+        Exceptions raised by the check are not cached, so a file that fails to parse is checked again each time.
+
+        :param check_name: A name identifying the check
+        :param blob_sha: The git blob SHA of the file the check reads
+        :param inputs: Any other inputs the outcome depends on. Must be JSON serialisable with a stable ordering.
+        :param check: Runs the check and returns a list of the problems it found, which must not refer to the name
+            of the file or instrument since the outcome is shared between all files with the same contents
+        :return: The list of problems found by the check
+        """
+        key = self._get_key(check_name, blob_sha, inputs)
+        with self._lock:
+            problems = self._outcomes.get(key)
+            if problems is None:
+                problems = self._load(key)
+                if problems is not None:
+                    self._outcomes[key] = problems
+            if problems is not None:
+                self.hits += 1
+                return problems
+            self.misses += 1
+
+        # The check runs without holding the lock, so checks of different files are not held up by each other.
+        problems = check()
+        with self._lock:
+            self._save(key, problems)
+            self._outcomes[key] = problems
+        return problems
+
+    def get_hit_rate(self) -> float:
+        """
+        :return: The fraction of lookups answered without running the check, 0 if there have been no lookups
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+def get_blob_sha(contents: bytes) -> str:
+    """
+    Computes the git blob SHA of some file contents, the same as `git hash-object` would.
+    :param contents: The contents of the file
+    :return: The hex encoded SHA-1 of the blob
+    """
+    return hashlib.sha1(b"blob %d\0" % len(contents) + contents).hexdigest()
@@ -1,24 +1,30 @@
 import os
-from builtins import object, zip
+from builtins import zip
 
 from util.common import CommonUtils
+from util.config_source import ConfigSource, FileSystemConfigSource
 
 
-class VersionUtils(object):
+class VersionUtils:
     """
     Class containing utility methods relating to the version of IBEX.
     """
 
     VERSION_FILE = "config_version.txt"
 
-    def __init__(self, config_repo_path: str) -> None:
+    def __init__(
+        self, config_repo_path: str, source: ConfigSource | None = None
+    ) -> None:
         self.config_repo_path = config_repo_path
+        self.source = (
+            source if source is not None else FileSystemConfigSource(config_repo_path)
+        )
         self.version_file_path = os.path.join(
             self.config_repo_path, "configurations", VersionUtils.VERSION_FILE
         )
 
     def version_file_exists(self) -> bool:
-        return os.path.isfile(self.version_file_path)
+        return self.source.is_file(self.version_file_path)
 
     def count_config_version_files(self) -> int:
         """
@@ -26,11 +32,13 @@ class VersionUtils(object):
         Returns the number of these files that were found.
         :return: the number of files named (VERSION_FILE)
         """
-        return CommonUtils.count_files_with_name(self.config_repo_path, VersionUtils.VERSION_FILE)
+        return CommonUtils.count_files_with_name(
+            self.config_repo_path, VersionUtils.VERSION_FILE, self.source
+        )
 
     def get_version(self) -> str:
-        with open(self.version_file_path) as f:
-            return f.readline().strip()
+        lines = self.source.read(self.version_file_path).splitlines()
+        return lines[0].strip() if lines else ""
 
     @staticmethod
     def versions_similar(version1: str, version2: str) -> bool:
@@ -38,7 +46,7 @@ class VersionUtils(object):
 
     @staticmethod
     def convert_release_to_tag_name(major: int, minor: int = 0, patch: int = 0) -> str:
-        return "v{maj}.{min}.{patch}".format(maj=int(major), min=int(minor), patch=int(patch))
+        return f"v{int(major)}.{int(minor)}.{int(patch)}"
 
     @staticmethod
     def extract_release_numbers_from_string(version: str) -> list[int]:
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import threading
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+# Besides malformed XML, a file may declare an encoding that is unknown or that its contents are not in
+ELEMENTTREE_PARSE_ERRORS = (ET.ParseError, LookupError, OSError, ValueError)
+LXML_PARSE_ERRORS = (
+    ELEMENTTREE_PARSE_ERRORS
+    if lxml_etree is None
+    else (lxml_etree.LxmlError, LookupError, OSError, ValueError)
+)
+
+
+class ElementTreeBackend:
+    """
+    Parses configuration files with the standard library, which can only tell whether a file is well-formed.
+    """
+
+    NAME = "elementtree"
+
+    def get_parse_errors(self, contents: bytes) -> list[str]:
+        """
+        Parses the contents of a file as XML.
+        :param contents: The contents of the file
+        :return: A list containing the parse error, or an empty list if the contents are valid XML
+        """
+        try:
+            ET.fromstring(contents)
+        except ELEMENTTREE_PARSE_ERRORS as e:
+            return [str(e)]
+        return []
+
+    def get_schema_digest(self, filename: str) -> str | None:
+        """
+        :param filename: The name of a configuration file, e.g. blocks.xml
+        :return: None, since ElementTree can not validate files against schemas
+        """
+        return None
+
+    def get_schema_errors(self, filename: str, contents: bytes) -> list[str]:
+        """
+        ElementTree can not validate files against schemas, so no file has any schema errors. Callers should skip
+        files whose schema digest is None rather than report them as valid.
+        :return: An empty list
+        """
+        return []
+
+
+class LxmlBackend:
+    """
+    Parses configuration files with lxml and validates them against the XSD schemas of the blockserver.
+
+    The schema for a file is the file of the same name with an .xsd extension in the schema folder, e.g. blocks.xsd
+    for blocks.xml. Each schema is compiled the first time it is needed and reused for the rest of the run.
+
+    lxml parsers can only be used by one thread at a time, so each thread gets its own parser, and schemas validate
+    one document at a time since each keeps the errors of its last validation.
+    """
+
+    NAME = "lxml"
+
+    def __init__(self, schema_path: str | None = None) -> None:
+        """
+        :param schema_path: The folder containing the schemas, or None to only check that files are well-formed
+        """
+        self.schema_path = schema_path
+        self._local = threading.local()
+        self._schemas: dict[str, tuple] = {}
+        self._schema_lock = threading.RLock()
+
+    @property
+    def _parser(self):
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = lxml_etree.XMLParser(
+                resolve_entities=False, no_network=True
+            )
+        return parser
+
+    def _get_schema(self, filename: str) -> tuple:
+        """
+        :return: A tuple of the compiled schema for a file and a digest of its source, or (None, None) if there is
+            no schema for the file
+        """
+        with self._schema_lock:
+            if filename not in self._schemas:
+                schema = (None, None)
+                if self.schema_path is not None:
+                    schema_file = os.path.join(
+                        self.schema_path, f"{os.path.splitext(filename)[0]}.xsd"
+                    )
+                    if os.path.isfile(schema_file):
+                        with open(schema_file, "rb") as f:
+                            digest = hashlib.sha256(f.read()).hexdigest()
+                        schema = (
+                            lxml_etree.XMLSchema(lxml_etree.parse(schema_file)),
+                            digest,
+                        )
+                self._schemas[filename] = schema
+            return self._schemas[filename]
+
+    def get_parse_errors(self, contents: bytes) -> list[str]:
+        try:
+            lxml_etree.fromstring(contents, self._parser)
+        except LXML_PARSE_ERRORS as e:
+            return [str(e)]
+        return []
+
+    def get_schema_digest(self, filename: str) -> str | None:
+        return self._get_schema(filename)[1]
+
+    def get_schema_errors(self, filename: str, contents: bytes) -> list[str]:
+        schema = self._get_schema(filename)[0]
+        if schema is None:
+            raise ValueError(f"No schema for {filename}")
+        try:
+            document = lxml_etree.fromstring(contents, self._parser)
+        except LXML_PARSE_ERRORS as e:
+            return [str(e)]
+        with self._schema_lock:
+            if schema.validate(document):
+                return []
+            return [f"line {error.line}: {error.message}" for error in schema.error_log]
+
+
+def get_xml_backend(schema_path: str | None = None) -> ElementTreeBackend | LxmlBackend:
+    """
+    Gets the best available XML backend.
+    :param schema_path: The folder containing the schemas to validate configuration files against, if any
+    :return: An lxml backend if lxml is installed, otherwise an ElementTree backend which does not validate
+    """
+    if lxml_etree is None:
+        if schema_path is not None:
+            print(
+                "Warning: lxml is not installed, configuration files will not be validated"
+            )
+        return ElementTreeBackend()
+    return LxmlBackend(schema_path)
@@ -0,0 +1,75 @@
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+
+class LruCache:
+    """
+    Bounded cache of values computed from files, evicting the least recently used value once it is full. The cache
+    may be shared between threads. Values are computed without holding its lock, so two threads asking for the same
+    missing value may both compute it, but both are given the one that was cached first.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """
+        :param max_size: The maximum number of values to keep
+        """
+        self.max_size = max_size
+        self._values: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Gets a cached value, computing and caching it if it is not already cached.
+        :param key: The key of the value. It must change whenever the value would change.
+        :param compute: Computes the value
+        :return: The value
+        """
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                return self._values[key]
+        value = compute()
+        with self._lock:
+            value = self._values.setdefault(key, value)
+            self._values.move_to_end(key)
+            if len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class ParsedXmlCache(LruCache):
+    """
+    Bounded cache of parsed XML files, evicting the least recently used file once it is full.
+
+    Files are keyed by their path and an identifier of their contents provided by the config source, such as the
+    git blob SHA or the modification time, so a file that changes is parsed again rather than served stale.
+    Parsed trees are shared between every caller, so they must not be modified.
+    """
+
+    def get_root(
+        self, path: str, file_id: str, read: Callable[[], str | bytes]
+    ) -> ET.Element:
+        """
+        Gets the root element of an XML file, parsing it only if it is not already cached.
+        :param path: The path of the file
+        :param file_id: An identifier that changes whenever the contents of the file change
+        :param read: Reads the contents of the file
+        :return: The root element
+        """
+        return self.get((path, file_id), lambda: ET.fromstring(read()))
+
+
+def as_xml_root(xml: str | bytes | ET.Element) -> ET.Element:
+    """
+    Gets the root element of some XML, parsing it if it is not already parsed.
+    :param xml: The XML as a string, or its root element
+    :return: The root element
+    """
+    return xml if isinstance(xml, ET.Element) else ET.fromstring(xml)